@@ -0,0 +1,859 @@
+"""Offline simulator for the AutoHotkey v2 subset emitted by script_generator.
+
+Runs a generated script on a virtual clock, without Windows, AutoHotkey or
+the game, and reports what it would have sent:
+
+    report = simulate_config(cfg, duration_s=3600)
+    report.cycles_per_hour, report.total_drift_ms, report.timer_skips
+
+Supported: function definitions, hotkeys with a { } body, global,
+:= += -= assignments, if/else, Loop n with A_Index, return [value],
+"." concatenation, arrays ([a, b], x[i], .Length, .Push()), the commands
+Send, ControlSend, Sleep, SetTimer, ExitApp and Toast (recorded, its body
+is not interpreted), WinExist over a virtual set of open windows, and the
+file functions live and telemetry scripts use (FileExist, FileGetTime,
+FileGetSize, IniRead, FileAppend, FileMove) over a virtual set of files
+that can be edited at given times.
+
+Threads follow AutoHotkey's model: a timer or hotkey interrupts the
+running thread, and an interrupted thread only resumes once every thread
+started above it has finished. A timer does not start a second thread
+while its previous one is still running; such ticks are counted in
+timer_skips. Timers fire and Sleep wakes on the system tick (tick_ms).
+"""
+import math
+import re
+from typing import NamedTuple
+
+import hotkeys
+from script_generator import (
+    RUNTIME_FILENAME,
+    is_live,
+    params_path,
+    params_values,
+    render_params,
+    render_runtime,
+    render_script,
+    script_filename,
+    uses_shared_runtime,
+)
+
+
+class SimulatorError(Exception):
+    """The script uses something the simulator does not understand."""
+
+
+class _Exit(Exception):
+    pass
+
+
+class _Return(Exception):
+    def __init__(self, value=""):
+        super().__init__()
+        self.value = value
+
+
+# -- parsing -----------------------------------------------------------------
+
+_TOKEN_RE = re.compile(
+    r"""\s*(?:
+        (?P<num>\d+\.\d*|\d+)
+      | (?P<str>"(?:[^"`]|`.)*"|'(?:[^'`]|`.)*')
+      | (?P<member>(?<=[\w\])])\.[A-Za-z_]\w*)
+      | (?P<op>:=|\+=|-=|==|!=|<>|<=|>=|&&|\|\||=>|[-+*/!<>=(),.\[\]])
+      | (?P<name>[A-Za-z_][A-Za-z0-9_]*)
+    )""",
+    re.X,
+)
+
+
+def _tokenize(text: str, line_no: int) -> list:
+    tokens = []
+    pos = 0
+    text = text.rstrip()
+    while pos < len(text):
+        m = _TOKEN_RE.match(text, pos)
+        if not m or m.end() == pos:
+            raise SimulatorError(f"line {line_no}: cannot parse {text[pos:]!r}")
+        pos = m.end()
+        kind = m.lastgroup
+        value = m.group(kind)
+        if kind == "num":
+            value = float(value) if "." in value else int(value)
+        elif kind == "member":
+            # obj.Name (no space before the dot); " . " is concatenation
+            value = value[1:]
+        elif kind == "str":
+            value = re.sub(r"`(.)", lambda e: {"n": "\n", "t": "\t"}.get(e.group(1), e.group(1)), value[1:-1])
+        tokens.append((kind, value))
+    return tokens
+
+
+def _strip_comment(line: str) -> str:
+    if line.lstrip().startswith(";"):
+        return ""
+    quote = None
+    for i, ch in enumerate(line):
+        if quote:
+            if ch == quote:
+                quote = None
+        elif ch in "\"'":
+            quote = ch
+        elif ch == ";" and i > 0 and line[i - 1] in " \t":
+            return line[:i]
+    return line
+
+
+class _Parser:
+    """Turns script lines into nested statement tuples."""
+
+    def __init__(self, text: str):
+        self.lines = []
+        for no, raw in enumerate(text.splitlines(), 1):
+            line = _strip_comment(raw).strip()
+            if line:
+                self.lines.append((no, line))
+        self.pos = 0
+
+    def peek(self):
+        return self.lines[self.pos] if self.pos < len(self.lines) else (None, None)
+
+    def next(self):
+        item = self.peek()
+        self.pos += 1
+        return item
+
+    def parse_script(self):
+        functions, hotkeys, auto = {}, {}, []
+        while self.pos < len(self.lines):
+            no, line = self.peek()
+            m = re.match(r"^([A-Za-z_]\w*)\(([^)]*)\)\s*\{$", line)
+            if m:
+                self.next()
+                params = [p.split(":=")[0].strip() for p in m.group(2).split(",") if p.strip()]
+                functions[m.group(1)] = (params, self.parse_block_body())
+                continue
+            if line.startswith("#") and "::" not in line:
+                # directives (#Requires, #SingleInstance...) do not affect the simulation
+                self.next()
+                continue
+            m = re.match(r"^(.+?)::\s*(\{)?$", line)
+            if m:
+                self.next()
+                if not m.group(2):
+                    no2, brace = self.next()
+                    if brace != "{":
+                        raise SimulatorError(f"line {no}: hotkey {m.group(1)} needs a {{ }} body")
+                hotkeys[m.group(1)] = self.parse_block_body()
+                continue
+            auto.append(self.parse_statement())
+        return functions, hotkeys, auto
+
+    def parse_block_body(self) -> list:
+        """Parse statements up to the closing brace of the current block."""
+        body = []
+        while True:
+            no, line = self.peek()
+            if line is None:
+                raise SimulatorError("unexpected end of script, missing }")
+            if line == "}" or line.startswith("} else"):
+                if line == "}":
+                    self.next()
+                return body
+            body.append(self.parse_statement())
+
+    def parse_statement(self):
+        no, line = self.next()
+        m = re.match(r"^if\s*(.*?)\s*(\{)?$", line)
+        if m and (line.startswith("if ") or line.startswith("if(")):
+            cond = _tokenize(m.group(1), no)
+            then = self.parse_block_body() if m.group(2) else [self.parse_statement()]
+            other = []
+            nno, nline = self.peek()
+            if nline is not None and re.match(r"^\}?\s*else\b", nline):
+                self.next()
+                rest = re.sub(r"^\}?\s*else\s*", "", nline)
+                if rest == "{":
+                    other = self.parse_block_body()
+                else:
+                    if rest:
+                        # "else statement" / "else if ...": parse the rest of the line
+                        self.pos -= 1
+                        self.lines[self.pos] = (nno, rest)
+                    other = [self.parse_statement()]
+            return ("if", no, cond, then, other)
+        if line == "return" or line.startswith("return "):
+            rest = line[len("return"):].strip()
+            return ("return", no, _tokenize(rest, no) if rest else None)
+        m = re.match(r"^global\b\s*(.*)$", line)
+        if m:
+            names = [n.split(":=")[0].strip() for n in m.group(1).split(",") if n.strip()]
+            return ("global", no, names)
+        m = re.match(r"^Loop\b\s*(.*?)\s*(\{)?$", line)
+        if m:
+            body = self.parse_block_body() if m.group(2) else [self.parse_statement()]
+            return ("loop", no, _tokenize(m.group(1), no), body)
+        m = re.match(r"^([A-Za-z_]\w*(?:\.\w+)*)(\[.*?\])?\s*(:=|\+=|-=)\s*(.+)$", line)
+        if m:
+            index = _tokenize(m.group(2)[1:-1], no) if m.group(2) else None
+            return ("assign", no, m.group(1), m.group(3), _tokenize(m.group(4), no), index)
+        if re.match(r"^[A-Za-z_]\w*\.\w+\s*\(.*\)$", line):
+            # obj.Method(args): an expression evaluated for its effect
+            return ("expr", no, _tokenize(line, no))
+        m = re.match(r"^([A-Za-z_]\w*)\s*(\(.*\))?\s*(.*)$", line)
+        if m:
+            name = m.group(1)
+            if m.group(2) is not None and not m.group(3):
+                # Name(args): split the parenthesised argument list
+                return ("call", no, name, _split_args(_tokenize(m.group(2)[1:-1], no)))
+            rest = ((m.group(2) or "") + " " + m.group(3)).strip()
+            return ("call", no, name, _split_args(_tokenize(rest, no)) if rest else [])
+        raise SimulatorError(f"line {no}: unsupported statement {line!r}")
+
+
+def _split_args(tokens: list) -> list:
+    """Split tokens on top-level commas."""
+    args, current, depth = [], [], 0
+    for tok in tokens:
+        if tok == ("op", "("):
+            depth += 1
+        elif tok == ("op", ")"):
+            depth -= 1
+        if tok == ("op", ",") and depth == 0:
+            args.append(current)
+            current = []
+        else:
+            current.append(tok)
+    if current or args:
+        args.append(current)
+    return args
+
+
+# -- evaluation --------------------------------------------------------------
+
+class _FuncRef(NamedTuple):
+    name: str
+
+
+_BINARY = [
+    ({"||", "or"}, lambda a, b: a or b),
+    ({"&&", "and"}, lambda a, b: a and b),
+    ({"=", "==", "!=", "<>", "<", ">", "<=", ">="}, None),
+    ({"."}, lambda a, b: _str(a) + _str(b)),
+    ({"+", "-"}, None),
+    ({"*", "/"}, None),
+]
+
+
+def _str(value) -> str:
+    if isinstance(value, float) and value.is_integer():
+        value = int(value)
+    return str(value)
+
+
+def _compare(op, a, b):
+    if op in ("=", "=="):
+        return a == b
+    if op in ("!=", "<>"):
+        return a != b
+    return {"<": a < b, ">": a > b, "<=": a <= b, ">=": a >= b}[op]
+
+
+def _arith(op, a, b):
+    if op == "+":
+        return a + b
+    if op == "-":
+        return a - b
+    if op == "*":
+        return a * b
+    return a / b
+
+
+class _Expr:
+    """Precedence-climbing evaluator over a token list."""
+
+    def __init__(self, sim, frame, tokens, line_no):
+        self.sim, self.frame, self.tokens, self.line_no = sim, frame, tokens, line_no
+        self.pos = 0
+
+    def eval(self):
+        value = self.binary(0)
+        if self.pos != len(self.tokens):
+            raise SimulatorError(f"line {self.line_no}: unexpected {self.tokens[self.pos][1]!r}")
+        return value
+
+    def peek(self):
+        return self.tokens[self.pos] if self.pos < len(self.tokens) else (None, None)
+
+    def binary(self, level):
+        if level == len(_BINARY):
+            return self.unary()
+        left = self.binary(level + 1)
+        ops, fn = _BINARY[level]
+        while self.peek()[1] in ops:
+            op = self.tokens[self.pos][1]
+            self.pos += 1
+            right = self.binary(level + 1)
+            if fn is not None:
+                left = fn(left, right)
+            elif level == 2:
+                left = _compare(op, left, right)
+            else:
+                left = _arith(op, left, right)
+        return left
+
+    def unary(self):
+        kind, value = self.peek()
+        if value in ("!", "not"):
+            self.pos += 1
+            return not self.unary()
+        if value == "-":
+            self.pos += 1
+            return -self.unary()
+        return self.primary()
+
+    def primary(self):
+        kind, value = self.peek()
+        self.pos += 1
+        if kind in ("num", "str"):
+            result = value
+        elif kind == "op" and value == "(":
+            result = self.binary(0)
+            self.expect(")")
+        elif kind == "op" and value == "[":
+            result = self.arguments("]")
+        elif kind == "name":
+            if self.peek()[1] == "(":
+                self.pos += 1
+                result = self.sim.call_value(value, self.arguments(")"), self.line_no)
+            else:
+                result = self.sim.lookup(self.frame, value, self.line_no)
+        else:
+            raise SimulatorError(f"line {self.line_no}: unexpected {value!r}")
+        return self.postfix(result)
+
+    def arguments(self, closing):
+        """Comma separated expressions up to closing, which is consumed."""
+        args = []
+        while self.peek()[1] != closing:
+            args.append(self.binary(0))
+            if self.peek()[1] == ",":
+                self.pos += 1
+        self.expect(closing)
+        return args
+
+    def postfix(self, value):
+        while True:
+            kind, tok = self.peek()
+            if kind == "op" and tok == "[":
+                self.pos += 1
+                index = self.binary(0)
+                self.expect("]")
+                value = _item(value, index, self.line_no)
+            elif kind == "member":
+                self.pos += 1
+                args = None
+                if self.peek()[1] == "(":
+                    self.pos += 1
+                    args = self.arguments(")")
+                value = _member(value, tok, args, self.line_no)
+            else:
+                return value
+
+    def expect(self, op):
+        if self.peek()[1] != op:
+            raise SimulatorError(f"line {self.line_no}: expected {op!r}")
+        self.pos += 1
+
+
+def _item(array, index, line_no):
+    if not isinstance(array, list):
+        raise SimulatorError(f"line {line_no}: indexing something that is not an array")
+    if not 1 <= index <= len(array):
+        raise SimulatorError(f"line {line_no}: index {index} out of range")
+    return array[int(index) - 1]
+
+
+def _member(obj, name, args, line_no):
+    if isinstance(obj, list):
+        if name == "Length" and args is None:
+            return len(obj)
+        if name == "Push" and args is not None:
+            obj.extend(args)
+            return len(obj)
+    raise SimulatorError(f"line {line_no}: unsupported member {name}")
+
+
+# -- simulation --------------------------------------------------------------
+
+class SimulationReport(NamedTuple):
+    duration_ms: float
+    sends: tuple  # (time_ms, keys) in order
+    send_counts: dict
+    cycles: int
+    cycles_per_hour: float
+    timer_skips: int  # timer ticks dropped because the previous thread was still running
+    max_thread_depth: int  # deepest stack of interrupted threads
+    total_drift_ms: float  # time lost over the run compared with the expected delays
+    mean_drift_ms: float  # average lateness of one action
+    max_drift_ms: float
+    toasts: tuple  # (time_ms, message)
+    exited: bool
+    window_counts: dict = {}  # target window ("" = active window) -> number of sends
+
+
+class _Thread:
+    def __init__(self, gen, source):
+        self.gen = gen
+        self.source = source  # timer function name, hotkey label or None
+        self.wake_at = 0.0
+
+
+class Simulator:
+    """Interpreter and virtual clock for one script."""
+
+    def __init__(self, text: str, tick_ms: float = 15.6, send_ms: float = 0.0,
+                 screen_width: int = 1920, script_path: str = "C:\\scripts\\script.akh", files: dict = None,
+                 windows=None):
+        """files: file name -> text; names are matched without their folder.
+        #Include lines are replaced by the file they name.
+
+        windows: titles of the open windows (WinExist matches a part of the
+        title, like AutoHotkey's default); None means any window exists.
+        """
+        self.windows = None if windows is None else list(windows)
+        text = _expand_includes(text, files or {})
+        self.functions, self.hotkeys, self.auto = _Parser(text).parse_script()
+        self.tick_ms = tick_ms
+        self.send_ms = send_ms
+        self.globals = {"A_ScreenWidth": screen_width, "A_ScriptFullPath": script_path, "true": 1, "false": 0}
+        self.now = 0.0
+        self.files = {}  # file name -> (modified at, in ms, text)
+        for name, content in (files or {}).items():
+            self.write_file(name, content)
+        self.timers = {}  # function name -> [due_ms, period_ms]
+        self.stack = []
+        self.sends = []
+        self.send_windows = []  # target of each send, "" for the active window
+        self.toasts = []
+        self.timer_skips = 0
+        self.max_depth = 0
+        self.exited = False
+
+    # clock helpers
+    def _tick_up(self, t: float) -> float:
+        if not self.tick_ms:
+            return t
+        return math.ceil(round(t / self.tick_ms, 9)) * self.tick_ms
+
+    def tick_count(self) -> int:
+        if not self.tick_ms:
+            return int(self.now)
+        return int(math.floor(round(self.now / self.tick_ms, 9)) * self.tick_ms)
+
+    # variables
+    def lookup(self, frame, name, line_no):
+        if name == "A_TickCount":
+            return self.tick_count()
+        if frame is not None and name in frame["locals"]:
+            return frame["locals"][name]
+        if name in self.globals:
+            return self.globals[name]
+        if name in self.functions or name in _BUILTIN_VALUES or name in _SIM_FUNCTIONS:
+            return _FuncRef(name)
+        # unset variables read as empty strings in practice; be strict instead
+        raise SimulatorError(f"line {line_no}: variable {name} is not set")
+
+    def assign(self, frame, name, value):
+        if frame is None or name in frame["globals"]:
+            self.globals[name] = value
+        else:
+            frame["locals"][name] = value
+
+    def evaluate(self, frame, tokens, line_no):
+        return _Expr(self, frame, tokens, line_no).eval()
+
+    def call_value(self, name, args, line_no):
+        """Function call inside an expression (must not sleep)."""
+        if name in _BUILTIN_VALUES:
+            return _BUILTIN_VALUES[name](*args)
+        if name in _SIM_FUNCTIONS:
+            return _SIM_FUNCTIONS[name](self, *args)
+        if name in self.functions:
+            gen = self.call_function(name, args)
+            try:
+                next(gen)
+            except StopIteration as stop:
+                return stop.value
+            raise SimulatorError(f"line {line_no}: function {name}() sleeps inside an expression")
+        raise SimulatorError(f"line {line_no}: function {name}() cannot be used in an expression")
+
+    # virtual files
+    def write_file(self, name: str, text: str) -> None:
+        self.files[_file_key(name)] = (self.now, text)
+
+    def file(self, path):
+        return self.files.get(_file_key(path))
+
+    # execution, as generators yielding sleep durations
+    def run_block(self, stmts, frame):
+        for stmt in stmts:
+            yield from self.run_statement(stmt, frame)
+
+    def run_statement(self, stmt, frame):
+        kind, no = stmt[0], stmt[1]
+        if kind == "global":
+            if frame is not None:
+                frame["globals"].update(stmt[2])
+        elif kind == "assign":
+            _, _, name, op, tokens, index = stmt
+            value = self.evaluate(frame, tokens, no)
+            if index is not None:
+                array = self.lookup(frame, name, no)
+                i = self.evaluate(frame, index, no)
+                if op != ":=":
+                    current = _item(array, i, no)
+                    value = current + value if op == "+=" else current - value
+                _item(array, i, no)  # range check
+                array[int(i) - 1] = value
+                return
+            if op != ":=":
+                current = self.lookup(frame, name, no)
+                value = current + value if op == "+=" else current - value
+            self.assign(frame, name, value)
+        elif kind == "loop":
+            _, _, count, body = stmt
+            scope = frame["locals"] if frame is not None else self.globals
+            outer = scope.get("A_Index")
+            for i in range(1, int(self.evaluate(frame, count, no)) + 1):
+                scope["A_Index"] = i
+                yield from self.run_block(body, frame)
+            scope["A_Index"] = outer
+        elif kind == "expr":
+            self.evaluate(frame, stmt[2], no)
+        elif kind == "if":
+            _, _, cond, then, other = stmt
+            if self.evaluate(frame, cond, no):
+                yield from self.run_block(then, frame)
+            else:
+                yield from self.run_block(other, frame)
+        elif kind == "return":
+            raise _Return(self.evaluate(frame, stmt[2], no) if stmt[2] else "")
+        elif kind == "call":
+            yield from self.run_command(stmt[2], stmt[3], frame, no)
+
+    def run_command(self, name, arg_tokens, frame, no):
+        if name == "SetTimer" and arg_tokens and arg_tokens[0][:1] == [("op", "(")]:
+            # SetTimer () => ..., -n : an anonymous callback (only used by Toast), ignored
+            return
+        # an omitted argument (Cmd a, , c) is empty
+        args = [self.evaluate(frame, a, no) if a else "" for a in arg_tokens]
+        if name in ("Send", "ControlSend"):
+            window = str(args[2]) if name == "ControlSend" and len(args) > 2 else ""
+            self.sends.append((self.now, str(args[0])))
+            self.send_windows.append(window)
+            if self.send_ms:
+                yield self.send_ms
+        elif name == "Sleep":
+            yield max(0.0, float(args[0]))
+        elif name == "SetTimer":
+            self.set_timer(args, no)
+        elif name == "ExitApp":
+            raise _Exit()
+        elif name == "Hotkey":
+            if len(args) < 2 or not isinstance(args[1], _FuncRef) or args[1].name not in self.functions:
+                raise SimulatorError(f"line {no}: Hotkey needs a key name and a function of the script")
+            self.hotkeys[str(args[0])] = args[1]
+        elif name == "Toast":
+            self.toasts.append((self.now, str(args[0]) if args else ""))
+        elif name in self.functions:
+            yield from self.call_function(name, args)
+        elif name in _BUILTIN_VALUES:
+            _BUILTIN_VALUES[name](*args)
+        elif name in _SIM_FUNCTIONS:
+            _SIM_FUNCTIONS[name](self, *args)
+        else:
+            raise SimulatorError(f"line {no}: unsupported command {name}")
+
+    def call_function(self, name, args):
+        params, body = self.functions[name]
+        frame = {"locals": dict(zip(params, args)), "globals": set()}
+        try:
+            yield from self.run_block(body, frame)
+        except _Return as r:
+            return r.value
+        return ""
+
+    def set_timer(self, args, no):
+        func = args[0]
+        if not isinstance(func, _FuncRef) or func.name not in self.functions:
+            raise SimulatorError(f"line {no}: SetTimer needs a function of the script")
+        period = float(args[1]) if len(args) > 1 else 250.0
+        if period == 0:
+            self.timers.pop(func.name, None)
+        else:
+            self.timers[func.name] = [self._tick_up(self.now + abs(period)), period]
+
+    # scheduler
+    def _running(self, source) -> bool:
+        return any(t.source == source for t in self.stack)
+
+    def _push(self, gen, source):
+        thread = _Thread(gen, source)
+        thread.wake_at = self.now
+        self.stack.append(thread)
+        self.max_depth = max(self.max_depth, len(self.stack))
+
+    def _resume_top(self):
+        thread = self.stack[-1]
+        try:
+            delay = next(thread.gen)
+        except StopIteration:
+            self.stack.pop()
+            return
+        except _Return:
+            self.stack.pop()
+            return
+        thread.wake_at = self._tick_up(self.now + delay) if delay else self.now
+
+    def run(self, duration_ms: float, presses=(), edits=()) -> None:
+        """Run until duration_ms; edits are (time_ms, file name, new text) triples."""
+        presses = sorted(presses)
+        edits = sorted(edits)
+        self._push(self.run_block(self.auto, None), None)
+        try:
+            while True:
+                if self.stack and self.stack[-1].wake_at <= self.now:
+                    self._resume_top()
+                    continue
+                candidates = [t[0] for t in self.timers.values()]
+                if presses:
+                    candidates.append(presses[0][0])
+                if edits:
+                    candidates.append(edits[0][0])
+                if self.stack:
+                    candidates.append(self.stack[-1].wake_at)
+                if not candidates:
+                    break
+                next_time = min(candidates)
+                if next_time > duration_ms:
+                    break
+                self.now = max(self.now, next_time)
+                while edits and edits[0][0] <= self.now:
+                    _, name, text = edits.pop(0)
+                    self.write_file(name, text)
+                while presses and presses[0][0] <= self.now:
+                    _, label = presses.pop(0)
+                    if label not in self.hotkeys:
+                        raise SimulatorError(f"no hotkey {label!r} in the script")
+                    if not self._running(label):
+                        target = self.hotkeys[label]
+                        if isinstance(target, _FuncRef):
+                            # bound with Hotkey(): the function gets the key name
+                            self._push(self.call_function(target.name, [label]), label)
+                        else:
+                            self._push(self.call_body(target), label)
+                for name, timer in list(self.timers.items()):
+                    due, period = timer
+                    if due > self.now:
+                        continue
+                    if self._running(name):
+                        # previous thread of this timer still running: tick is lost
+                        self.timer_skips += 1
+                        timer[0] = self._tick_up(self.now + abs(period))
+                        continue
+                    if period < 0:
+                        del self.timers[name]
+                    else:
+                        timer[0] = self._tick_up(self.now + period)
+                    self._push(self.call_function(name, []), name)
+        except _Exit:
+            self.exited = True
+
+    def call_body(self, body):
+        frame = {"locals": {}, "globals": set()}
+        try:
+            yield from self.run_block(body, frame)
+        except _Return:
+            pass
+
+
+def _max(*args):
+    return max(args)
+
+
+def _min(*args):
+    return min(args)
+
+
+_BUILTIN_VALUES = {
+    "Max": _max,
+    "Min": _min,
+    "Abs": abs,
+    "Round": lambda x, n=0: round(x, int(n)) if n else int(round(x)),
+    "Floor": math.floor,
+    "Ceil": math.ceil,
+    "Integer": lambda x: int(float(x)),
+    "RegExReplace": lambda text, pattern, repl="": re.sub(pattern, repl, str(text)),
+}
+
+
+def _expand_includes(text: str, files: dict) -> str:
+    by_key = {_file_key(name): content for name, content in files.items()}
+
+    def include(m):
+        key = _file_key(m.group(1).strip().strip('"'))
+        if key not in by_key:
+            raise SimulatorError(f"#Include: no file {m.group(1).strip()}")
+        return by_key[key]
+
+    return re.sub(r"(?im)^[ \t]*#Include[ \t]+(.+)$", include, text)
+
+
+def _file_key(path) -> str:
+    return re.split(r"[\\/]", str(path))[-1].lower()
+
+
+def _file_exist(sim, path):
+    return "A" if sim.file(path) is not None else ""
+
+
+def _file_get_time(sim, path, which="M"):
+    entry = sim.file(path)
+    if entry is None:
+        raise SimulatorError(f"FileGetTime: no file {path}")
+    # AutoHotkey time stamps have a one second resolution
+    return f"{int(entry[0] // 1000):014d}"
+
+
+def _file_get_size(sim, path):
+    entry = sim.file(path)
+    if entry is None:
+        raise SimulatorError(f"FileGetSize: no file {path}")
+    return len(entry[1].encode("utf-16-le")) + 2
+
+
+def _ini_read(sim, path, section, key, default=None):
+    entry = sim.file(path)
+    current = None
+    for line in (entry[1] if entry else "").splitlines():
+        line = line.strip()
+        if not line or line.startswith(";"):
+            continue
+        if line.startswith("[") and line.endswith("]"):
+            current = line[1:-1].strip().lower()
+        elif current == section.lower() and "=" in line:
+            k, v = line.split("=", 1)
+            if k.strip().lower() == key.lower():
+                return v.strip()
+    if default is None:
+        raise SimulatorError(f"IniRead: no {section}/{key} in {path}")
+    return default
+
+
+def _file_append(sim, text, path, encoding=""):
+    entry = sim.file(path)
+    sim.write_file(str(path), (entry[1] if entry else "") + str(text))
+
+
+def _file_move(sim, source, dest, overwrite=0):
+    entry = sim.file(source)
+    if entry is None:
+        raise SimulatorError(f"FileMove: no file {source}")
+    if sim.file(dest) is not None and not int(overwrite or 0):
+        raise SimulatorError(f"FileMove: {dest} exists")
+    del sim.files[_file_key(source)]
+    sim.files[_file_key(dest)] = entry
+
+
+def _win_exist(sim, title):
+    if sim.windows is None:
+        return 1
+    for i, name in enumerate(sim.windows, 1):
+        if str(title).lower() in name.lower():
+            return i
+    return 0
+
+
+_SIM_FUNCTIONS = {
+    "WinExist": _win_exist,
+    "FileExist": _file_exist,
+    "FileGetTime": _file_get_time,
+    "FileGetSize": _file_get_size,
+    "IniRead": _ini_read,
+    "FileAppend": _file_append,
+    "FileMove": _file_move,
+}
+
+
+def simulate(text: str, duration_ms: float = 3_600_000, presses=(), tick_ms: float = 15.6,
+             send_ms: float = 0.0, expected_delays: dict = None, cycle_key: str = None,
+             files: dict = None, edits=(), **sim_kwargs) -> SimulationReport:
+    """Run script text for duration_ms of virtual time and measure its sends.
+
+    presses: (time_ms, hotkey label) pairs. expected_delays maps a sent key
+    to the pause expected after it, used for the drift figures. cycle_key is
+    the key closing one cycle (default: the last distinct key sent). files
+    and edits (time_ms, name, text) feed the script's file functions.
+    """
+    sim = Simulator(text, tick_ms=tick_ms, send_ms=send_ms, files=files, **sim_kwargs)
+    sim.run(duration_ms, presses, edits)
+
+    counts = {}
+    for _, keys in sim.sends:
+        counts[keys] = counts.get(keys, 0) + 1
+    if cycle_key is None and sim.sends:
+        cycle_key = sim.sends[-1][1]
+    cycles = counts.get(cycle_key, 0)
+    hours = duration_ms / 3_600_000
+
+    # each window keeps its own cadence: delays are measured per window
+    by_window = {}
+    for (t, keys), window in zip(sim.sends, sim.send_windows):
+        by_window.setdefault(window, []).append((t, keys))
+    lateness = []
+    if expected_delays:
+        for sends in by_window.values():
+            for (t0, k0), (t1, _) in zip(sends, sends[1:]):
+                if k0 in expected_delays:
+                    lateness.append((t1 - t0) - expected_delays[k0])
+    return SimulationReport(
+        duration_ms=duration_ms,
+        sends=tuple(sim.sends),
+        send_counts=counts,
+        cycles=cycles,
+        cycles_per_hour=cycles / hours if hours else 0.0,
+        timer_skips=sim.timer_skips,
+        max_thread_depth=sim.max_depth,
+        total_drift_ms=sum(lateness),
+        mean_drift_ms=sum(lateness) / len(lateness) if lateness else 0.0,
+        max_drift_ms=max(lateness) if lateness else 0.0,
+        toasts=tuple(sim.toasts),
+        exited=sim.exited,
+        window_counts={w: len(v) for w, v in by_window.items()},
+    )
+
+
+def simulate_config(cfg: dict, duration_s: float = 3600, **kwargs) -> SimulationReport:
+    """Render the script of cfg, press its start/stop key at t=0 and simulate it.
+
+    A live config also gets its sidecar file, as write_params() would write it.
+    """
+    text = render_script(cfg)
+    # keys as recorded by Send, i.e. the unescaped Send arguments
+    params = params_values(cfg)
+    kwargs.setdefault("expected_delays", {
+        params["repel"]: params["repel_delay_ms"],
+        params["attract"]: params["attract_delay_ms"],
+    })
+    kwargs.setdefault("cycle_key", params["attract"])
+    name = script_filename(cfg)
+    kwargs.setdefault("script_path", "C:\\scripts\\" + name)
+    files = {}
+    if is_live(cfg):
+        files[params_path(name).name] = render_params(cfg, name)
+    if uses_shared_runtime(cfg):
+        files[RUNTIME_FILENAME] = render_runtime()
+    kwargs.setdefault("files", files)
+    toggle = hotkeys.to_key_name(cfg["toggle_shortcut"])
+    return simulate(text, duration_s * 1000, presses=[(0, toggle)], **kwargs)
@@ -0,0 +1,63 @@
+"""Crash-safe file writes."""
+import os
+import tempfile
+import time
+from contextlib import contextmanager
+from pathlib import Path
+
+# the umask can only be read by setting it: done once, before any writer thread runs
+_UMASK = os.umask(0o022)
+os.umask(_UMASK)
+
+
+@contextmanager
+def atomic_writer(path: Path, retries: int = 3, encoding: str = "utf-8", newline=None):
+    """Open a temp file next to path for writing; it replaces path on a clean exit.
+
+    For output written piece by piece (e.g. a streamed transform): readers
+    see the old file until the new one is complete, and an exception
+    (cancellation included) leaves the target untouched. The rename is
+    retried briefly since sync clients (OneDrive...) may hold the target
+    open for a moment.
+    """
+    path = Path(path)
+    fd, tmp = tempfile.mkstemp(prefix=f".{path.name}.", suffix=".tmp", dir=str(path.parent))
+    try:
+        with os.fdopen(fd, "w", encoding=encoding, newline=newline) as f:
+            yield f
+            f.flush()
+            os.fsync(f.fileno())
+        # mkstemp creates owner-only files: keep the permissions of the file we
+        # replace, or give a new one those open() would have
+        try:
+            mode = os.stat(path).st_mode & 0o777
+        except OSError:
+            mode = 0o666 & ~_UMASK
+        try:
+            os.chmod(tmp, mode)
+        except OSError:
+            pass
+        for attempt in range(retries):
+            try:
+                os.replace(tmp, path)
+                break
+            except PermissionError:
+                if attempt == retries - 1:
+                    raise
+                time.sleep(0.05 * (attempt + 1))
+    except BaseException:
+        try:
+            os.unlink(tmp)
+        except OSError:
+            pass
+        raise
+
+
+def write_text_atomic(path: Path, text: str, retries: int = 3, encoding: str = "utf-8") -> None:
+    """Write text to path through a synced temp file renamed over the target.
+
+    A crash mid-write leaves either the old or the new file, never a
+    truncated one.
+    """
+    with atomic_writer(path, retries=retries, encoding=encoding) as f:
+        f.write(text)
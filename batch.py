@@ -0,0 +1,143 @@
+"""Generate the scripts of many profiles at once on a worker pool."""
+import os
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from typing import NamedTuple
+
+from config import load_profiles
+from manifest import Manifest, render_and_write
+from script_generator import (
+    config_hash,
+    is_live,
+    require_script_path,
+    script_path,
+    template_for,
+    template_version,
+    uses_shared_runtime,
+    write_params,
+    write_runtime,
+)
+
+WRITTEN = "written"
+SKIPPED = "skipped"
+FAILED = "failed"
+
+
+class BatchResult(NamedTuple):
+    name: str
+    path: str
+    error: str = ""
+    status: str = WRITTEN
+    output_hash: str = ""
+    params_written: bool = False  # live profiles: the sidecar got new values
+
+    @property
+    def ok(self) -> bool:
+        return not self.error
+
+
+def _profile_name(profile: dict, index: int) -> str:
+    return str(profile.get("name") or f"profile_{index + 1}")
+
+
+def _failure(name: str, path, error) -> BatchResult:
+    return BatchResult(name, str(path) if path else "", str(error) or type(error).__name__, FAILED)
+
+
+def generate_profile(profile: dict, name: str = "", script: bool = True) -> BatchResult:
+    """Write the script of one profile, reporting failures instead of raising.
+
+    The sidecar of a live profile is refreshed too; script=False only does
+    that (the script is already current).
+    """
+    name = name or _profile_name(profile, 0)
+    out = script_path(profile)
+    try:
+        target = require_script_path(profile)
+        params = is_live(profile) and write_params(profile, target)
+        if not script:
+            return BatchResult(name, str(out), status=SKIPPED, params_written=params)
+        digest = render_and_write(profile, target)
+    except Exception as e:
+        return _failure(name, out, e)
+    return BatchResult(name, str(out), status=WRITTEN, output_hash=digest, params_written=params)
+
+
+def generate_batch(profiles=None, max_workers: int = None, use_processes: bool = False,
+                   force: bool = False) -> list:
+    """Generate one script per profile in parallel.
+
+    profiles defaults to the profiles of the saved config. Scripts that are
+    already up to date according to their folder's manifest are skipped
+    unless force is set. Threads are used by default since the work is
+    mostly file I/O; use_processes switches to a process pool. Returns one
+    BatchResult per profile, in input order.
+    """
+    if profiles is None:
+        profiles = load_profiles()
+    profiles = list(profiles)
+    names = [_profile_name(p, i) for i, p in enumerate(profiles)]
+
+    results = [None] * len(profiles)
+    manifests = {}
+    hashes = {}
+    templates = {}
+    seen = {}
+    todo = []
+    params_only = set()  # live profiles whose script is current: only the sidecar is checked
+    runtimes = {}  # folder -> error writing its shared runtime ("" if fine)
+    for i, profile in enumerate(profiles):
+        out = script_path(profile)
+        if out is not None:
+            # two profiles writing the same file would overwrite each other
+            key = os.path.normcase(os.path.abspath(out))
+            if key in seen:
+                results[i] = _failure(names[i], out, f"Même fichier de sortie que le profil {seen[key]}")
+                continue
+            seen[key] = names[i]
+            folder = out.parent
+            if folder not in manifests:
+                manifests[folder] = Manifest(folder)
+            if uses_shared_runtime(profile):
+                # one runtime per folder, written before the scripts including it
+                if folder not in runtimes:
+                    try:
+                        write_runtime(folder)
+                        runtimes[folder] = ""
+                    except OSError as e:
+                        runtimes[folder] = str(e) or type(e).__name__
+                if runtimes[folder]:
+                    results[i] = _failure(names[i], out, runtimes[folder])
+                    continue
+            hashes[i] = config_hash(profile)
+            templates[i] = template_version(template_for(profile))
+            if not force and manifests[folder].is_current(out, hashes[i], templates[i]):
+                if not is_live(profile):
+                    results[i] = BatchResult(names[i], str(out), status=SKIPPED)
+                    continue
+                params_only.add(i)
+        todo.append(i)
+
+    if todo:
+        workers = max_workers or min(32, (os.cpu_count() or 1) + 4, len(todo))
+        pool_cls = ProcessPoolExecutor if use_processes else ThreadPoolExecutor
+        with pool_cls(max_workers=workers) as pool:
+            futures = {i: pool.submit(generate_profile, profiles[i], names[i], i not in params_only)
+                       for i in todo}
+            for i, fut in futures.items():
+                try:
+                    results[i] = fut.result()
+                except Exception as e:
+                    results[i] = _failure(names[i], "", e)
+
+    for i in todo:
+        res = results[i]
+        if res.ok and res.status == WRITTEN:
+            out = script_path(profiles[i])
+            manifests[out.parent].record(out, hashes[i], res.output_hash, templates[i])
+    for manifest in manifests.values():
+        try:
+            manifest.save()
+        except OSError:
+            # the scripts are written; they will just be regenerated next time
+            pass
+    return results
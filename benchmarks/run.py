@@ -0,0 +1,243 @@
+"""Benchmark suite: config I/O, script rendering, page construction, start-up.
+
+Runs headless (offscreen Qt platform) and compares each result with the
+stored baselines in benchmarks/baselines.json:
+
+    python benchmarks/run.py                   # compare, exit 1 on regression
+    python benchmarks/run.py --update          # record new baselines
+    python benchmarks/run.py --threshold 0.25  # allowed slowdown (default 0.5 = +50%)
+    python benchmarks/run.py -k render         # only benchmarks whose name contains "render"
+
+Timings are compared relative to a fixed pure-Python calibration loop
+timed in the same run, which absorbs most of the difference between
+machines and CPU frequency changes. Record baselines on a machine close to
+the one running the comparison all the same.
+"""
+import argparse
+import json
+import os
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+import config  # noqa: E402
+from script_generator import render_script  # noqa: E402
+
+BASELINE_FILE = Path(__file__).resolve().parent / "baselines.json"
+DEFAULT_THRESHOLD = 0.5
+
+SAMPLE_CONFIG = {
+    "first_run": False,
+    "attract_shortcut": "2",
+    "repel_shortcut": "3",
+    "toggle_shortcut": "F11",
+    "delay_seconds": 4.0,
+    "storage_path": "",
+}
+
+# name -> (function, repeats); each function runs one timed sample
+BENCHMARKS = {}
+
+
+def benchmark(name: str, repeats: int = 10):
+    def register(func):
+        BENCHMARKS[name] = (func, repeats)
+        return func
+    return register
+
+
+@benchmark("config_roundtrip_x100", repeats=10)
+def bench_config_roundtrip():
+    for i in range(100):
+        config.save_config(dict(SAMPLE_CONFIG, delay_seconds=float(i)))
+        config.invalidate_config_cache()
+        config.load_config()
+
+
+@benchmark("config_cached_load_x1000", repeats=10)
+def bench_config_cached_load():
+    for _ in range(1000):
+        config.load_config()
+
+
+_PROFILES = [
+    dict(SAMPLE_CONFIG, name=f"acc{i}", attract_shortcut=f"F{i % 10 + 1}", repel_shortcut=str(i % 10))
+    for i in range(5000)
+]
+
+
+@benchmark("render_scripts_x5000", repeats=5)
+def bench_render_scripts():
+    for profile in _PROFILES:
+        render_script(profile)
+
+
+_app = None
+
+
+def _qapp():
+    # keep a reference, Qt aborts if the application object is collected
+    global _app
+    from PyQt5.QtWidgets import QApplication
+
+    if _app is None:
+        from ui import theme
+
+        _app = QApplication.instance() or QApplication([])
+        # pages are polished against the real stylesheet
+        theme.apply_theme(_app)
+    return _app
+
+
+def _register_page_benchmarks() -> bool:
+    """Add the page and start-up benchmarks; False (nothing added) if PyQt5 is missing."""
+    try:
+        import PyQt5.QtWidgets  # noqa: F401
+    except ImportError:
+        return False
+    import main
+
+    for page_name, factory in main.PAGE_FACTORIES.items():
+        def build(factory=factory):
+            _qapp()
+            for _ in range(10):
+                page = factory(lambda name: None)
+                page.deleteLater()
+
+        benchmark(f"page_{page_name}_x10", repeats=20)(build)
+
+    @benchmark("app_startup", repeats=20)
+    def bench_app_startup():
+        app = _qapp()
+        window = main.App(warm_pages=False)
+        window.show()
+        window.navigate_to("settings" if config.is_first_run() else "main")
+        app.processEvents()
+        window.close()
+        window.deleteLater()
+
+    return True
+
+
+CALIBRATION = "_calibration"
+
+
+def _calibration_loop():
+    # fixed mix of dict, string and arithmetic work, the bread and butter of the app
+    d = {}
+    for i in range(20000):
+        d[str(i)] = i * 3 % 7
+    "".join(k for k in d if d[k] == 1)
+
+
+def time_benchmark(func, repeats: int) -> dict:
+    func()  # warm-up run, not measured (imports, caches)
+    samples = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        func()
+        samples.append(time.perf_counter() - start)
+    return {"median": statistics.median(samples), "min": min(samples), "repeats": repeats}
+
+
+def run(names=None, repeats=None) -> dict:
+    """Run the selected benchmarks against a temporary config file."""
+    results = {}
+    saved_file = config.CONFIG_FILE
+    with tempfile.TemporaryDirectory() as tmp:
+        config.CONFIG_FILE = Path(tmp) / "app_config.json"
+        config.invalidate_config_cache()
+        config.save_config(SAMPLE_CONFIG)
+        try:
+            results[CALIBRATION] = time_benchmark(_calibration_loop, 20)
+            for name, (func, default_repeats) in BENCHMARKS.items():
+                if names and not any(n in name for n in names):
+                    continue
+                results[name] = time_benchmark(func, repeats or default_repeats)
+                # leave the shared file as the other benchmarks expect it
+                config.save_config(SAMPLE_CONFIG)
+        finally:
+            config.CONFIG_FILE = saved_file
+            config.invalidate_config_cache()
+    return results
+
+
+def compare(results: dict, baselines: dict, threshold: float) -> list:
+    """Return (name, baseline ratio, current ratio) for results slower than allowed.
+
+    The fastest run of each benchmark is compared, as a multiple of the
+    calibration loop: it is the least affected by noise from the rest of
+    the machine.
+    """
+    regressions = []
+    for name in results:
+        if name == CALIBRATION:
+            continue
+        base, cur = relative(baselines, name), relative(results, name)
+        if base and cur and cur > base * (1 + threshold):
+            regressions.append((name, base, cur))
+    return regressions
+
+
+def missing_baselines(results: dict, baselines: dict) -> list:
+    """Names of the results that have no baseline to be compared with."""
+    return [name for name in results if name != CALIBRATION and name not in baselines]
+
+
+def relative(results: dict, name: str):
+    """Return the best time of name in units of the calibration loop."""
+    res, cal = results.get(name), results.get(CALIBRATION)
+    if not res or not cal:
+        return None
+    return res["min"] / cal["min"]
+
+
+def load_baselines(path: Path = BASELINE_FILE) -> dict:
+    try:
+        return json.loads(path.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return {}
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--update", action="store_true", help="store the results as new baselines")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD, help="allowed slowdown ratio")
+    parser.add_argument("--repeats", type=int, default=None, help="override the number of timed runs")
+    parser.add_argument("-k", dest="names", action="append", help="only run benchmarks matching this name")
+    args = parser.parse_args(argv)
+
+    if not _register_page_benchmarks():
+        print("PyQt5 absent: page and start-up benchmarks skipped", file=sys.stderr)
+    results = run(args.names, args.repeats)
+    baselines = load_baselines()
+    for name, res in results.items():
+        base, cur = relative(baselines, name), relative(results, name)
+        ratio = f"{cur / base:5.2f}x" if base and name != CALIBRATION else "    -"
+        print(f"{name:28s} min {res['min'] * 1000:9.3f} ms  median {res['median'] * 1000:9.3f} ms  {ratio}")
+
+    if args.update:
+        baselines.update(results)
+        BASELINE_FILE.write_text(json.dumps(baselines, indent=2, sort_keys=True) + "\n", encoding="utf-8")
+        print(f"baselines written to {BASELINE_FILE}")
+        return 0
+
+    regressions = compare(results, baselines, args.threshold)
+    for name, base, cur in regressions:
+        print(f"REGRESSION {name}: {base:.2f} -> {cur:.2f} calibration units", file=sys.stderr)
+    # a benchmark without a baseline is not checked at all: record it with --update
+    missing = missing_baselines(results, baselines)
+    for name in missing:
+        print(f"NO BASELINE {name}: run with --update to record it", file=sys.stderr)
+    return 1 if regressions or missing else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,172 @@
+"""Command line entry point for headless script generation.
+
+Usage: python -m cli <command> [options]
+
+This module must not import PyQt5 (directly or through ui/) so that it
+starts fast on machines used for automation.
+"""
+import argparse
+import json
+import sys
+import time
+from pathlib import Path
+
+import config
+import daemon
+from batch import FAILED, SKIPPED, WRITTEN, generate_batch
+from manifest import generate_script
+from script_generator import ScriptConfigError, validate_config
+from text_batch import collect_files, summarize, transform_batch
+
+
+def _select_profiles(args) -> list:
+    if args.profile:
+        profile = config.get_profile(args.profile)
+        if profile is None:
+            raise SystemExit(f"Profil inconnu: {args.profile}")
+        return [profile]
+    return config.load_profiles()
+
+
+def cmd_generate(args) -> int:
+    profiles = _select_profiles(args)
+    if len(profiles) > 1:
+        print("Plusieurs profils définis: utiliser --profile ou la commande batch.", file=sys.stderr)
+        return 1
+    try:
+        result = generate_script(profiles[0], args.output, force=args.force)
+    except (ScriptConfigError, OSError) as e:
+        print(f"Erreur: {e}", file=sys.stderr)
+        return 1
+    params = ", paramètres mis à jour" if result.params_written else ""
+    print(f"{result.path} ({'réécrit' if result.written else 'inchangé'}{params})")
+    return 0
+
+
+def cmd_validate(args) -> int:
+    status = 0
+    for i, profile in enumerate(_select_profiles(args)):
+        name = profile.get("name") or f"profile_{i + 1}"
+        errors = validate_config(profile)
+        if errors:
+            status = 1
+            for err in errors:
+                print(f"{name}: {err}", file=sys.stderr)
+        else:
+            print(f"{name}: OK")
+    return status
+
+
+def cmd_show_config(args) -> int:
+    data = _select_profiles(args)[0] if args.profile else config.load_config()
+    print(json.dumps(data, indent=2, ensure_ascii=False))
+    return 0
+
+
+def cmd_batch(args) -> int:
+    results = generate_batch(max_workers=args.workers, use_processes=args.processes, force=args.force)
+    labels = {WRITTEN: "réécrit", SKIPPED: "inchangé"}
+    for r in results:
+        if r.ok:
+            params = ", paramètres mis à jour" if r.params_written else ""
+            print(f"{r.name}: {r.path} ({labels[r.status]}{params})")
+        else:
+            print(f"{r.name}: ERREUR {r.error}", file=sys.stderr)
+    counts = {status: sum(1 for r in results if r.status == status) for status in (WRITTEN, SKIPPED, FAILED)}
+    print(f"{counts[WRITTEN]} réécrits, {counts[SKIPPED]} inchangés, {counts[FAILED]} en erreur")
+    return 1 if counts[FAILED] else 0
+
+
+def cmd_text(args) -> int:
+    sources = collect_files(args.source)
+    if not sources:
+        print(f"Aucun fichier pour {args.source}", file=sys.stderr)
+        return 1
+
+    def on_result(done, total, r):
+        if r.ok:
+            print(f"{r.src} -> {r.dst} ({r.size} o, {r.seconds * 1000:.1f} ms)")
+        else:
+            print(f"{r.src}: ERREUR {r.error}", file=sys.stderr)
+
+    start = time.perf_counter()
+    results = transform_batch(sources, args.transform, out_dir=args.output, suffix=args.suffix,
+                              max_workers=args.workers, use_processes=not args.threads, on_result=on_result)
+    s = summarize(results, time.perf_counter() - start)
+    print(f"{s.files - s.failed} fichiers transformés, {s.failed} en erreur, "
+          f"{s.size / 1e6:.1f} Mo en {s.seconds:.2f} s ({s.mb_per_second:.1f} Mo/s, {s.files_per_second:.0f} fichiers/s)")
+    return 1 if s.failed else 0
+
+
+def cmd_daemon(args) -> int:
+    daemon.serve(socket_path=args.socket, port=args.port)
+    return 0
+
+
+def cmd_call(args) -> int:
+    try:
+        params = json.loads(args.params) if args.params else {}
+        result = daemon.call(args.method, params)
+    except (daemon.RpcError, OSError, ValueError) as e:
+        print(f"Erreur: {e}", file=sys.stderr)
+        return 1
+    print(json.dumps(result, indent=2, ensure_ascii=False))
+    return 0
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog="python -m cli", description="Dragodinde Helper sans interface")
+    parser.add_argument("--config", help="fichier de configuration (défaut: app_config.json)")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    p = sub.add_parser("generate", help="générer le script d'un profil")
+    p.add_argument("--profile", help="nom du profil")
+    p.add_argument("-o", "--output", help="fichier de sortie (défaut: storage_path)")
+    p.add_argument("--force", action="store_true", help="réécrire même si le script est à jour")
+    p.set_defaults(func=cmd_generate)
+
+    p = sub.add_parser("validate", help="vérifier la configuration")
+    p.add_argument("--profile", help="nom du profil")
+    p.set_defaults(func=cmd_validate)
+
+    p = sub.add_parser("show-config", help="afficher la configuration")
+    p.add_argument("--profile", help="nom du profil")
+    p.set_defaults(func=cmd_show_config)
+
+    p = sub.add_parser("batch", help="générer les scripts de tous les profils")
+    p.add_argument("--workers", type=int, default=None, help="nombre de workers")
+    p.add_argument("--processes", action="store_true", help="utiliser des processus plutôt que des threads")
+    p.add_argument("--force", action="store_true", help="réécrire même les scripts à jour")
+    p.set_defaults(func=cmd_batch)
+
+    p = sub.add_parser("text", help="inverser ou changer la casse de fichiers texte")
+    p.add_argument("transform", choices=("reverse", "swapcase"))
+    p.add_argument("source", help="dossier ou motif glob (** accepté)")
+    p.add_argument("-o", "--output", help="dossier de sortie (défaut: à côté des fichiers)")
+    p.add_argument("--suffix", default=None, help="ajouté au nom des fichiers produits")
+    p.add_argument("--workers", type=int, default=None, help="nombre de workers")
+    p.add_argument("--threads", action="store_true", help="utiliser des threads plutôt que des processus")
+    p.set_defaults(func=cmd_text)
+
+    p = sub.add_parser("daemon", help="service résident pour l'automatisation (JSON-RPC local)")
+    p.add_argument("--socket", help="chemin du socket Unix (défaut: dossier temporaire)")
+    p.add_argument("--port", type=int, default=None, help="écouter sur 127.0.0.1:PORT plutôt qu'un socket Unix")
+    p.set_defaults(func=cmd_daemon)
+
+    p = sub.add_parser("call", help="appeler le service résident")
+    p.add_argument("method", help="ping, generate, validate, batch, stats ou shutdown")
+    p.add_argument("params", nargs="?", help='paramètres JSON, ex. \'{"profile": "compte1"}\'')
+    p.set_defaults(func=cmd_call)
+    return parser
+
+
+def main(argv=None) -> int:
+    args = build_parser().parse_args(argv)
+    if args.config:
+        config.CONFIG_FILE = Path(args.config).resolve()
+        config.invalidate_config_cache()
+    return args.func(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,6 +1,13 @@
+import atexit
+import copy
 import json
+import sys
+import threading
 from pathlib import Path
 
+import startup_trace
+from atomic_io import write_text_atomic
+
 CONFIG_FILE = Path(__file__).resolve().parent / "app_config.json"
 
 
@@ -9,24 +16,155 @@ DEFAULT_CONFIG = {
     "attract_shortcut": "",
     "repel_shortcut": "",
     "delay_seconds": 4.0,
-    "storage_path": ""
+    "storage_path": "",
+    # script reads keys and delays from a sidecar file (see script_generator)
+    "live_params": False,
+    # script appends per-action timings to a CSV (see telemetry.py)
+    "telemetry": False
 }
 
+# parsed config kept in memory, keyed on (path, mtime, size) of the file it came from
+_cache_key = None
+_cache_data = None
+
+# delayed writes: bursts of save_config_later() calls end up as one disk write
+SAVE_DELAY_SECONDS = 0.5
+# a delayed write that failed (locked file, drive gone) is tried again after this
+SAVE_RETRY_SECONDS = 5.0
+_lock = threading.RLock()
+_pending = None
+_timer = None
+
+
+def _file_key():
+    try:
+        st = CONFIG_FILE.stat()
+    except OSError:
+        return None
+    return (str(CONFIG_FILE), st.st_mtime_ns, st.st_size)
+
+
+def invalidate_config_cache() -> None:
+    """Forget the cached config so the next load_config() reads the file again."""
+    global _cache_key, _cache_data
+    with _lock:
+        _cache_key = None
+        _cache_data = None
+
 
 def load_config() -> dict:
-    if CONFIG_FILE.exists():
-        try:
-            with open(CONFIG_FILE, "r", encoding="utf-8") as f:
-                return json.load(f)
-        except Exception:
+    """Return the config, re-reading the file only when it changed on disk.
+
+    A save scheduled with save_config_later() is visible immediately. The
+    returned dict is a private copy, callers may modify it freely.
+    """
+    global _cache_key, _cache_data
+    with _lock:
+        if _pending is not None:
+            return copy.deepcopy(_pending)
+        key = _file_key()
+        if key is None:
             return DEFAULT_CONFIG.copy()
-    return DEFAULT_CONFIG.copy()
+        if key != _cache_key:
+            with startup_trace.span("read config"):
+                try:
+                    with open(CONFIG_FILE, "r", encoding="utf-8") as f:
+                        data = json.load(f)
+                except Exception:
+                    data = DEFAULT_CONFIG.copy()
+            _cache_key = key
+            _cache_data = data
+        return copy.deepcopy(_cache_data)
+
+
+def _cancel_pending() -> None:
+    global _pending, _timer
+    if _timer is not None:
+        _timer.cancel()
+    _timer = None
+    _pending = None
 
 
 def save_config(cfg: dict) -> None:
+    """Write cfg to disk now, replacing any save scheduled with save_config_later()."""
+    global _cache_key, _cache_data
+    data = DEFAULT_CONFIG.copy()
+    data.update(cfg or {})
+    with _lock:
+        write_text_atomic(CONFIG_FILE, json.dumps(data, indent=2, ensure_ascii=False))
+        # only once written: if the write fails, a scheduled save is still pending
+        _cancel_pending()
+        # what we just wrote is the new cached state, no need to parse it back
+        _cache_key = _file_key()
+        _cache_data = copy.deepcopy(data)
+
+
+def save_config_later(cfg: dict, delay: float = None) -> None:
+    """Schedule cfg to be written after delay seconds.
+
+    Calls made before the write happens replace the pending config and push
+    the write back, so a burst of saves costs a single disk write.
+    """
+    global _pending
     data = DEFAULT_CONFIG.copy()
     data.update(cfg or {})
-    CONFIG_FILE.write_text(json.dumps(data, indent=2, ensure_ascii=False), encoding="utf-8")
+    with _lock:
+        if _timer is not None:
+            _timer.cancel()
+        _pending = data
+        _start_timer(SAVE_DELAY_SECONDS if delay is None else delay)
+
+
+def _start_timer(delay: float) -> None:
+    global _timer
+    _timer = threading.Timer(delay, _flush_from_timer)
+    _timer.daemon = True
+    _timer.start()
+
+
+def _flush_from_timer() -> None:
+    # nobody is there to catch an error on the timer thread: report it and try again later
+    with _lock:
+        try:
+            flush_pending_save()
+        except OSError as e:
+            print(f"Configuration non enregistrée ({e}), nouvel essai dans {SAVE_RETRY_SECONDS:g} s.",
+                  file=sys.stderr)
+            _start_timer(SAVE_RETRY_SECONDS)
+
+
+def flush_pending_save() -> None:
+    """Write the config scheduled by save_config_later(), if any, right now."""
+    with _lock:
+        if _pending is not None:
+            save_config(_pending)
+
+
+atexit.register(flush_pending_save)
+
+
+def load_profiles(cfg: dict = None) -> list:
+    """Return the profiles defined in cfg (default: the saved config).
+
+    A config may hold a "profiles" list; each entry only needs the keys that
+    differ from the top-level values, which act as defaults. A config without
+    profiles is a single profile.
+    """
+    if cfg is None:
+        cfg = load_config()
+    base = {k: v for k, v in cfg.items() if k != "profiles"}
+    profiles = cfg.get("profiles") or []
+    if not profiles:
+        return [base]
+    return [dict(base, **p) for p in profiles if isinstance(p, dict)]
+
+
+def get_profile(name: str, cfg: dict = None):
+    """Return the profile called name, or None if there is no such profile."""
+    for profile in load_profiles(cfg):
+        if profile.get("name") == name:
+            return profile
+    return None
 
 
 def is_first_run() -> bool:
@@ -36,5 +174,7 @@ def is_first_run() -> bool:
 
 def set_first_run(value: bool):
     cfg = load_config()
+    if cfg.get("first_run") is bool(value):
+        return
     cfg["first_run"] = bool(value)
     save_config(cfg)
@@ -0,0 +1,322 @@
+"""Resident generation service for automation (python -m cli daemon).
+
+Scheduled tasks that regenerate scripts many times a day pay the Python
+start-up, the imports and the config parsing on every run. The daemon
+pays them once: the config stays cached (config.py), templates stay
+compiled (script_generator) and each call only does the generation.
+
+Transport: newline-delimited JSON-RPC 2.0 over a Unix socket, or over
+127.0.0.1 TCP where Unix sockets are not available (Windows) or when a
+port is given. Several requests may be sent on one connection. The
+address and a random token are written to a state file next to the config
+file, only the user can read it; every request carries the token in its
+params:
+
+    {"jsonrpc": "2.0", "id": 1, "method": "generate",
+     "params": {"token": "...", "profile": "acc1"}}
+
+Methods: ping, generate, validate, batch, stats, shutdown. Like cli.py,
+this module does not import PyQt5.
+"""
+import json
+import os
+import secrets
+import socket
+import socketserver
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+import config
+from batch import FAILED, SKIPPED, WRITTEN, generate_batch
+from manifest import generate_script
+from script_generator import (
+    PARAMS_TEMPLATE,
+    RUNTIME_TEMPLATE,
+    ScriptConfigError,
+    compile_template,
+    template_for,
+    validate_config,
+)
+from single_instance import server_name
+
+# JSON-RPC 2.0 error codes
+PARSE_ERROR = -32700
+INVALID_REQUEST = -32600
+METHOD_NOT_FOUND = -32601
+INVALID_PARAMS = -32602
+INTERNAL_ERROR = -32603
+APP_ERROR = -32000
+
+USE_TCP = not hasattr(socket, "AF_UNIX")
+
+
+class RpcError(Exception):
+    def __init__(self, code: int, message: str):
+        super().__init__(message)
+        self.code = code
+
+
+def state_path() -> Path:
+    """File holding the address and token of the daemon for the current config.
+
+    Next to the config file rather than in the shared temp folder, where
+    another user could choose what the name points to.
+    """
+    return config.CONFIG_FILE.with_name(f"{server_name()}-daemon.json")
+
+
+def default_socket_path() -> str:
+    return os.path.join(tempfile.gettempdir(), f"{server_name()}-daemon.sock")
+
+
+def _select_profiles(params: dict) -> list:
+    name = params.get("profile")
+    if name:
+        profile = config.get_profile(name)
+        if profile is None:
+            raise RpcError(INVALID_PARAMS, f"Profil inconnu: {name}")
+        return [profile]
+    return config.load_profiles()
+
+
+class Metrics:
+    """Call count and timings per method, shared by the handler threads."""
+
+    def __init__(self):
+        self.started = time.time()
+        self._lock = threading.Lock()
+        self._methods = {}
+
+    def record(self, method: str, ms: float, ok: bool) -> None:
+        with self._lock:
+            m = self._methods.setdefault(method, {"calls": 0, "errors": 0, "total_ms": 0.0, "max_ms": 0.0})
+            m["calls"] += 1
+            m["errors"] += 0 if ok else 1
+            m["total_ms"] += ms
+            m["max_ms"] = max(m["max_ms"], ms)
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            methods = {name: dict(m, mean_ms=m["total_ms"] / m["calls"]) for name, m in self._methods.items()}
+        return {"uptime_s": time.time() - self.started, "methods": methods}
+
+
+class Service:
+    """The methods the daemon exposes, independent from the transport."""
+
+    def __init__(self, token: str = ""):
+        self.token = token
+        self.metrics = Metrics()
+        self.on_shutdown = None
+        # generate and batch write scripts and manifests: one at a time
+        self._write_lock = threading.Lock()
+
+    def warm_up(self) -> None:
+        """Parse the config and compile the templates now rather than on the first call."""
+        for template in {template_for(p) for p in config.load_profiles()} | {PARAMS_TEMPLATE, RUNTIME_TEMPLATE}:
+            compile_template(template)
+
+    def handle(self, request) -> dict:
+        """Answer one decoded JSON-RPC request; None for a well-formed notification (no id)."""
+        req_id = request.get("id") if isinstance(request, dict) else None
+        start = time.perf_counter()
+        method = "?"
+        valid = False
+        try:
+            if not isinstance(request, dict) or request.get("jsonrpc") != "2.0" \
+                    or not isinstance(request.get("method"), str):
+                raise RpcError(INVALID_REQUEST, "Requête JSON-RPC 2.0 invalide")
+            method = request["method"]
+            valid = True
+            params = request.get("params") or {}
+            if not isinstance(params, dict):
+                raise RpcError(INVALID_PARAMS, "params doit être un objet")
+            if self.token and not secrets.compare_digest(str(params.get("token", "")), self.token):
+                raise RpcError(INVALID_REQUEST, "Jeton invalide")
+            fn = getattr(self, "rpc_" + method, None)
+            if fn is None:
+                raise RpcError(METHOD_NOT_FOUND, f"Méthode inconnue: {method}")
+            result = fn({k: v for k, v in params.items() if k != "token"})
+            ok = True
+            response = {"jsonrpc": "2.0", "id": req_id, "result": result}
+        except RpcError as e:
+            ok = False
+            response = {"jsonrpc": "2.0", "id": req_id, "error": {"code": e.code, "message": str(e)}}
+        except (ScriptConfigError, OSError) as e:
+            ok = False
+            response = {"jsonrpc": "2.0", "id": req_id, "error": {"code": APP_ERROR, "message": str(e)}}
+        except Exception as e:
+            # a bug in one call must not take the connection (or the daemon) down
+            ok = False
+            message = str(e) or type(e).__name__
+            response = {"jsonrpc": "2.0", "id": req_id, "error": {"code": INTERNAL_ERROR, "message": message}}
+        ms = (time.perf_counter() - start) * 1000
+        self.metrics.record(method, ms, ok)
+        if ok and isinstance(response["result"], dict):
+            response["result"]["ms"] = round(ms, 3)
+        if valid and "id" not in request:
+            return None
+        return response
+
+    def rpc_ping(self, params: dict) -> dict:
+        return {"pid": os.getpid()}
+
+    def rpc_generate(self, params: dict) -> dict:
+        profiles = _select_profiles(params)
+        if len(profiles) > 1:
+            raise RpcError(INVALID_PARAMS, "Plusieurs profils définis: préciser profile ou utiliser batch.")
+        with self._write_lock:
+            result = generate_script(profiles[0], params.get("output"), force=bool(params.get("force")))
+        return {"path": str(result.path), "written": result.written, "params_written": result.params_written}
+
+    def rpc_validate(self, params: dict) -> dict:
+        report = []
+        for i, profile in enumerate(_select_profiles(params)):
+            name = profile.get("name") or f"profile_{i + 1}"
+            report.append({"name": name, "errors": validate_config(profile)})
+        return {"ok": not any(p["errors"] for p in report), "profiles": report}
+
+    def rpc_batch(self, params: dict) -> dict:
+        with self._write_lock:
+            results = generate_batch(max_workers=params.get("workers"), force=bool(params.get("force")))
+        counts = {status: sum(1 for r in results if r.status == status) for status in (WRITTEN, SKIPPED, FAILED)}
+        return {"results": [r._asdict() for r in results], **counts}
+
+    def rpc_stats(self, params: dict) -> dict:
+        return self.metrics.snapshot()
+
+    def rpc_shutdown(self, params: dict) -> dict:
+        if self.on_shutdown is not None:
+            self.on_shutdown()
+        return {}
+
+
+class _Handler(socketserver.StreamRequestHandler):
+    def handle(self):
+        service = self.server.service
+        for line in self.rfile:
+            if not line.strip():
+                continue
+            try:
+                request = json.loads(line.decode("utf-8"))
+            except ValueError as e:
+                response = {"jsonrpc": "2.0", "id": None, "error": {"code": PARSE_ERROR, "message": str(e)}}
+            else:
+                response = service.handle(request)
+            if response is not None:
+                self.wfile.write(json.dumps(response, ensure_ascii=False).encode("utf-8") + b"\n")
+                self.wfile.flush()
+
+
+class _TcpServer(socketserver.ThreadingTCPServer):
+    daemon_threads = True
+    allow_reuse_address = True
+
+
+if not USE_TCP:
+    class _UnixServer(socketserver.ThreadingUnixStreamServer):
+        daemon_threads = True
+
+
+def make_server(service: Service, socket_path: str = None, port: int = None):
+    """Bind the server: TCP on 127.0.0.1 if port is given (0: any free port) or if
+    Unix sockets are unavailable, else a Unix socket only the user can open."""
+    if port is not None or USE_TCP:
+        server = _TcpServer(("127.0.0.1", port or 0), _Handler)
+        address = {"tcp": list(server.server_address)}
+    else:
+        path = socket_path or default_socket_path()
+        if os.path.exists(path):
+            # left by a daemon that did not exit cleanly, unless one still answers
+            if _alive({"unix": path}):
+                raise OSError(f"Un service écoute déjà sur {path}")
+            os.unlink(path)
+        old_umask = os.umask(0o177)
+        try:
+            server = _UnixServer(path, _Handler)
+        finally:
+            os.umask(old_umask)
+        address = {"unix": path}
+    server.service = service
+    service.on_shutdown = lambda: threading.Thread(target=server.shutdown, daemon=True).start()
+    return server, address
+
+
+def _alive(address: dict) -> bool:
+    try:
+        with _connect(address, timeout=0.5):
+            return True
+    except OSError:
+        return False
+
+
+def _connect(address: dict, timeout: float) -> socket.socket:
+    if "unix" in address:
+        s = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        target = address["unix"]
+    else:
+        s = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        target = tuple(address["tcp"])
+    s.settimeout(timeout)
+    try:
+        s.connect(target)
+    except OSError:
+        s.close()
+        raise
+    return s
+
+
+def _write_state(path: Path, info: dict) -> None:
+    """Write info to a fresh owner-only file at path, never through an existing file or link."""
+    try:
+        os.unlink(path)  # left by a daemon that did not exit cleanly
+    except FileNotFoundError:
+        pass
+    # owner-only, like the socket: the token is what stops other local users
+    flags = os.O_WRONLY | os.O_CREAT | os.O_EXCL | getattr(os, "O_NOFOLLOW", 0)
+    fd = os.open(path, flags, 0o600)
+    with os.fdopen(fd, "w", encoding="utf-8") as f:
+        json.dump(info, f)
+
+
+def serve(socket_path: str = None, port: int = None) -> None:
+    """Run the daemon until a shutdown call or Ctrl+C."""
+    service = Service(token=secrets.token_hex(16))
+    service.warm_up()
+    server, address = make_server(service, socket_path, port)
+    state = state_path()
+    _write_state(state, {"address": address, "token": service.token, "pid": os.getpid()})
+    print(f"Service prêt: {address} (état dans {state})", flush=True)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        for path in (state, address.get("unix")):
+            if path:
+                try:
+                    os.unlink(path)
+                except OSError:
+                    pass
+
+
+def call(method: str, params: dict = None, state: Path = None, timeout: float = 60.0):
+    """Call method on the running daemon; returns its result or raises RpcError/OSError."""
+    info = json.loads(Path(state or state_path()).read_text(encoding="utf-8"))
+    request = {"jsonrpc": "2.0", "id": 1, "method": method,
+               "params": dict(params or {}, token=info["token"])}
+    with _connect(info["address"], timeout) as s:
+        s.sendall(json.dumps(request).encode("utf-8") + b"\n")
+        reply = b""
+        while not reply.endswith(b"\n"):
+            chunk = s.recv(65536)
+            if not chunk:
+                break
+            reply += chunk
+    response = json.loads(reply.decode("utf-8"))
+    if "error" in response:
+        raise RpcError(response["error"]["code"], response["error"]["message"])
+    return response["result"]
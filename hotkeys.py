@@ -0,0 +1,165 @@
+"""Shortcut strings as shown in the UI, translated to AutoHotkey v2 syntax.
+
+Shortcuts are stored the way KeySequenceEdit displays them, e.g. "F11",
+"Ctrl+Shift+A", "Num5" or "Mouse4". This module turns them into hotkey
+labels ("^+a") and Send arguments ("^+a", "{F11}"). The tables are built
+once at import; lookups are case-insensitive so older configs such as
+"ESC" still parse.
+"""
+from functools import lru_cache
+
+MODIFIERS = (
+    # display name, AutoHotkey symbol
+    ("Ctrl", "^"),
+    ("Alt", "!"),
+    ("Shift", "+"),
+    ("Meta", "#"),
+)
+
+_MODIFIER_ALIASES = {"ctrl": "Ctrl", "control": "Ctrl", "alt": "Alt", "shift": "Shift", "meta": "Meta", "win": "Meta"}
+_MODIFIER_SYMBOLS = dict(MODIFIERS)
+
+# display name -> AutoHotkey key name, for every key that is not a single character
+NAMED_KEYS = [
+    ("Esc", "Escape"),
+    ("Tab", "Tab"),
+    ("Backspace", "Backspace"),
+    ("Enter", "Enter"),
+    ("Space", "Space"),
+    ("Insert", "Insert"),
+    ("Delete", "Delete"),
+    ("Home", "Home"),
+    ("End", "End"),
+    ("PageUp", "PgUp"),
+    ("PageDown", "PgDn"),
+    ("Up", "Up"),
+    ("Down", "Down"),
+    ("Left", "Left"),
+    ("Right", "Right"),
+    ("CapsLock", "CapsLock"),
+    ("NumLock", "NumLock"),
+    ("ScrollLock", "ScrollLock"),
+    ("PrintScreen", "PrintScreen"),
+    ("Pause", "Pause"),
+    ("Menu", "AppsKey"),
+    ("Num.", "NumpadDot"),
+    ("Num/", "NumpadDiv"),
+    ("Num*", "NumpadMult"),
+    ("Num-", "NumpadSub"),
+    ("Num+", "NumpadAdd"),
+    ("NumEnter", "NumpadEnter"),
+    ("VolumeUp", "Volume_Up"),
+    ("VolumeDown", "Volume_Down"),
+    ("VolumeMute", "Volume_Mute"),
+    ("MediaPlay", "Media_Play_Pause"),
+    ("MediaStop", "Media_Stop"),
+    ("MediaNext", "Media_Next"),
+    ("MediaPrevious", "Media_Prev"),
+    ("BrowserBack", "Browser_Back"),
+    ("BrowserForward", "Browser_Forward"),
+    ("BrowserRefresh", "Browser_Refresh"),
+    ("BrowserHome", "Browser_Home"),
+    ("MouseMiddle", "MButton"),
+    ("Mouse4", "XButton1"),
+    ("Mouse5", "XButton2"),
+    ("WheelUp", "WheelUp"),
+    ("WheelDown", "WheelDown"),
+]
+NAMED_KEYS += [(f"F{i}", f"F{i}") for i in range(1, 25)]
+NAMED_KEYS += [(f"Num{i}", f"Numpad{i}") for i in range(10)]
+
+# other spellings accepted when reading a config
+_ALIASES = {"escape": "Esc", "return": "Enter", "del": "Delete", "ins": "Insert", "pgup": "PageUp",
+            "pgdn": "PageDown", "apps": "Menu"}
+
+# characters that are syntax in a Send string and have to be braced
+_SEND_SPECIAL = set("!#+^{}")
+# characters that have to be escaped in a hotkey label
+_LABEL_ESCAPES = {";": "`;", "`": "``"}
+
+_DISPLAY = {}  # lower-case spelling -> display name
+_AHK_NAME = {}  # display name -> AutoHotkey key name
+for _display, _ahk in NAMED_KEYS:
+    _AHK_NAME[_display] = _ahk
+    _DISPLAY[_display.lower()] = _display
+    _DISPLAY[_ahk.lower()] = _display
+for _alias, _display in _ALIASES.items():
+    _DISPLAY[_alias] = _display
+
+
+class HotkeyError(ValueError):
+    """Raised for a shortcut string that does not name a key."""
+
+
+# pure functions of the string, called several times per rendered script
+@lru_cache(maxsize=1024)
+def parse(sequence: str) -> tuple:
+    """Split "Ctrl+Shift+A" into (("Ctrl", "Shift"), "A") with canonical names."""
+    rest = (sequence or "").strip()
+    mods = []
+    while True:
+        head, sep, tail = rest.partition("+")
+        mod = _MODIFIER_ALIASES.get(head.strip().lower())
+        if not sep or mod is None or not tail:
+            break
+        if mod not in mods:
+            mods.append(mod)
+        rest = tail
+    key = rest.strip()
+    if not key:
+        raise HotkeyError(f"Raccourci vide: {sequence!r}")
+    if len(key) == 1:
+        # "ß".upper() is "SS": keep such characters as typed
+        upper = key.upper()
+        return tuple(m for m, _ in MODIFIERS if m in mods), upper if len(upper) == 1 else key
+    display = _DISPLAY.get(key.lower())
+    if display is None:
+        raise HotkeyError(f"Touche non reconnue: {key}")
+    return tuple(m for m, _ in MODIFIERS if m in mods), display
+
+
+@lru_cache(maxsize=1024)
+def normalize(sequence: str) -> str:
+    """Canonical display form, e.g. "ctrl+esc" -> "Ctrl+Esc"."""
+    mods, key = parse(sequence)
+    return "+".join(mods + (key,))
+
+
+def _mod_symbols(mods) -> str:
+    return "".join(_MODIFIER_SYMBOLS[m] for m in mods)
+
+
+@lru_cache(maxsize=1024)
+def to_hotkey(sequence: str) -> str:
+    """AutoHotkey hotkey label, e.g. "Ctrl+Shift+A" -> "^+a"."""
+    mods, key = parse(sequence)
+    if len(key) == 1:
+        name = _LABEL_ESCAPES.get(key, key.lower())
+    else:
+        name = _AHK_NAME[key]
+    return _mod_symbols(mods) + name
+
+
+@lru_cache(maxsize=1024)
+def to_key_name(sequence: str) -> str:
+    """Key name for the Hotkey() function: a hotkey label without label escapes."""
+    mods, key = parse(sequence)
+    name = key.lower() if len(key) == 1 else _AHK_NAME[key]
+    return _mod_symbols(mods) + name
+
+
+@lru_cache(maxsize=1024)
+def to_send(sequence: str) -> str:
+    """AutoHotkey Send argument, e.g. "Ctrl+A" -> "^a", "F11" -> "{F11}"."""
+    mods, key = parse(sequence)
+    if len(key) == 1:
+        # lower case: an upper-case letter would make Send add Shift
+        name = "{" + key + "}" if key in _SEND_SPECIAL else key.lower()
+    else:
+        name = "{" + _AHK_NAME[key] + "}"
+    return _mod_symbols(mods) + name
+
+
+def ahk_string(text: str) -> str:
+    """Escape text for use inside a double-quoted AutoHotkey string."""
+    return text.replace("`", "``").replace('"', '`"')
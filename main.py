@@ -1,68 +1,124 @@
+import multiprocessing
 import sys
-from pathlib import Path
-from PyQt5.QtWidgets import QApplication, QStackedWidget
 
-from ui.main_menu import MainMenu
-from ui.reverse_text_page import ReverseTextPage
-from ui.swap_case_page import SwapCasePage
-from ui.settings_page import SettingsPage, RegeneratePage
-from ui.main_page import MainPage
-from config import is_first_run
+# imported first so the tracer also covers the imports below
+import startup_trace
+import single_instance
+
+# a second launch hands its arguments to the running app and exits, before Qt is even loaded
+if __name__ == "__main__":
+    # in the frozen exe, the text batch's pool workers start this script: run
+    # their job and exit here instead of handing their argv to the app
+    multiprocessing.freeze_support()
+    startup_trace.enable_from_argv()
+    with startup_trace.span("single instance handoff"):
+        single_instance.handoff(startup_trace.strip_flag(sys.argv)[1:])
+
+with startup_trace.span("import PyQt5"):
+    from PyQt5.QtCore import QTimer
+    from PyQt5.QtWidgets import QApplication, QStackedWidget
+
+with startup_trace.span("import ui"):
+    from ui.main_menu import MainMenu
+    from ui.reverse_text_page import ReverseTextPage
+    from ui.swap_case_page import SwapCasePage
+    from ui.settings_page import SettingsPage, RegeneratePage
+    from ui.main_page import MainPage
+    from ui.telemetry_page import TelemetryPage
+    from ui.text_batch_page import TextBatchPage
+    from ui.instance_server import InstanceServer
+    from config import flush_pending_save, is_first_run
+    from ui import resources, theme
+
+
+# delay before building the pages not visited yet, leaves time for the first paint
+WARMUP_DELAY_MS = 200
+
+# page name -> page class; pages are only built the first time they are needed
+PAGE_FACTORIES = {
+    "menu": MainMenu,
+    "reverse": ReverseTextPage,
+    "swapcase": SwapCasePage,
+    "settings": SettingsPage,
+    "regen": RegeneratePage,
+    "main": MainPage,
+    "telemetry": TelemetryPage,
+    "textbatch": TextBatchPage,
+}
 
 
 class App(QStackedWidget):
-    def __init__(self):
+    def __init__(self, warm_pages: bool = True):
+        """warm_pages: build the pages not visited yet in the background once idle."""
         super().__init__()
-        # create pages
-        self.menu = MainMenu(self.navigate_to)
-        self.reverse = ReverseTextPage(self.navigate_to)
-        self.swapcase = SwapCasePage(self.navigate_to)
-        self.settings = SettingsPage(self.navigate_to)
-        self.regen = RegeneratePage(self.navigate_to)
-        self.mainpage = MainPage(self.navigate_to)
-        # add pages (index order)
-        self.addWidget(self.menu)      # index 0
-        self.addWidget(self.reverse)   # index 1
-        self.addWidget(self.swapcase)  # index 2
-        self.addWidget(self.settings)  # index 3
-        self.addWidget(self.regen)     # index 4
-        self.addWidget(self.mainpage)  # index 5
+        self._pages = {}
+        self._warm_pages = warm_pages
+        self._warmup_scheduled = False
 
         self.setWindowTitle("Dragodinde Helper")
         self.setFixedSize(900, 900)
-        # pages created
+
+    def page(self, page_name: str):
+        """Return the page widget for page_name, creating it on first use."""
+        page = self._pages.get(page_name)
+        if page is None:
+            with startup_trace.span("build page", page=page_name):
+                page = PAGE_FACTORIES[page_name](self.navigate_to)
+            self._pages[page_name] = page
+            self.addWidget(page)
+        return page
+
+    def is_built(self, page_name: str) -> bool:
+        return page_name in self._pages
 
     def navigate_to(self, page_name: str):
-        mapping = {
-            "menu": 0,
-            "reverse": 1,
-            "swapcase": 2,
-            "settings": 3,
-            "regen": 4,
-            "main": 5,
-        }
-        idx = mapping.get(page_name, 0)
-        # if navigating to main page, refresh its displayed values first
-        if page_name == "main":
-            try:
-                self.mainpage.refresh()
-            except Exception:
-                pass
-        self.setCurrentIndex(idx)
+        if page_name not in PAGE_FACTORIES:
+            page_name = "menu"
+        # pages follow the config through ui.config_model, nothing to refresh here
+        page = self.page(page_name)
+        self.setCurrentWidget(page)
+        if self._warm_pages:
+            self._schedule_warmup()
+
+    def _schedule_warmup(self):
+        if self._warmup_scheduled:
+            return
+        self._warmup_scheduled = True
+        QTimer.singleShot(WARMUP_DELAY_MS, self._warm_next)
+
+    def _warm_next(self):
+        # build one page per event loop turn so painting and input stay responsive
+        for name in PAGE_FACTORIES:
+            if not self.is_built(name):
+                self.page(name)
+                QTimer.singleShot(0, self._warm_next)
+                return
 
 
 def main():
-    app = QApplication(sys.argv)
+    argv = startup_trace.strip_flag(sys.argv)
+    with startup_trace.span("QApplication"):
+        app = QApplication(argv)
+    # write any delayed config save before the process goes away
+    app.aboutToQuit.connect(flush_pending_save)
+    # decode the shared images once, whichever page is shown first uses them
+    with startup_trace.span("preload resources"):
+        resources.preload()
+        app.setWindowIcon(resources.icon("dd_icon.ico"))
 
-    # apply QSS theme if available
-    qss_path = Path(__file__).with_name("..") / "dark_theme.qss"
-    # resolve relative path correctly
-    qss_file = Path(__file__).resolve().parent / "dark_theme.qss"
-    if qss_file.exists():
-        with open(qss_file, "r", encoding="utf-8") as f:
-            app.setStyleSheet(f.read())
+    # apply QSS theme (single stylesheet for every page)
+    with startup_trace.span("load qss"):
+        theme.apply_theme(app)
 
     window = App()
+    startup_trace.watch_first_paint(window)
+
+    # later launches talk to this one instead of opening a second window
+    server = InstanceServer(window)
+    if not server.listen():
+        # another instance started at the same time and won the socket
+        single_instance.handoff(argv[1:])
+    app.aboutToQuit.connect(server.close)
 
     # Directly create and show main window (no splash)
     # if it's the first run, start on settings; otherwise show the main summary page
@@ -91,7 +147,11 @@ def main():
             window.move(screen_center - window.rect().center())
         except Exception:
             pass
-    window.navigate_to(start_page)
+    with startup_trace.span("navigate to start page", page=start_page):
+        window.navigate_to(start_page)
+    # a command given to the first launch runs like a forwarded one
+    if argv[1:] and argv[1:] != ["show"]:
+        server.handle(argv[1:], lambda ok, message: print(message, file=sys.stdout if ok else sys.stderr))
 
     sys.exit(app.exec_())
 
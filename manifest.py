@@ -0,0 +1,118 @@
+"""Incremental script generation.
+
+Each output folder keeps a manifest recording, for every generated file,
+the hash of the config values it was rendered from, the template version
+and the hash of the file written. A script is only rewritten when one of
+them changed (or the file was edited or deleted), so unchanged scripts do
+not trigger a new upload on synced folders.
+"""
+import hashlib
+import json
+import threading
+from pathlib import Path
+from typing import NamedTuple
+
+from atomic_io import write_text_atomic
+from script_generator import (
+    config_hash,
+    is_live,
+    render_script,
+    require_script_path,
+    template_for,
+    template_version,
+    uses_shared_runtime,
+    write_params,
+    write_runtime,
+    write_script_text,
+)
+
+MANIFEST_FILENAME = ".dragoturkey_manifest.json"
+MANIFEST_VERSION = 1
+
+
+def file_hash(path) -> str:
+    """sha256 of the file content, or "" if it cannot be read."""
+    try:
+        return hashlib.sha256(Path(path).read_bytes()).hexdigest()
+    except OSError:
+        return ""
+
+
+class Manifest:
+    """Generation records of one output folder, saved only when changed."""
+
+    def __init__(self, folder):
+        self.path = Path(folder) / MANIFEST_FILENAME
+        self._lock = threading.Lock()
+        self._dirty = False
+        self._entries = {}
+        try:
+            data = json.loads(self.path.read_text(encoding="utf-8"))
+            if data.get("version") == MANIFEST_VERSION:
+                self._entries = dict(data.get("files") or {})
+        except (OSError, ValueError, AttributeError):
+            pass
+
+    def entry(self, out):
+        return self._entries.get(Path(out).name)
+
+    def is_current(self, out, cfg_hash: str, template: str = None) -> bool:
+        """True if out was generated from cfg_hash with this template and is untouched.
+
+        template is the template_version() the script would be rendered
+        with (default: the regular template).
+        """
+        e = self.entry(out)
+        if not e or e.get("config") != cfg_hash or e.get("template") != (template or template_version()):
+            return False
+        return file_hash(out) == e.get("output")
+
+    def record(self, out, cfg_hash: str, output_hash: str, template: str = None) -> None:
+        entry = {"config": cfg_hash, "template": template or template_version(), "output": output_hash}
+        with self._lock:
+            if self._entries.get(Path(out).name) != entry:
+                self._entries[Path(out).name] = entry
+                self._dirty = True
+
+    def save(self) -> None:
+        with self._lock:
+            if not self._dirty:
+                return
+            data = {"version": MANIFEST_VERSION, "files": self._entries}
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            write_text_atomic(self.path, json.dumps(data, indent=2, sort_keys=True))
+            self._dirty = False
+
+
+class GenerationResult(NamedTuple):
+    path: Path
+    written: bool
+    params_written: bool = False  # live scripts: the sidecar got new values
+
+
+def render_and_write(cfg: dict, out: Path) -> str:
+    """Write the script of cfg to out and return the hash of the file written."""
+    write_script_text(out, render_script(cfg))
+    return file_hash(out)
+
+
+def generate_script(cfg: dict, out=None, force: bool = False) -> GenerationResult:
+    """Write the script of cfg unless the existing file is already current.
+
+    out defaults to storage_path/script file name. force rewrites anyway.
+    For a live config the sidecar is written first (when its values
+    changed); the script itself then usually stays as it is. With
+    shared_runtime the runtime file of the folder is refreshed too.
+    """
+    out = Path(out) if out else require_script_path(cfg)
+    if uses_shared_runtime(cfg):
+        write_runtime(out.parent)
+    params_written = is_live(cfg) and write_params(cfg, out)
+    manifest = Manifest(out.parent)
+    cfg_hash = config_hash(cfg)
+    template = template_version(template_for(cfg))
+    if not force and manifest.is_current(out, cfg_hash, template):
+        return GenerationResult(out, False, params_written)
+    manifest.record(out, cfg_hash, render_and_write(cfg, out), template)
+    manifest.save()
+    return GenerationResult(out, True, params_written)
@@ -0,0 +1,147 @@
+"""Check a storage folder without letting a slow drive block the caller.
+
+Resolving a path, or creating a file in it, can hang for seconds on
+OneDrive or network folders. PathProber runs the checks on its own
+threads and waits at most a timeout; a probe that overruns keeps running
+and its result lands in the cache for the next ask. Results are cached
+for a few seconds per path, so pages asking for the same folder share
+one probe. No PyQt5 here: the pages call it through ui.workers.
+"""
+import os
+import shutil
+import tempfile
+import threading
+import time
+from concurrent.futures import Future, TimeoutError as FutureTimeout
+from pathlib import Path
+from typing import NamedTuple
+
+PROBE_TIMEOUT_S = 3.0
+CACHE_TTL_S = 10.0
+
+
+class ProbeResult(NamedTuple):
+    raw: str
+    resolved: str = ""
+    exists: bool = False
+    is_dir: bool = False
+    writable: bool = False  # for a missing folder: can it be created
+    free_bytes: int = -1  # -1 when unknown
+    error: str = ""
+    timed_out: bool = False
+
+    @property
+    def usable(self) -> bool:
+        """A script can be written there (the folder exists or can be created)."""
+        return not self.error and not self.timed_out and self.writable and (self.is_dir or not self.exists)
+
+
+def probe_path(raw: str) -> ProbeResult:
+    """Resolve raw and check it; blocks as long as the file system does."""
+    raw = (raw or "").strip()
+    if not raw:
+        return ProbeResult(raw, error="Aucun chemin de stockage défini.")
+    try:
+        path = Path(raw).expanduser().resolve()
+    except (OSError, RuntimeError) as e:
+        return ProbeResult(raw, error=f"Chemin invalide: {e}")
+    resolved = str(path)
+    exists = path.exists()
+    if exists and not path.is_dir():
+        return ProbeResult(raw, resolved, exists=True, error="Ce chemin est un fichier, pas un dossier.")
+    # a missing folder is created on generation: check its nearest existing parent
+    target = path
+    while not target.exists() and target.parent != target:
+        target = target.parent
+    try:
+        free = shutil.disk_usage(target).free
+    except OSError:
+        free = -1
+    try:
+        # os.access ignores Windows ACLs, an actual file is the only reliable test
+        fd, tmp = tempfile.mkstemp(prefix=".drago_probe.", suffix=".tmp", dir=str(target))
+        os.close(fd)
+        os.unlink(tmp)
+        writable = True
+    except OSError:
+        writable = False
+    return ProbeResult(raw, resolved, exists, exists, writable, free)
+
+
+class PathProber:
+    """probe_path with a timeout, a short-lived cache and one probe in flight per path."""
+
+    def __init__(self, ttl: float = CACHE_TTL_S, probe=probe_path):
+        self.ttl = ttl
+        self._probe = probe
+        self._lock = threading.Lock()
+        self._cache = {}  # raw -> (monotonic time, ProbeResult)
+        self._pending = {}  # raw -> Future of the probe running for it
+
+    def cached(self, raw: str):
+        """The cached result for raw if still fresh, else None; never blocks."""
+        raw = (raw or "").strip()
+        with self._lock:
+            hit = self._cache.get(raw)
+        if hit is not None and time.monotonic() - hit[0] < self.ttl:
+            return hit[1]
+        return None
+
+    def probe(self, raw: str, timeout: float = PROBE_TIMEOUT_S) -> ProbeResult:
+        """Probe raw, waiting at most timeout seconds (then timed_out is set)."""
+        raw = (raw or "").strip()
+        hit = self.cached(raw)
+        if hit is not None:
+            return hit
+        with self._lock:
+            fut = self._pending.get(raw)
+            if fut is None:
+                fut = self._pending[raw] = Future()
+                # daemon: a drive that never answers must not keep the app from exiting
+                threading.Thread(target=self._run, args=(raw, fut), name="path-probe", daemon=True).start()
+        try:
+            return fut.result(timeout)
+        except FutureTimeout:
+            return ProbeResult(raw, timed_out=True,
+                               error=f"Le dossier ne répond pas (plus de {timeout:g} s).")
+
+    def _run(self, raw: str, fut: Future) -> None:
+        try:
+            result = self._probe(raw)
+        except Exception as e:
+            result = ProbeResult(raw, error=str(e) or type(e).__name__)
+        with self._lock:
+            self._cache[raw] = (time.monotonic(), result)
+            self._pending.pop(raw, None)
+        fut.set_result(result)
+
+    def invalidate(self, raw: str = None) -> None:
+        """Forget the cached result for raw (all of them if None)."""
+        with self._lock:
+            if raw is None:
+                self._cache.clear()
+            else:
+                self._cache.pop(raw.strip(), None)
+
+
+_prober = None
+
+
+def path_prober() -> PathProber:
+    """The prober shared by the whole process."""
+    global _prober
+    if _prober is None:
+        _prober = PathProber()
+    return _prober
+
+
+def describe(result: ProbeResult) -> str:
+    """One line for the UI: the problem, or what will happen, or the free space."""
+    if result.error:
+        return result.error
+    if not result.writable:
+        return "Dossier en lecture seule: le script ne pourra pas y être écrit."
+    free = f", {result.free_bytes / 1e9:.1f} Go libres" if result.free_bytes >= 0 else ""
+    if not result.exists:
+        return f"Le dossier sera créé{free}."
+    return f"Dossier accessible{free}."
@@ -0,0 +1,512 @@
+"""AutoHotkey script generation, independent from the Qt UI.
+
+The script text is produced from a template that is compiled once into a
+list of literal/placeholder segments; rendering is a single join and the
+output file is written in one call. With live_params set, the script reads
+its keys and cadence from a sidecar INI written by write_params().
+"""
+import hashlib
+import json
+import re
+from functools import lru_cache
+from pathlib import Path
+from string import Template
+
+import hotkeys
+from atomic_io import write_text_atomic
+
+SCRIPT_FILENAME = "dragoturkey_script.akh"
+
+# bump when the meaning of the template values changes without the template
+# text changing; template_version() also tracks the text itself
+TEMPLATE_VERSION = 1
+
+# A script is a stub declaring its parameters followed by the runtime: the
+# code shared by every profile. By default the runtime is copied into each
+# script; with shared_runtime the stub #Includes one runtime file written
+# next to it (see write_runtime), so many profiles share a single copy.
+_FIXED_STUB = """\
+; Dragoturkey: start/stop key, target windows ("" is the active window),
+; keys sent and pause after each action, in ms
+ToggleKey := "${toggle}"
+Windows := [${windows}]
+Telemetry := ${telemetry}
+LiveParams := false
+RepelKey := "${repel}"
+AttractKey := "${attract}"
+RepelDelay := ${repel_delay_ms}
+AttractDelay := ${attract_delay_ms}
+"""
+
+# Live mode: keys and cadence come from a sidecar INI next to the script
+# (same name, .ini extension), re-read whenever its time stamp or size
+# changes, so new values apply to a running macro at its next action.
+# The script body then only depends on the start/stop key and the windows.
+_LIVE_STUB = """\
+; Dragoturkey: start/stop key and target windows ("" is the active window);
+; keys and cadence are read from the .ini file next to this script
+ToggleKey := "${toggle}"
+Windows := [${windows}]
+Telemetry := ${telemetry}
+LiveParams := true
+RepelKey := ""
+AttractKey := ""
+RepelDelay := 0
+AttractDelay := 0
+"""
+
+# bump when the runtime changes in a way older stubs cannot use; compatible
+# changes just rewrite the runtime file in place
+RUNTIME_API = 2
+# the runtime derives the same name from A_ScriptFullPath
+TELEMETRY_SUFFIX = ".telemetry.csv"
+
+RUNTIME_TEMPLATE = """\
+; Dragoturkey runtime, API """ + str(RUNTIME_API) + """. Expects ToggleKey, Windows, Telemetry,
+; LiveParams, RepelKey, AttractKey, RepelDelay and AttractDelay to be set by the script.
+
+Toast(Message, Duration := 2000) {
+    myGui := Gui("+AlwaysOnTop +ToolWindow -Caption")
+    myGui.BackColor := "000000"
+    myGui.SetFont("s16 cWhite", "Arial")
+    myGui.Add("Text", , Message)
+    x := A_ScreenWidth - 300
+    myGui.Show("x" x " y20 w280 h50 NoActivate")
+    SetTimer () => myGui.Destroy(), -Duration
+}
+
+Toast("Script lancé", 2000)
+
+toggle := false
+; per window: next action (0 = repel, 1 = attract) and the A_TickCount it is due at
+Steps := []
+NextAt := []
+ParamsFile := RegExReplace(A_ScriptFullPath, "\\.[^.\\\\]*$$", "") . ".ini"
+ParamsStamp := ""
+LoadParams()
+; telemetry: one CSV line per action (see LogAction), rotated past TelemetryMaxBytes
+TelemetryFile := ""
+TelemetryMaxBytes := 5000000
+if (Telemetry)
+    TelemetryFile := RegExReplace(A_ScriptFullPath, "\\.[^.\\\\]*$$", "") . ".telemetry.csv"
+Hotkey ToggleKey, ToggleMacro
+Hotkey "^F11", ExitMacro
+
+; Live mode: re-reads ParamsFile when its modification time or size
+; changed; cheap enough to call before every action. Returns false while
+; no keys are known.
+LoadParams() {
+    global LiveParams, ParamsFile, ParamsStamp, RepelKey, AttractKey, RepelDelay, AttractDelay
+    if (!LiveParams)
+        return true
+    if !FileExist(ParamsFile)
+        return RepelKey != ""
+    stamp := FileGetTime(ParamsFile, "M") . "/" . FileGetSize(ParamsFile)
+    if (stamp = ParamsStamp)
+        return RepelKey != ""
+    ParamsStamp := stamp
+    RepelKey := IniRead(ParamsFile, "params", "repel", RepelKey)
+    AttractKey := IniRead(ParamsFile, "params", "attract", AttractKey)
+    RepelDelay := Integer(IniRead(ParamsFile, "params", "repel_delay_ms", RepelDelay))
+    AttractDelay := Integer(IniRead(ParamsFile, "params", "attract_delay_ms", AttractDelay))
+    return RepelKey != ""
+}
+
+ToggleMacro(*) {
+    global toggle, Windows, Steps, NextAt, RepelDelay, AttractDelay
+    toggle := !toggle
+    if (toggle) {
+        if !LoadParams() {
+            toggle := false
+            Toast("Paramètres introuvables", 2000)
+            return
+        }
+        Toast("Macro activée", 2000)
+        ; start times are spread over one pause so the windows interleave
+        now := A_TickCount
+        gap := Floor(Min(RepelDelay, AttractDelay) / Windows.Length)
+        Steps := []
+        NextAt := []
+        Loop Windows.Length {
+            Steps.Push(0)
+            NextAt.Push(now + (A_Index - 1) * gap)
+        }
+        SetTimer MyLoop, -1
+    } else {
+        Toast("Macro désactivée", 2000)
+        SetTimer MyLoop, 0
+    }
+}
+
+ExitMacro(*) {
+    Toast("Script arrêté", 2000)
+    Sleep 2000
+    ExitApp
+}
+
+; tick_ms,window,action,late_ms: when the action ran, the window number,
+; 0 = repel / 1 = attract, and how late it ran compared with its due time.
+; The full file is renamed to .1 (replacing the previous one) so it
+; never grows past twice TelemetryMaxBytes.
+LogAction(Win, Action, Late) {
+    global TelemetryFile, TelemetryMaxBytes
+    if (TelemetryFile = "")
+        return
+    if !FileExist(TelemetryFile) {
+        FileAppend "tick_ms,window,action,late_ms`n", TelemetryFile
+    } else if (FileGetSize(TelemetryFile) > TelemetryMaxBytes) {
+        FileMove TelemetryFile, TelemetryFile . ".1", 1
+        FileAppend "tick_ms,window,action,late_ms`n", TelemetryFile
+    }
+    FileAppend A_TickCount . "," . Win . "," . Action . "," . Late . "`n", TelemetryFile
+}
+
+; Background windows get their keys with ControlSend, so the focus stays
+; where the user left it; a closed window is skipped but keeps its turn.
+SendTo(Win, Keys) {
+    if (Win = "") {
+        Send Keys
+    } else if WinExist(Win) {
+        ControlSend Keys, , Win
+    }
+}
+
+; One action per call, for the window due first, then a one-shot timer is
+; armed for the next window due: the pause of one window is spent serving
+; the others. Due times are computed from the previous due time rather
+; than from "now", so delays do not accumulate; if the machine stalled
+; past a due time that window restarts from now instead of firing a burst.
+MyLoop() {
+    global toggle, Windows, Steps, NextAt, RepelKey, AttractKey, RepelDelay, AttractDelay
+    if (!toggle)
+        return
+    LoadParams()
+    i := 1
+    Loop Windows.Length {
+        if (NextAt[A_Index] < NextAt[i])
+            i := A_Index
+    }
+    late := A_TickCount - NextAt[i]
+    if (Steps[i] = 0) {
+        SendTo(Windows[i], RepelKey)
+        NextAt[i] += RepelDelay
+    } else {
+        SendTo(Windows[i], AttractKey)
+        NextAt[i] += AttractDelay
+    }
+    LogAction(i, Steps[i], late)
+    Steps[i] := 1 - Steps[i]
+    now := A_TickCount
+    if (NextAt[i] < now)
+        NextAt[i] := now
+    due := NextAt[1]
+    Loop Windows.Length
+        due := Min(due, NextAt[A_Index])
+    SetTimer MyLoop, -Max(1, due - now)
+}
+"""
+
+RUNTIME_FILENAME = f"dragoturkey_runtime_{RUNTIME_API}.ahk"
+_INCLUDE = "\n#Include %A_ScriptDir%\\" + RUNTIME_FILENAME + "\n"
+
+SCRIPT_TEMPLATE = _FIXED_STUB + "\n" + RUNTIME_TEMPLATE
+LIVE_TEMPLATE = _LIVE_STUB + "\n" + RUNTIME_TEMPLATE
+STUB_TEMPLATE = _FIXED_STUB + _INCLUDE
+LIVE_STUB_TEMPLATE = _LIVE_STUB + _INCLUDE
+
+PARAMS_TEMPLATE = """\
+; Paramètres lus en direct par ${script}, modifiables sans le relancer.
+[params]
+attract=${attract}
+repel=${repel}
+attract_delay_ms=${attract_delay_ms}
+repel_delay_ms=${repel_delay_ms}
+"""
+
+
+class ScriptConfigError(ValueError):
+    """Raised when a config cannot be turned into a script."""
+
+
+@lru_cache(maxsize=None)
+def compile_template(template: str = SCRIPT_TEMPLATE) -> tuple:
+    """Split a $-template into alternating (literal, placeholder) segments.
+
+    Returns a tuple of (literal, name) pairs; name is None for the trailing
+    literal. "$$" escapes are folded into the surrounding literal so there
+    is one segment per placeholder. The result is cached so each template
+    is parsed only once.
+    """
+    segments = []
+    pending = ""
+    pos = 0
+    for m in Template.pattern.finditer(template):
+        literal = pending + template[pos:m.start()]
+        if m.group("escaped") is not None:
+            pending = literal + "$"
+        elif m.group("named") or m.group("braced"):
+            segments.append((literal, m.group("named") or m.group("braced")))
+            pending = ""
+        else:
+            raise ValueError(f"Invalid placeholder in template at offset {m.start()}")
+        pos = m.end()
+    segments.append((pending + template[pos:], None))
+    return tuple(segments)
+
+
+DEFAULT_DELAY_SECONDS = 4.0
+
+
+def _delay_ms(cfg: dict, key: str):
+    """Delay in ms from cfg[key], falling back to delay_seconds; None if invalid."""
+    value = cfg.get(key)
+    if value in (None, ""):
+        value = cfg.get("delay_seconds", DEFAULT_DELAY_SECONDS)
+    try:
+        ms = int(round(float(value) * 1000))
+    except (TypeError, ValueError):
+        return None
+    return ms if ms > 0 else None
+
+
+def _shortcut(cfg: dict, key: str) -> str:
+    return (cfg.get(key) or "").strip()
+
+
+def _ahk(sequence: str, convert) -> str:
+    """AutoHotkey form of a shortcut; unknown keys are kept as typed (see validate_config)."""
+    if not sequence:
+        return ""
+    try:
+        return convert(sequence)
+    except hotkeys.HotkeyError:
+        return sequence
+
+
+def is_live(cfg: dict) -> bool:
+    """True if cfg asks for a script reading its parameters from a sidecar file."""
+    return bool(cfg.get("live_params"))
+
+
+def params_values(cfg: dict) -> dict:
+    """Keys and cadence of cfg: the values a live script reads from its sidecar.
+
+    Send strings are AutoHotkey syntax but not string-escaped. The pause
+    after each action is attract_delay_seconds / repel_delay_seconds when
+    set, else delay_seconds.
+    """
+    return {
+        "attract": _ahk(_shortcut(cfg, "attract_shortcut"), hotkeys.to_send),
+        "repel": _ahk(_shortcut(cfg, "repel_shortcut"), hotkeys.to_send),
+        "attract_delay_ms": _delay_ms(cfg, "attract_delay_seconds"),
+        "repel_delay_ms": _delay_ms(cfg, "repel_delay_seconds"),
+    }
+
+
+def target_windows(cfg: dict) -> list:
+    """Windows the script serves in turn (AutoHotkey WinTitle strings).
+
+    Empty when cfg has no "windows" list: keys then go to the active window.
+    """
+    windows = cfg.get("windows")
+    if not windows or not isinstance(windows, list):
+        return []
+    return [w.strip() for w in windows if isinstance(w, str) and w.strip()]
+
+
+def script_values(cfg: dict, params: dict = None) -> dict:
+    """Return the placeholder values used by the template of cfg.
+
+    Shortcuts are translated to AutoHotkey syntax: a Hotkey() key name for
+    toggle, a Send string for attract/repel, both escaped for a string
+    literal. A live script only embeds the toggle key and the windows, the
+    rest lives in the sidecar. params is params_values(cfg) when the caller
+    already has it.
+    """
+    windows = target_windows(cfg)
+    values = {
+        "telemetry": "true" if cfg.get("telemetry") else "false",
+        "toggle": hotkeys.ahk_string(_ahk(_shortcut(cfg, "toggle_shortcut"), hotkeys.to_key_name)),
+        # "": the active window
+        "windows": ", ".join(f'"{hotkeys.ahk_string(w)}"' for w in windows) if windows else '""',
+    }
+    if not is_live(cfg):
+        values.update(params or params_values(cfg))
+        values["attract"] = hotkeys.ahk_string(values["attract"])
+        values["repel"] = hotkeys.ahk_string(values["repel"])
+    return values
+
+
+def uses_shared_runtime(cfg: dict) -> bool:
+    """True if the script of cfg #Includes the runtime file instead of embedding it."""
+    return bool(cfg.get("shared_runtime"))
+
+
+def template_for(cfg: dict) -> str:
+    if uses_shared_runtime(cfg):
+        return LIVE_STUB_TEMPLATE if is_live(cfg) else STUB_TEMPLATE
+    return LIVE_TEMPLATE if is_live(cfg) else SCRIPT_TEMPLATE
+
+
+def template_version(template: str = SCRIPT_TEMPLATE) -> str:
+    digest = hashlib.sha256(template.encode("utf-8")).hexdigest()[:12]
+    return f"{TEMPLATE_VERSION}:{digest}"
+
+
+def config_hash(cfg: dict) -> str:
+    """Hash of the config values that end up in the script."""
+    data = json.dumps(script_values(cfg), sort_keys=True, ensure_ascii=False)
+    return hashlib.sha256(data.encode("utf-8")).hexdigest()
+
+
+def validate_config(cfg: dict, params: dict = None) -> list:
+    """Return the list of problems preventing script generation (empty if OK).
+
+    params is params_values(cfg) when the caller already has it.
+    """
+    a, r, t = _shortcut(cfg, "attract_shortcut"), _shortcut(cfg, "repel_shortcut"), _shortcut(cfg, "toggle_shortcut")
+    if not a or not r or not t:
+        return ["Les trois raccourcis doivent être définis dans les paramètres."]
+    try:
+        keys = {hotkeys.normalize(a), hotkeys.normalize(r), hotkeys.normalize(t)}
+    except hotkeys.HotkeyError as e:
+        return [f"Raccourci invalide: {e}"]
+    if len(keys) != 3:
+        return ["Tous les raccourcis doivent être différents."]
+    values = params or params_values(cfg)
+    if values["attract_delay_ms"] is None or values["repel_delay_ms"] is None:
+        return ["Le délai doit être un nombre de secondes positif."]
+    windows = cfg.get("windows")
+    if not windows:
+        return []
+    if not isinstance(windows, list) or not all(isinstance(w, str) for w in windows):
+        return ["Les fenêtres cibles doivent être une liste de titres."]
+    targets = [w.lower() for w in target_windows(cfg)]
+    if len(set(targets)) != len(targets):
+        return ["Chaque fenêtre cible ne doit apparaître qu'une fois."]
+    return []
+
+
+def render_template(values: dict, template: str = SCRIPT_TEMPLATE) -> str:
+    parts = []
+    for literal, name in compile_template(template):
+        parts.append(literal)
+        if name is not None:
+            parts.append(str(values[name]))
+    return "".join(parts)
+
+
+def render_script(cfg: dict) -> str:
+    """Return the AutoHotkey script text for cfg.
+
+    Raises ScriptConfigError if the config is incomplete.
+    """
+    # computed once: validation and the template need the same values
+    params = params_values(cfg)
+    errors = validate_config(cfg, params)
+    if errors:
+        raise ScriptConfigError(errors[0])
+    return render_template(script_values(cfg, params), template_for(cfg))
+
+
+def params_path(out) -> Path:
+    """Sidecar file read by the live script written to out."""
+    return Path(out).with_suffix(".ini")
+
+
+def telemetry_path(out) -> Path:
+    """CSV the script written to out appends its timings to when telemetry is on."""
+    return Path(out).with_suffix(TELEMETRY_SUFFIX)
+
+
+def render_params(cfg: dict, script_name: str = SCRIPT_FILENAME) -> str:
+    """Return the sidecar INI text for cfg (raises ScriptConfigError if incomplete)."""
+    params = params_values(cfg)
+    errors = validate_config(cfg, params)
+    if errors:
+        raise ScriptConfigError(errors[0])
+    return render_template(dict(params, script=script_name), PARAMS_TEMPLATE)
+
+
+def render_runtime() -> str:
+    return render_template({}, RUNTIME_TEMPLATE)
+
+
+def write_runtime(folder) -> bool:
+    """Write the shared runtime into folder; False if it was already up to date.
+
+    Called once per output folder; the scripts of every profile stored
+    there #Include it.
+    """
+    path = Path(folder) / RUNTIME_FILENAME
+    text = render_runtime()
+    try:
+        if path.read_text(encoding="utf-8") == text:
+            return False
+    except (OSError, UnicodeError):
+        pass
+    path.parent.mkdir(parents=True, exist_ok=True)
+    write_text_atomic(path, text)
+    return True
+
+
+def write_params(cfg: dict, out) -> bool:
+    """Write the sidecar of the live script at out; False if it already held these values.
+
+    An unchanged file is left alone so its time stamp does not make the
+    running script re-read it. The file is UTF-16 with a BOM, the encoding
+    IniRead needs for non-ASCII keys, and is replaced atomically so the
+    script never reads half of it.
+    """
+    path = params_path(out)
+    text = render_params(cfg, Path(out).name)
+    try:
+        if path.read_text(encoding="utf-16") == text:
+            return False
+    except (OSError, UnicodeError):
+        pass
+    path.parent.mkdir(parents=True, exist_ok=True)
+    write_text_atomic(path, text, encoding="utf-16")
+    return True
+
+
+def script_filename(cfg: dict) -> str:
+    """Return the script file name; named profiles get their own file."""
+    name = re.sub(r"[^\w.-]+", "_", str(cfg.get("name") or "").strip()).strip("._")
+    if not name:
+        return SCRIPT_FILENAME
+    return f"dragoturkey_{name}.akh"
+
+
+def script_path(cfg: dict):
+    """Return the default output path for cfg, or None if no storage path is set."""
+    storage = (cfg.get("storage_path") or "").strip()
+    if not storage:
+        return None
+    return Path(storage) / script_filename(cfg)
+
+
+def require_script_path(cfg: dict) -> Path:
+    """Like script_path() but raises ScriptConfigError if no storage path is set."""
+    out = script_path(cfg)
+    if out is None:
+        raise ScriptConfigError("Aucun chemin de stockage défini.")
+    return out
+
+
+def write_script(cfg: dict, out=None) -> Path:
+    """Render cfg and write it to out (default: storage_path/SCRIPT_FILENAME).
+
+    Creates the parent folder if needed and returns the written path.
+    """
+    text = render_script(cfg)
+    out = Path(out) if out else require_script_path(cfg)
+    write_script_text(out, text)
+    return out
+
+
+def write_script_text(out: Path, text: str) -> None:
+    """Write already rendered script text to out in a single call."""
+    out.parent.mkdir(parents=True, exist_ok=True)
+    with open(out, "w", encoding="utf-8") as f:
+        f.write(text)
@@ -0,0 +1,185 @@
+"""One running app per config file; later launches hand their arguments over.
+
+main.py calls handoff() before importing PyQt5: if an instance already
+listens on the local socket, the arguments are sent to it, its answer is
+printed and the process exits without ever loading Qt. Otherwise the app
+starts and ui.instance_server listens on the same address with a
+QLocalServer (a Unix socket, or a named pipe on Windows, both of which
+this module reaches with the standard library).
+
+Protocol: one JSON line {"argv": [...]} per connection, answered by one
+JSON line {"ok": bool, "message": str}. Understood commands:
+
+    (none) | show                      bring the window to the front
+    generate [--profile NAME] [--force]  same as python -m cli generate
+"""
+import getpass
+import hashlib
+import json
+import os
+import socket
+import sys
+import tempfile
+import threading
+import time
+
+import config
+
+CONNECT_TIMEOUT_S = 0.5
+# generating on a slow folder may take a while, the reply waits for it
+REPLY_TIMEOUT_S = 30.0
+# Windows: another client is being served, the pipe is free again shortly
+_PIPE_BUSY_RETRIES = 20
+
+
+def server_name() -> str:
+    """Name of the local socket, one per user and config file."""
+    try:
+        user = getpass.getuser()
+    except Exception:
+        user = ""
+    key = f"{user}|{os.path.normcase(str(config.CONFIG_FILE))}"
+    return "dragoturkey_helper-" + hashlib.sha1(key.encode("utf-8")).hexdigest()[:16]
+
+
+def server_address(name: str = None) -> str:
+    """Full address QLocalServer.listen() is given and clients connect to."""
+    name = name or server_name()
+    if sys.platform == "win32":
+        return r"\\.\pipe" + "\\" + name
+    return os.path.join(tempfile.gettempdir(), name + ".sock")
+
+
+def parse_request(argv: list):
+    """(command, options) for the forwarded argv; raises ValueError if not understood."""
+    if not argv or argv == ["show"]:
+        return "show", {}
+    if argv[0] != "generate":
+        raise ValueError(f"Commande inconnue: {' '.join(argv)}")
+    options = {"profile": None, "force": False}
+    rest = list(argv[1:])
+    while rest:
+        arg = rest.pop(0)
+        if arg == "--force":
+            options["force"] = True
+        elif arg == "--profile" and rest:
+            options["profile"] = rest.pop(0)
+        elif arg.startswith("--profile="):
+            options["profile"] = arg.split("=", 1)[1]
+        else:
+            raise ValueError(f"Argument inconnu: {arg}")
+    return "generate", options
+
+
+def run_generate(profile: str = None, force: bool = False):
+    """Generate a script like the CLI does; returns (ok, message) instead of printing."""
+    # imported here so that a launch handing over to a running app stays light
+    from manifest import generate_script
+    from script_generator import ScriptConfigError
+
+    if profile:
+        cfg = config.get_profile(profile)
+        if cfg is None:
+            return False, f"Profil inconnu: {profile}"
+    else:
+        profiles = config.load_profiles()
+        if len(profiles) > 1:
+            return False, "Plusieurs profils définis: préciser --profile."
+        cfg = profiles[0]
+    try:
+        result = generate_script(cfg, force=force)
+    except (ScriptConfigError, OSError) as e:
+        return False, f"Erreur: {e}"
+    params = ", paramètres mis à jour" if result.params_written else ""
+    return True, f"{result.path} ({'réécrit' if result.written else 'inchangé'}{params})"
+
+
+def encode(message: dict) -> bytes:
+    return json.dumps(message, ensure_ascii=False).encode("utf-8") + b"\n"
+
+
+def decode(line: bytes) -> dict:
+    return json.loads(line.decode("utf-8"))
+
+
+def _exchange_socket(address: str, data: bytes) -> bytes:
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as s:
+        s.settimeout(CONNECT_TIMEOUT_S)
+        s.connect(address)
+        s.settimeout(REPLY_TIMEOUT_S)
+        s.sendall(data)
+        reply = b""
+        while not reply.endswith(b"\n"):
+            chunk = s.recv(4096)
+            if not chunk:
+                break
+            reply += chunk
+        return reply
+
+
+def _exchange_pipe(address: str, data: bytes) -> bytes:
+    for attempt in range(_PIPE_BUSY_RETRIES):
+        try:
+            pipe = open(address, "r+b", buffering=0)
+            break
+        except FileNotFoundError:
+            raise ConnectionRefusedError(address)
+        except OSError as e:
+            # ERROR_PIPE_BUSY
+            if getattr(e, "winerror", None) != 231 or attempt == _PIPE_BUSY_RETRIES - 1:
+                raise
+            time.sleep(CONNECT_TIMEOUT_S / _PIPE_BUSY_RETRIES)
+    result = []
+
+    # a pipe read cannot time out: it runs in a thread the caller stops waiting for
+    def talk():
+        with pipe:
+            pipe.write(data)
+            reply = b""
+            while not reply.endswith(b"\n"):
+                chunk = pipe.read(4096)
+                if not chunk:
+                    break
+                reply += chunk
+            result.append(reply)
+
+    t = threading.Thread(target=talk, daemon=True)
+    t.start()
+    t.join(REPLY_TIMEOUT_S)
+    if not result:
+        raise TimeoutError("pas de réponse de l'instance en cours")
+    return result[0]
+
+
+def forward(argv: list, address: str = None):
+    """Send argv to the running instance; its reply dict, or None if there is none.
+
+    Raises TimeoutError if an instance accepted the request but did not answer.
+    """
+    address = address or server_address()
+    exchange = _exchange_pipe if sys.platform == "win32" else _exchange_socket
+    try:
+        reply = exchange(address, encode({"argv": list(argv)}))
+    except (FileNotFoundError, ConnectionRefusedError):
+        return None
+    except socket.timeout as e:
+        raise TimeoutError(str(e)) from e
+    if not reply:
+        # accepted then closed: an instance shutting down
+        return None
+    return decode(reply)
+
+
+def handoff(argv: list) -> None:
+    """Exit with the running instance's answer if there is one; return otherwise."""
+    try:
+        reply = forward(argv)
+    except (OSError, ValueError) as e:
+        print(f"Instance en cours injoignable ({e}), démarrage d'une nouvelle.", file=sys.stderr)
+        return
+    if reply is None:
+        return
+    message = reply.get("message", "")
+    if message:
+        print(message, file=sys.stdout if reply.get("ok") else sys.stderr)
+    sys.exit(0 if reply.get("ok") else 1)
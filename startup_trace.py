@@ -0,0 +1,135 @@
+"""Opt-in start-up tracer writing a Chrome trace (chrome://tracing, Perfetto).
+
+Enable it with the DRAGO_STARTUP_TRACE environment variable or the
+--trace-startup command line flag; either may carry the output file
+(DRAGO_STARTUP_TRACE=trace.json, --trace-startup=trace.json), otherwise
+startup_trace.json is written in the current folder.
+
+The module is imported first by main.py so that import time is covered,
+and only main.py turns it on (enable_from_argv): config imports it too,
+and a CLI or daemon run must not overwrite the app's trace. It does not
+import Qt at module level.
+"""
+import atexit
+import json
+import os
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+
+ENV_VAR = "DRAGO_STARTUP_TRACE"
+FLAG = "--trace-startup"
+DEFAULT_OUTPUT = "startup_trace.json"
+
+_t0 = time.perf_counter()
+_events = []
+_output = None
+
+
+def _now_us() -> float:
+    return (time.perf_counter() - _t0) * 1e6
+
+
+def _config_from(environ, argv):
+    """Return the output path if tracing is requested, else None."""
+    for arg in argv[1:]:
+        if arg == FLAG:
+            return DEFAULT_OUTPUT
+        if arg.startswith(FLAG + "="):
+            return arg.split("=", 1)[1] or DEFAULT_OUTPUT
+    value = environ.get(ENV_VAR, "").strip()
+    if not value or value == "0":
+        return None
+    return DEFAULT_OUTPUT if value == "1" else value
+
+
+def enable(output=DEFAULT_OUTPUT) -> None:
+    global _output
+    _output = str(output)
+
+
+def enable_from_argv(argv=None, environ=None) -> bool:
+    """Enable tracing if argv or environ (default: the process's) asks for it."""
+    output = _config_from(os.environ if environ is None else environ, sys.argv if argv is None else argv)
+    if output is not None:
+        enable(output)
+    return output is not None
+
+
+def is_enabled() -> bool:
+    return _output is not None
+
+
+def strip_flag(argv: list) -> list:
+    """Return argv without the tracing flag, e.g. before handing it to Qt."""
+    return [a for a in argv if a != FLAG and not a.startswith(FLAG + "=")]
+
+
+def _record(event: dict) -> None:
+    event.setdefault("pid", os.getpid())
+    event.setdefault("tid", threading.get_ident())
+    _events.append(event)
+
+
+@contextmanager
+def span(name: str, **args):
+    """Record the duration of the with-block as one trace event."""
+    if _output is None:
+        yield
+        return
+    start = _now_us()
+    try:
+        yield
+    finally:
+        _record({"name": name, "ph": "X", "ts": start, "dur": _now_us() - start, "args": args})
+
+
+def mark(name: str, **args) -> None:
+    """Record an instant event."""
+    if _output is None:
+        return
+    _record({"name": name, "ph": "i", "s": "g", "ts": _now_us(), "args": args})
+
+
+def events() -> list:
+    return list(_events)
+
+
+def dump(path=None):
+    """Write the recorded events as a Chrome trace; returns the path or None."""
+    path = path or _output
+    if path is None:
+        return None
+    data = {"traceEvents": list(_events), "displayTimeUnit": "ms"}
+    Path(path).write_text(json.dumps(data, indent=1), encoding="utf-8")
+    return path
+
+
+def watch_first_paint(widget) -> None:
+    """Mark the first paint of widget, then write the trace file."""
+    if _output is None:
+        return
+    from PyQt5.QtCore import QEvent, QObject, QTimer
+
+    class _FirstPaint(QObject):
+        def eventFilter(self, obj, ev):
+            if ev.type() == QEvent.Paint:
+                obj.removeEventFilter(self)
+                mark("first paint", widget=type(obj).__name__)
+                # dump once the frame is finished, not in the middle of it
+                QTimer.singleShot(0, dump)
+            return False
+
+    watcher = _FirstPaint(widget)
+    widget.installEventFilter(watcher)
+
+
+def _dump_at_exit():
+    # rewrite the file so it also holds what happened after the first paint
+    if _output is not None and _events:
+        dump()
+
+
+atexit.register(_dump_at_exit)
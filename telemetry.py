@@ -0,0 +1,199 @@
+"""Follow the timing logs written by scripts generated with "telemetry".
+
+Each script appends one line per action to <script>.telemetry.csv:
+
+    tick_ms,window,action,late_ms
+
+and renames the file to <script>.telemetry.csv.1 once it gets large. A
+TelemetryLog remembers how far it has read, so each poll only parses the
+bytes appended since the previous one, however big the file is; the
+figures are kept in counters so memory does not grow with the log.
+"""
+import os
+from collections import Counter
+from pathlib import Path
+from typing import NamedTuple
+
+from script_generator import TELEMETRY_SUFFIX
+
+# an action later than this counts as a stall (game or PC froze)
+STALL_MS = 1000
+# a longer pause between two lines means the macro was stopped, not slow
+IDLE_GAP_MS = 60_000
+# lateness above this is counted in the last histogram bucket
+MAX_LATE_MS = 600_000
+READ_CHUNK = 1 << 20
+
+
+class TelemetrySummary(NamedTuple):
+    profile: str
+    actions: int
+    cycles: int
+    cycles_per_hour: float
+    p50_ms: int
+    p95_ms: int
+    p99_ms: int
+    max_ms: int
+    stalls: int
+    windows: int
+    sessions: int
+
+
+class CycleStats:
+    """Running figures of one log; add() is O(1) and keeps no line."""
+
+    def __init__(self):
+        self.actions = 0
+        self.cycles = 0  # attract actions: one per completed cycle and window
+        self.stalls = 0
+        self.sessions = 0  # script (re)starts, seen as A_TickCount going back
+        self.active_ms = 0
+        self.max_late = 0
+        self.late = Counter()  # lateness in ms -> number of actions
+        self.windows = set()
+        self._last_tick = None
+
+    def add(self, tick: int, window: int, action: int, late: int):
+        if self._last_tick is None or tick < self._last_tick:
+            self.sessions += 1
+        elif tick - self._last_tick <= IDLE_GAP_MS:
+            self.active_ms += tick - self._last_tick
+        self._last_tick = tick
+        self.actions += 1
+        if action == 1:
+            self.cycles += 1
+        late = max(0, late)
+        self.late[min(late, MAX_LATE_MS)] += 1
+        self.max_late = max(self.max_late, late)
+        if late >= STALL_MS:
+            self.stalls += 1
+        self.windows.add(window)
+
+    def percentile(self, p: float) -> int:
+        """Lateness (ms) that p percent of the actions did not exceed."""
+        if not self.actions:
+            return 0
+        rank = max(1, -(-self.actions * p // 100))
+        seen = 0
+        for value in sorted(self.late):
+            seen += self.late[value]
+            if seen >= rank:
+                return value
+        return self.max_late
+
+    @property
+    def cycles_per_hour(self) -> float:
+        return self.cycles * 3_600_000 / self.active_ms if self.active_ms else 0.0
+
+    def summary(self, profile: str) -> TelemetrySummary:
+        return TelemetrySummary(
+            profile=profile,
+            actions=self.actions,
+            cycles=self.cycles,
+            cycles_per_hour=self.cycles_per_hour,
+            p50_ms=self.percentile(50),
+            p95_ms=self.percentile(95),
+            p99_ms=self.percentile(99),
+            max_ms=self.max_late,
+            stalls=self.stalls,
+            windows=len(self.windows),
+            sessions=self.sessions,
+        )
+
+
+def parse_line(line: bytes):
+    """(tick, window, action, late) or None for the header and damaged lines."""
+    parts = line.split(b",")
+    if len(parts) != 4:
+        return None
+    try:
+        return tuple(int(p) for p in parts)
+    except ValueError:
+        return None
+
+
+class TelemetryLog:
+    """Tail of one telemetry file and the stats of every line read so far."""
+
+    def __init__(self, path):
+        self.path = Path(path)
+        self.stats = CycleStats()
+        self._offset = 0
+        self._ino = None
+        self._partial = b""
+
+    @property
+    def profile(self) -> str:
+        return self.path.name[:-len(TELEMETRY_SUFFIX)]
+
+    def poll(self) -> int:
+        """Parse what was appended since the last call; return the number of lines read."""
+        try:
+            st = os.stat(self.path)
+        except OSError:
+            return 0
+        count = 0
+        rotated = self._ino is not None and (st.st_ino != self._ino or st.st_size < self._offset)
+        if rotated:
+            # finish the file we were reading, now renamed to .1, then start over
+            old = self.path.with_name(self.path.name + ".1")
+            try:
+                if os.stat(old).st_ino == self._ino:
+                    count += self._read(old)
+            except OSError:
+                pass
+            if self._partial:
+                count += self._feed(self._partial)
+            self._offset = 0
+            self._partial = b""
+        self._ino = st.st_ino
+        if st.st_size > self._offset:
+            count += self._read(self.path)
+        return count
+
+    def _read(self, path) -> int:
+        count = 0
+        try:
+            with open(path, "rb") as f:
+                f.seek(self._offset)
+                while True:
+                    chunk = f.read(READ_CHUNK)
+                    if not chunk:
+                        break
+                    self._offset += len(chunk)
+                    lines = (self._partial + chunk).split(b"\n")
+                    # the last piece has no newline yet: keep it for the next read
+                    self._partial = lines.pop()
+                    for line in lines:
+                        count += self._feed(line)
+        except OSError:
+            pass
+        return count
+
+    def _feed(self, line: bytes) -> int:
+        row = parse_line(line.strip())
+        if row is None:
+            return 0
+        self.stats.add(*row)
+        return 1
+
+
+class TelemetryMonitor:
+    """Every telemetry log of a folder, one profile per generated script."""
+
+    def __init__(self, folder):
+        self.folder = Path(folder)
+        self.logs = {}  # file name -> TelemetryLog
+
+    def poll(self) -> list:
+        """Read new lines of all logs (picking up new ones); return their summaries."""
+        try:
+            paths = sorted(self.folder.glob("*" + TELEMETRY_SUFFIX))
+        except OSError:
+            paths = []
+        for path in paths:
+            if path.name not in self.logs:
+                self.logs[path.name] = TelemetryLog(path)
+        for log in self.logs.values():
+            log.poll()
+        return [log.stats.summary(log.profile) for _, log in sorted(self.logs.items())]
@@ -1,7 +1,39 @@
+import json
+import os
 import sys
 from pathlib import Path
 
+import pytest
+
 # Ensure project root is on sys.path so tests can import modules like `text_utils`
 ROOT = Path(__file__).resolve().parents[1]
 if str(ROOT) not in sys.path:
     sys.path.insert(0, str(ROOT))
+
+
+@pytest.fixture(scope="session")
+def qapp():
+    """A QApplication on the offscreen platform, for tests that need widgets."""
+    os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+    QtWidgets = pytest.importorskip("PyQt5.QtWidgets")
+    app = QtWidgets.QApplication.instance() or QtWidgets.QApplication([])
+    yield app
+
+
+@pytest.fixture
+def cfg_file(tmp_path, monkeypatch):
+    """A config file with a complete profile, installed as config.CONFIG_FILE."""
+    import config
+
+    path = tmp_path / "app_config.json"
+    path.write_text(json.dumps({
+        "attract_shortcut": "2",
+        "repel_shortcut": "3",
+        "toggle_shortcut": "F11",
+        "storage_path": str(tmp_path / "out"),
+    }), encoding="utf-8")
+    # also undoes cli.main() repointing CONFIG_FILE
+    monkeypatch.setattr(config, "CONFIG_FILE", path)
+    config.invalidate_config_cache()
+    yield path
+    config.invalidate_config_cache()
@@ -0,0 +1,118 @@
+import pytest
+
+from ahk_simulator import SimulatorError, simulate, simulate_config
+from script_generator import render_script
+
+CFG = {"attract_shortcut": "2", "repel_shortcut": "3", "toggle_shortcut": "F11", "delay_seconds": 4}
+
+# the loop the generator used to emit: a 100 ms timer blocking in Sleep
+BLOCKING_LOOP = """
+toggle := false
+F11::
+{
+    global toggle
+    toggle := !toggle
+    if (toggle) {
+        SetTimer MyLoop, 100
+    } else {
+        SetTimer MyLoop, 0
+    }
+}
+MyLoop() {
+    Send "3"
+    Sleep 3500
+    Send "2"
+    Sleep 3500
+}
+"""
+
+
+def test_generated_script_keeps_its_cadence():
+    report = simulate_config(CFG, duration_s=3600)
+    # 4 s after each of the two actions: 450 cycles per hour
+    assert report.cycles == 450
+    assert report.send_counts == {"3": 450, "2": 450}
+    assert report.timer_skips == 0
+    assert report.max_thread_depth == 1
+    # lateness is bounded by the system tick and does not accumulate
+    assert report.max_drift_ms < 16
+    assert abs(report.total_drift_ms) < 16
+    assert [m for _, m in report.toasts] == ["Script lancé", "Macro activée"]
+
+
+def test_blocking_loop_drifts_and_piles_up_timer_ticks():
+    report = simulate(BLOCKING_LOOP, 600_000, presses=[(0, "F11")],
+                      expected_delays={"3": 3500, "2": 3500}, cycle_key="2")
+    assert report.timer_skips > 1000
+    assert report.mean_drift_ms > 10
+    assert report.cycles < 600_000 / 7000
+
+
+def test_toggle_off_stops_sending():
+    report = simulate(render_script(CFG), 60_000, presses=[(0, "F11"), (20_000, "F11")])
+    assert report.sends and all(t <= 20_000 for t, _ in report.sends)
+    assert report.toasts[-1][1] == "Macro désactivée"
+
+
+def test_exit_hotkey_ends_the_run():
+    report = simulate(render_script(CFG), 60_000, presses=[(0, "F11"), (10_000, "^F11")])
+    assert report.exited
+    # the loop keeps running during the hotkey's "Sleep 2000" before ExitApp
+    assert all(t <= 12_016 for t, _ in report.sends)
+
+
+def test_unknown_statements_are_reported():
+    with pytest.raises(SimulatorError):
+        simulate("MsgBox \"hi\"\n", 1000)
+    with pytest.raises(SimulatorError):
+        simulate(render_script(CFG), 1000, presses=[(0, "F12")])
+
+
+def test_simulate_config_with_modifier_shortcuts():
+    cfg = dict(CFG, attract_shortcut="Ctrl+A", repel_shortcut="F5", toggle_shortcut="Meta+F11")
+    report = simulate_config(cfg, duration_s=60)
+    assert report.send_counts["^a"] and report.send_counts["{F5}"]
+    assert report.cycles >= 7
+
+
+def test_live_script_applies_sidecar_edits_at_next_action():
+    from script_generator import render_params
+
+    cfg = dict(CFG, live_params=True)
+    new = render_params(dict(cfg, attract_shortcut="B", delay_seconds=2))
+    report = simulate_config(cfg, duration_s=40, edits=[(20_000, "dragoturkey_script.ini", new)])
+    before = [k for t, k in report.sends if t < 20_000]
+    after = [(t, k) for t, k in report.sends if t >= 20_000]
+    assert set(before) == {"2", "3"}
+    assert after[0][0] < 20_100 and {k for _, k in after} == {"b", "3"}
+    assert after[2][0] - after[1][0] < 2_100
+
+
+def test_live_script_without_sidecar_does_not_start():
+    report = simulate_config(dict(CFG, live_params=True), duration_s=10, files={})
+    assert report.sends == ()
+    assert report.toasts[-1][1] == "Paramètres introuvables"
+
+
+def test_windows_are_served_in_turn():
+    cfg = dict(CFG, windows=["Perso1", "Perso2", "Perso3"])
+    report = simulate_config(cfg, duration_s=3600)
+    single = simulate_config(CFG, duration_s=3600)
+    assert report.window_counts == {"Perso1": 900, "Perso2": 900, "Perso3": 900}
+    assert report.cycles == 3 * single.cycles
+    assert report.timer_skips == 0 and report.max_drift_ms < 16
+    # actions of the three windows are spread over each pause
+    times = [t for t, _ in report.sends[:3]]
+    assert times[1] - times[0] > 1000 and times[2] - times[1] > 1000
+
+
+def test_closed_window_is_skipped():
+    cfg = dict(CFG, windows=["Perso1", "Perso2"])
+    report = simulate_config(cfg, duration_s=60, windows=["Perso1 - Dofus"])
+    assert set(report.window_counts) == {"Perso1"}
+
+
+def test_shared_runtime_script_behaves_like_single_file():
+    shared = simulate_config(dict(CFG, shared_runtime=True), duration_s=600)
+    single = simulate_config(CFG, duration_s=600)
+    assert shared.sends == single.sends and shared.toasts == single.toasts
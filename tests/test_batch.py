@@ -0,0 +1,41 @@
+from batch import generate_batch
+from script_generator import render_script
+
+
+def _profile(name, storage, **kw):
+    cfg = {
+        "name": name,
+        "attract_shortcut": "2",
+        "repel_shortcut": "3",
+        "toggle_shortcut": "F11",
+        "storage_path": str(storage),
+    }
+    cfg.update(kw)
+    return cfg
+
+
+def test_generate_batch_writes_one_script_per_profile(tmp_path):
+    profiles = [_profile(f"acc{i}", tmp_path) for i in range(20)]
+    results = generate_batch(profiles, max_workers=4)
+    assert all(r.ok for r in results)
+    assert [r.name for r in results] == [p["name"] for p in profiles]
+    assert len(list(tmp_path.glob("*.akh"))) == 20
+    first = tmp_path / "dragoturkey_acc0.akh"
+    assert first.read_text(encoding="utf-8") == render_script(profiles[0])
+
+
+def test_generate_batch_reports_errors_per_profile(tmp_path):
+    profiles = [
+        _profile("good", tmp_path),
+        _profile("bad", tmp_path, repel_shortcut=""),
+        _profile("good", tmp_path),
+    ]
+    results = generate_batch(profiles)
+    assert results[0].ok
+    assert not results[1].ok and "raccourcis" in results[1].error
+    assert not results[2].ok and "good" in results[2].error
+
+
+def test_generate_batch_with_processes(tmp_path):
+    results = generate_batch([_profile("p", tmp_path)], use_processes=True)
+    assert results[0].ok
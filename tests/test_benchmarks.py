@@ -0,0 +1,25 @@
+"""Smoke tests for the benchmark runner; timings are not checked here."""
+import config
+from benchmarks import run as bench
+
+
+def test_run_times_selected_benchmarks():
+    saved = config.CONFIG_FILE
+    results = bench.run(["render", "config"], repeats=1)
+    assert config.CONFIG_FILE == saved
+    assert {"_calibration", "render_scripts_x5000", "config_roundtrip_x100"} <= set(results)
+    assert all(r["min"] > 0 for r in results.values())
+
+
+def test_compare_uses_calibration_units():
+    base = {"_calibration": {"min": 1.0}, "a": {"min": 2.0}, "b": {"min": 2.0}}
+    # machine twice as slow: calibration and "a" double, "b" quadruples
+    cur = {"_calibration": {"min": 2.0}, "a": {"min": 4.0}, "b": {"min": 8.0}, "new": {"min": 1.0}}
+    assert bench.compare(cur, base, threshold=0.5) == [("b", 2.0, 4.0)]
+    assert bench.missing_baselines(cur, base) == ["new"]
+
+
+def test_page_benchmarks_build_every_page(qapp):
+    assert bench._register_page_benchmarks()
+    results = bench.run(["page_", "app_startup"], repeats=1)
+    assert "page_main_x10" in results and "app_startup" in results
@@ -0,0 +1,46 @@
+import json
+import subprocess
+import sys
+
+import cli
+from conftest import ROOT
+
+
+def test_generate_writes_script(cfg_file, tmp_path, capsys):
+    assert cli.main(["--config", str(cfg_file), "generate"]) == 0
+    out = tmp_path / "out" / "dragoturkey_script.akh"
+    assert out.exists()
+    assert str(out) in capsys.readouterr().out
+
+
+def test_validate_reports_errors(cfg_file, capsys):
+    data = json.loads(cfg_file.read_text(encoding="utf-8"))
+    data["profiles"] = [{"name": "ok"}, {"name": "ko", "repel_shortcut": "2"}]
+    cfg_file.write_text(json.dumps(data), encoding="utf-8")
+    assert cli.main(["--config", str(cfg_file), "validate"]) == 1
+    captured = capsys.readouterr()
+    assert "ok: OK" in captured.out
+    assert "ko:" in captured.err
+
+
+def test_batch_generates_all_profiles(cfg_file, tmp_path):
+    data = json.loads(cfg_file.read_text(encoding="utf-8"))
+    data["profiles"] = [{"name": f"acc{i}"} for i in range(3)]
+    cfg_file.write_text(json.dumps(data), encoding="utf-8")
+    assert cli.main(["--config", str(cfg_file), "batch"]) == 0
+    assert len(list((tmp_path / "out").glob("*.akh"))) == 3
+
+
+def test_cli_does_not_import_qt(cfg_file):
+    code = (
+        "import sys, cli; cli.main(['--config', sys.argv[1], 'show-config']);"
+        "assert not any(m.startswith('PyQt5') for m in sys.modules)"
+    )
+    subprocess.run([sys.executable, "-c", code, str(cfg_file)], cwd=ROOT, check=True, capture_output=True)
+
+
+def test_text_transforms_files(tmp_path, capsys):
+    (tmp_path / "a.txt").write_text("abc", encoding="utf-8")
+    assert cli.main(["text", "reverse", str(tmp_path / "*.txt"), "--threads"]) == 0
+    assert (tmp_path / "a_inverse.txt").read_text(encoding="utf-8") == "cba"
+    assert "1 fichiers transformés" in capsys.readouterr().out
@@ -0,0 +1,150 @@
+import json
+import os
+
+import pytest
+
+import atomic_io
+import config
+
+
+@pytest.fixture
+def cfg_file(tmp_path, monkeypatch):
+    path = tmp_path / "app_config.json"
+    monkeypatch.setattr(config, "CONFIG_FILE", path)
+    config.invalidate_config_cache()
+    yield path
+    config._cancel_pending()
+    config.invalidate_config_cache()
+
+
+def test_load_defaults_when_missing(cfg_file):
+    assert config.load_config() == config.DEFAULT_CONFIG
+    assert config.is_first_run()
+
+
+def test_save_then_load_roundtrip(cfg_file):
+    config.save_config({"attract_shortcut": "2", "first_run": False})
+    cfg = config.load_config()
+    assert cfg["attract_shortcut"] == "2"
+    assert cfg["delay_seconds"] == config.DEFAULT_CONFIG["delay_seconds"]
+    assert not config.is_first_run()
+
+
+def test_load_returns_independent_copies(cfg_file):
+    config.save_config({"attract_shortcut": "2"})
+    cfg = config.load_config()
+    cfg["attract_shortcut"] = "changed"
+    assert config.load_config()["attract_shortcut"] == "2"
+
+
+def test_cache_skips_reparse_until_file_changes(cfg_file, monkeypatch):
+    config.save_config({"repel_shortcut": "3"})
+    calls = []
+    real_load = json.load
+    monkeypatch.setattr(json, "load", lambda f: calls.append(1) or real_load(f))
+    config.load_config()
+    config.load_config()
+    assert calls == []
+
+    # external edit with a different size invalidates the cache
+    data = json.loads(cfg_file.read_text(encoding="utf-8"))
+    data["repel_shortcut"] = "F3"
+    cfg_file.write_text(json.dumps(data), encoding="utf-8")
+    assert config.load_config()["repel_shortcut"] == "F3"
+    assert calls == [1]
+
+
+def test_set_first_run_skips_write_when_unchanged(cfg_file):
+    config.save_config({"first_run": False})
+    before = cfg_file.stat().st_mtime_ns
+    config.set_first_run(False)
+    assert cfg_file.stat().st_mtime_ns == before
+
+
+def test_load_profiles_inherit_top_level_values():
+    cfg = {
+        "attract_shortcut": "2",
+        "delay_seconds": 4.0,
+        "profiles": [{"name": "a"}, {"name": "b", "delay_seconds": 6.0}],
+    }
+    profiles = config.load_profiles(cfg)
+    assert [p["name"] for p in profiles] == ["a", "b"]
+    assert profiles[1]["attract_shortcut"] == "2"
+    assert profiles[1]["delay_seconds"] == 6.0
+    assert "profiles" not in profiles[0]
+    assert config.get_profile("b", cfg)["delay_seconds"] == 6.0
+    assert config.get_profile("c", cfg) is None
+
+
+def test_load_profiles_without_profiles_is_single_profile():
+    assert config.load_profiles({"attract_shortcut": "2"}) == [{"attract_shortcut": "2"}]
+
+
+def test_save_is_atomic_and_leaves_no_temp_file(cfg_file, monkeypatch):
+    config.save_config({"attract_shortcut": "2"})
+
+    def boom(*args):
+        raise OSError("disk full")
+
+    monkeypatch.setattr(atomic_io.os, "replace", boom)
+    with pytest.raises(OSError):
+        config.save_config({"attract_shortcut": "9"})
+    # the previous file is intact and no temp file is left behind
+    assert json.loads(cfg_file.read_text(encoding="utf-8"))["attract_shortcut"] == "2"
+    assert [p.name for p in cfg_file.parent.iterdir()] == [cfg_file.name]
+
+
+@pytest.mark.skipif(not hasattr(os, "getuid"), reason="POSIX permissions")
+def test_new_file_gets_umask_permissions(cfg_file):
+    config.save_config({"attract_shortcut": "2"})
+    assert cfg_file.stat().st_mode & 0o777 == 0o666 & ~atomic_io._UMASK
+    cfg_file.chmod(0o600)
+    config.save_config({"attract_shortcut": "3"})
+    assert cfg_file.stat().st_mode & 0o777 == 0o600
+
+
+def test_save_config_later_coalesces_writes(cfg_file, monkeypatch):
+    writes = []
+    real_write = config.write_text_atomic
+    monkeypatch.setattr(config, "write_text_atomic", lambda p, t: writes.append(t) or real_write(p, t))
+    for i in range(5):
+        config.save_config_later({"attract_shortcut": str(i)}, delay=60)
+    # pending value is visible before it reaches the disk
+    assert config.load_config()["attract_shortcut"] == "4"
+    assert writes == [] and not cfg_file.exists()
+    config.flush_pending_save()
+    assert len(writes) == 1
+    config.invalidate_config_cache()
+    assert config.load_config()["attract_shortcut"] == "4"
+
+
+def test_failed_write_keeps_the_pending_save(cfg_file, monkeypatch):
+    real_write = config.write_text_atomic
+    monkeypatch.setattr(config, "SAVE_RETRY_SECONDS", 0.05)
+    fail = []
+
+    def write(path, text):
+        if fail.pop() if fail else False:
+            raise OSError("disque absent")
+        real_write(path, text)
+
+    monkeypatch.setattr(config, "write_text_atomic", write)
+    config.save_config_later({"attract_shortcut": "5"}, delay=60)
+    fail.append(True)
+    with pytest.raises(OSError):
+        config.save_config({"attract_shortcut": "6"})
+    assert config.load_config()["attract_shortcut"] == "5"
+    # the timer reports the failure and tries again
+    fail.append(True)
+    config._timer.cancel()
+    config._flush_from_timer()
+    assert not cfg_file.exists() and config._pending is not None
+    config._timer.join(2)
+    assert json.loads(cfg_file.read_text(encoding="utf-8"))["attract_shortcut"] == "5"
+
+
+def test_save_config_later_writes_after_delay(cfg_file):
+    config.save_config_later({"attract_shortcut": "7"}, delay=0.05)
+    timer = config._timer
+    timer.join(2)
+    assert json.loads(cfg_file.read_text(encoding="utf-8"))["attract_shortcut"] == "7"
@@ -0,0 +1,59 @@
+import json
+import time
+
+import pytest
+
+import config
+
+
+@pytest.fixture
+def model(qapp, tmp_path, monkeypatch):
+    from ui.config_model import config_model
+
+    monkeypatch.setattr(config, "CONFIG_FILE", tmp_path / "app_config.json")
+    config.invalidate_config_cache()
+    config.save_config({"attract_shortcut": "2", "repel_shortcut": "3"})
+    yield config_model()
+    config._cancel_pending()
+    config.invalidate_config_cache()
+
+
+def _record(model):
+    seen = []
+    model.changed.connect(lambda key, value: seen.append((key, value)))
+    return seen
+
+
+def test_update_signals_only_changed_keys(model):
+    seen = _record(model)
+    model.update({"attract_shortcut": "2", "repel_shortcut": "F5"}, save=False)
+    assert seen == [("repel_shortcut", "F5")]
+    assert model.get("repel_shortcut") == "F5"
+
+
+def test_reload_without_change_is_silent(model):
+    seen = _record(model)
+    model.reload()
+    assert seen == []
+
+
+def test_external_edit_is_picked_up(model, qapp):
+    seen = _record(model)
+    data = json.loads(config.CONFIG_FILE.read_text(encoding="utf-8"))
+    data["storage_path"] = "/tmp/elsewhere"
+    time.sleep(0.01)  # make sure the mtime moves
+    config.CONFIG_FILE.write_text(json.dumps(data), encoding="utf-8")
+    deadline = time.monotonic() + 3
+    while not seen and time.monotonic() < deadline:
+        qapp.processEvents()
+        time.sleep(0.01)
+    assert seen == [("storage_path", "/tmp/elsewhere")]
+
+
+def test_main_page_follows_model(model):
+    from ui.main_page import MainPage
+
+    page = MainPage(lambda name: None)
+    assert page.attract.text() == "2"
+    model.update({"attract_shortcut": "Ctrl+A"}, save=False)
+    assert page.attract.text() == "Ctrl+A"
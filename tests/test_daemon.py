@@ -0,0 +1,78 @@
+import json
+import os
+import threading
+
+import pytest
+
+import daemon
+import script_generator as sg
+from daemon import INVALID_REQUEST, METHOD_NOT_FOUND, RpcError, Service
+
+
+def _call(service, method, **params):
+    return service.handle({"jsonrpc": "2.0", "id": 7, "method": method, "params": params})
+
+
+def test_service_generates_validates_and_counts(cfg_file, tmp_path):
+    service = Service()
+    sg.compile_template.cache_clear()
+    service.warm_up()
+    # the profile's template plus the sidecar and runtime ones
+    assert sg.compile_template.cache_info().currsize == 3
+    first = _call(service, "generate")
+    assert first["id"] == 7 and first["result"]["written"]
+    assert not _call(service, "generate")["result"]["written"]
+    assert _call(service, "validate")["result"]["ok"]
+    assert _call(service, "batch", force=True)["result"]["written"] == 1
+    assert _call(service, "nope")["error"]["code"] == METHOD_NOT_FOUND
+    assert _call(service, "generate", profile="x")["error"]["message"] == "Profil inconnu: x"
+    stats = _call(service, "stats")["result"]["methods"]
+    assert stats["generate"]["calls"] == 3 and stats["generate"]["errors"] == 1
+    assert stats["generate"]["max_ms"] >= stats["generate"]["mean_ms"] > 0
+
+
+def test_service_checks_token_and_requests():
+    service = Service(token="s3cret")
+    assert _call(service, "ping")["error"]["code"] == INVALID_REQUEST
+    assert "pid" in _call(service, "ping", token="s3cret")["result"]
+    assert service.handle({"method": "ping"})["error"]["code"] == INVALID_REQUEST
+    # notifications get no answer
+    assert service.handle({"jsonrpc": "2.0", "method": "ping", "params": {"token": "s3cret"}}) is None
+
+
+@pytest.mark.parametrize("tcp", [False, True])
+def test_call_over_socket(cfg_file, tmp_path, monkeypatch, tcp):
+    if not tcp and daemon.USE_TCP:
+        pytest.skip("no Unix sockets here")
+    monkeypatch.setattr(daemon, "state_path", lambda: tmp_path / "state.json")
+    service = Service(token="t")
+    server, address = daemon.make_server(service, str(tmp_path / "d.sock"), 0 if tcp else None)
+    (tmp_path / "state.json").write_text(json.dumps({"address": address, "token": "t"}), encoding="utf-8")
+    t = threading.Thread(target=server.serve_forever)
+    t.start()
+    try:
+        assert daemon.call("generate")["path"].endswith("dragoturkey_script.akh")
+        with pytest.raises(RpcError):
+            daemon.call("explode")
+        assert set(daemon.call("shutdown")) == {"ms"}
+        t.join(2)
+        assert not t.is_alive()
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+def test_state_file_is_private_and_replaces_links(cfg_file, tmp_path):
+    state = daemon.state_path()
+    assert state.parent == cfg_file.parent
+    target = tmp_path / "elsewhere.json"
+    target.write_text("x", encoding="utf-8")
+    try:
+        state.symlink_to(target)
+    except (OSError, NotImplementedError):
+        state.write_text("x", encoding="utf-8")
+    daemon._write_state(state, {"token": "t"})
+    assert not state.is_symlink() and target.read_text(encoding="utf-8") == "x"
+    assert json.loads(state.read_text(encoding="utf-8")) == {"token": "t"}
+    if hasattr(os, "getuid"):
+        assert state.stat().st_mode & 0o777 == 0o600
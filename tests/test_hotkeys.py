@@ -0,0 +1,56 @@
+import pytest
+
+import hotkeys
+
+
+def test_modifier_combos_use_ahk_symbols():
+    assert hotkeys.to_hotkey("Ctrl+Shift+A") == "^+a"
+    assert hotkeys.to_send("Ctrl+Shift+A") == "^+a"
+    assert hotkeys.to_hotkey("Shift+Ctrl+Alt+Meta+F5") == "^!+#F5"
+
+
+def test_named_keys_are_braced_in_send():
+    assert hotkeys.to_hotkey("F11") == "F11"
+    assert hotkeys.to_send("F11") == "{F11}"
+    assert hotkeys.to_send("Num5") == "{Numpad5}"
+    assert hotkeys.to_send("Num+") == "{NumpadAdd}"
+    assert hotkeys.to_hotkey("VolumeUp") == "Volume_Up"
+    assert hotkeys.to_hotkey("Mouse4") == "XButton1"
+    assert hotkeys.to_send("2") == "2"
+
+
+def test_special_characters_are_escaped():
+    assert hotkeys.to_send("!") == "{!}"
+    assert hotkeys.to_send("Ctrl++") == "^{+}"
+    assert hotkeys.to_hotkey(";") == "`;"
+    assert hotkeys.ahk_string('`"') == '```"'
+
+
+def test_parse_is_case_insensitive_and_normalizes():
+    assert hotkeys.normalize("ESC") == "Esc"
+    assert hotkeys.normalize("shift+ctrl+a") == "Ctrl+Shift+A"
+    assert hotkeys.normalize("Escape") == hotkeys.normalize("Esc")
+
+
+def test_unknown_keys_are_rejected():
+    with pytest.raises(hotkeys.HotkeyError):
+        hotkeys.to_hotkey("Ctrl+Key")
+    with pytest.raises(hotkeys.HotkeyError):
+        hotkeys.parse("")
+
+
+def test_qt_key_table_matches_hotkey_names():
+    pytest.importorskip("PyQt5")
+    from PyQt5.QtCore import Qt
+    from ui import keymap
+
+    assert keymap.key_name(Qt.Key_A) == "A"
+    assert keymap.key_name(Qt.Key_5, Qt.KeypadModifier) == "Num5"
+    assert keymap.key_name(Qt.Key_5) == "5"
+    assert keymap.sequence("A", Qt.ControlModifier | Qt.ShiftModifier) == "Ctrl+Shift+A"
+    assert keymap.key_name(Qt.Key_unknown) is None
+    # every name the widget can record is understood by the generator
+    names = set(keymap.KEY_NAMES.values()) | set(keymap.KEYPAD_KEY_NAMES.values())
+    names |= set(keymap.MOUSE_BUTTON_NAMES.values())
+    for name in names:
+        hotkeys.to_hotkey(name)
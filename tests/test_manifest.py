@@ -0,0 +1,69 @@
+import json
+
+from batch import SKIPPED, WRITTEN, generate_batch
+from manifest import MANIFEST_FILENAME, generate_script
+
+CFG = {"attract_shortcut": "2", "repel_shortcut": "3", "toggle_shortcut": "F11"}
+
+
+def test_generate_script_skips_unchanged_output(tmp_path):
+    cfg = dict(CFG, storage_path=str(tmp_path))
+    first = generate_script(cfg)
+    assert first.written
+    mtime = first.path.stat().st_mtime_ns
+    assert not generate_script(cfg).written
+    assert first.path.stat().st_mtime_ns == mtime
+    assert generate_script(cfg, force=True).written
+
+    manifest = json.loads((tmp_path / MANIFEST_FILENAME).read_text(encoding="utf-8"))
+    assert set(manifest["files"][first.path.name]) == {"config", "template", "output"}
+
+
+def test_generate_script_rewrites_on_change_or_edit(tmp_path):
+    cfg = dict(CFG, storage_path=str(tmp_path))
+    out = generate_script(cfg).path
+    assert generate_script(dict(cfg, attract_shortcut="4")).written
+    # a hand-edited or deleted file is regenerated
+    out.write_text("edited", encoding="utf-8")
+    assert generate_script(dict(cfg, attract_shortcut="4")).written
+    out.unlink()
+    assert generate_script(dict(cfg, attract_shortcut="4")).written
+
+
+def test_generate_batch_reports_skipped_and_rewritten(tmp_path):
+    profiles = [dict(CFG, name=f"acc{i}", storage_path=str(tmp_path)) for i in range(5)]
+    assert [r.status for r in generate_batch(profiles)] == [WRITTEN] * 5
+    profiles[2]["repel_shortcut"] = "5"
+    statuses = [r.status for r in generate_batch(profiles)]
+    assert statuses == [SKIPPED, SKIPPED, WRITTEN, SKIPPED, SKIPPED]
+    assert [r.status for r in generate_batch(profiles, force=True)] == [WRITTEN] * 5
+
+
+def test_live_script_only_rewrites_its_sidecar(tmp_path):
+    cfg = dict(CFG, storage_path=str(tmp_path), live_params=True)
+    first = generate_script(cfg)
+    assert first.written and first.params_written
+    ini = first.path.with_suffix(".ini")
+    assert "repel=3" in ini.read_text(encoding="utf-16")
+
+    # new keys or delays: same script, new sidecar
+    second = generate_script(dict(cfg, repel_shortcut="F5", delay_seconds=2))
+    assert not second.written and second.params_written
+    assert "repel={F5}" in ini.read_text(encoding="utf-16")
+    # nothing changed: the sidecar keeps its time stamp
+    mtime = ini.stat().st_mtime_ns
+    assert not generate_script(dict(cfg, repel_shortcut="F5", delay_seconds=2)).params_written
+    assert ini.stat().st_mtime_ns == mtime
+
+    statuses = generate_batch([dict(cfg, repel_shortcut="4")])
+    assert statuses[0].status == SKIPPED and statuses[0].params_written
+
+
+def test_batch_writes_one_shared_runtime_per_folder(tmp_path):
+    from script_generator import RUNTIME_FILENAME
+
+    profiles = [dict(CFG, name=f"acc{i}", storage_path=str(tmp_path), shared_runtime=True) for i in range(10)]
+    assert all(r.ok for r in generate_batch(profiles))
+    assert (tmp_path / RUNTIME_FILENAME).exists()
+    stub = (tmp_path / "dragoturkey_acc0.akh").read_text(encoding="utf-8")
+    assert RUNTIME_FILENAME in stub and "MyLoop" not in stub
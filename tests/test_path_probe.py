@@ -0,0 +1,50 @@
+import threading
+
+from path_probe import PathProber, ProbeResult, describe, probe_path
+
+
+def test_probe_existing_missing_and_file(tmp_path):
+    ok = probe_path(str(tmp_path))
+    assert ok.exists and ok.is_dir and ok.writable and ok.usable
+    assert ok.resolved == str(tmp_path.resolve()) and ok.free_bytes > 0
+    assert list(tmp_path.iterdir()) == []
+
+    missing = probe_path(str(tmp_path / "a" / "b"))
+    assert not missing.exists and missing.usable
+    assert describe(missing).startswith("Le dossier sera créé")
+
+    (tmp_path / "f").write_text("x", encoding="utf-8")
+    assert not probe_path(str(tmp_path / "f")).usable
+    assert not probe_path("  ").usable
+
+
+def test_prober_caches_and_shares_one_probe():
+    calls = []
+    release = threading.Event()
+
+    def slow(raw):
+        calls.append(raw)
+        release.wait(2)
+        return ProbeResult(raw, resolved=raw, exists=True, is_dir=True, writable=True)
+
+    prober = PathProber(probe=slow)
+    late = prober.probe("X:/share", timeout=0.05)
+    assert late.timed_out and not late.usable
+    assert prober.probe("X:/share", timeout=0.05).timed_out
+    assert prober.cached("X:/share") is None
+    release.set()
+    assert prober.probe("X:/share", timeout=2).usable
+    assert calls == ["X:/share"]
+    # served from the cache until invalidated
+    assert prober.probe(" X:/share ").usable and calls == ["X:/share"]
+    prober.invalidate("X:/share")
+    prober.probe("X:/share")
+    assert calls == ["X:/share", "X:/share"]
+
+
+def test_cache_expires():
+    calls = []
+    prober = PathProber(ttl=0, probe=lambda raw: calls.append(raw) or ProbeResult(raw))
+    prober.probe("a")
+    prober.probe("a")
+    assert calls == ["a", "a"]
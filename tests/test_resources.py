@@ -0,0 +1,34 @@
+import pytest
+
+
+@pytest.fixture
+def resources(qapp):
+    from ui import resources
+
+    resources.clear_cache()
+    yield resources
+    resources.clear_cache()
+
+
+def test_pixmap_is_decoded_and_scaled_once(resources):
+    first = resources.pixmap("kiss.png", (40, 40))
+    assert not first.isNull()
+    assert max(first.width(), first.height()) == 40
+    assert resources.pixmap("kiss.png", (40, 40)) is first
+    stats = resources.cache_stats()
+    # scaled entry + full-size entry were missed once, then one hit
+    assert (stats["misses"], stats["hits"]) == (2, 1)
+
+
+def test_preload_fills_cache(resources):
+    resources.preload()
+    misses = resources.cache_stats()["misses"]
+    for name, size in resources.PRELOAD:
+        resources.pixmap(name, size)
+    assert resources.cache_stats()["misses"] == misses
+
+
+def test_missing_files_give_null_objects(resources):
+    assert resources.pixmap("nope.png", (10, 10)).isNull()
+    assert resources.icon("nope.ico").isNull()
+    assert not resources.icon("dd_icon.ico").isNull()
@@ -0,0 +1,100 @@
+import pytest
+
+import script_generator as sg
+
+
+CFG = {
+    "attract_shortcut": "2",
+    "repel_shortcut": "3",
+    "toggle_shortcut": "F11",
+    "storage_path": "",
+}
+
+
+def test_render_script_fills_shortcuts():
+    text = sg.render_script(CFG)
+    assert "\nToggleKey := \"F11\"\n" in text
+    assert "\nToast(Message, Duration := 2000) {\n" in text
+    assert 'RepelKey := "3"\n' in text and 'AttractKey := "2"\n' in text
+    assert 'Windows := [""]\n' in text
+    assert "${" not in text
+
+
+def test_render_script_uses_configured_delays():
+    text = sg.render_script(dict(CFG, delay_seconds=6.5))
+    assert "RepelDelay := 6500\n" in text and "AttractDelay := 6500\n" in text
+    text = sg.render_script(dict(CFG, delay_seconds=6.5, attract_delay_seconds=2))
+    assert "RepelDelay := 6500\n" in text and "AttractDelay := 2000\n" in text
+    # no Sleep in the loop and no fixed-period timer piling up behind it
+    assert "Sleep 3500" not in text and "SetTimer MyLoop, 100" not in text
+
+
+def test_invalid_delay_is_rejected():
+    assert sg.validate_config(dict(CFG, delay_seconds="abc"))
+    assert sg.validate_config(dict(CFG, delay_seconds=0))
+
+
+def test_render_script_rejects_incomplete_config():
+    with pytest.raises(sg.ScriptConfigError):
+        sg.render_script(dict(CFG, toggle_shortcut=""))
+    assert sg.validate_config(dict(CFG, repel_shortcut="2"))
+    assert sg.validate_config(CFG) == []
+
+
+def test_compile_template_is_cached_and_handles_escapes():
+    assert sg.compile_template() is sg.compile_template()
+    assert sg.render_template({"x": "1"}, "a$$b ${x}c") == "a$b 1c"
+    assert sg.compile_template("a$$b ${x}c$$") == (("a$b ", "x"), ("c$", None))
+
+
+def test_write_script_uses_storage_path(tmp_path):
+    out = sg.write_script(dict(CFG, storage_path=str(tmp_path / "sub")))
+    assert out == tmp_path / "sub" / sg.SCRIPT_FILENAME
+    assert out.read_text(encoding="utf-8") == sg.render_script(CFG)
+
+
+def test_write_script_without_destination():
+    with pytest.raises(sg.ScriptConfigError):
+        sg.write_script(CFG)
+
+
+def test_render_script_translates_shortcuts_to_ahk_syntax():
+    cfg = dict(CFG, attract_shortcut="Ctrl+Shift+A", repel_shortcut="Num5", toggle_shortcut="Alt+F11")
+    text = sg.render_script(cfg)
+    assert 'ToggleKey := "!F11"\n' in text
+    assert 'AttractKey := "^+a"\n' in text and 'RepelKey := "{Numpad5}"\n' in text
+
+
+def test_shortcuts_are_compared_after_normalization():
+    assert sg.validate_config(dict(CFG, attract_shortcut="esc", repel_shortcut="Escape"))
+    assert sg.validate_config(dict(CFG, attract_shortcut="Ctrl+Key"))
+
+
+def test_live_script_does_not_embed_keys_or_delays():
+    live = dict(CFG, live_params=True)
+    text = sg.render_script(live)
+    assert text == sg.render_script(dict(live, repel_shortcut="F5", delay_seconds=9))
+    assert 'ToggleKey := "F11"\n' in text and "IniRead(ParamsFile" in text
+    assert sg.config_hash(live) != sg.config_hash(CFG)
+    ini = sg.render_params(dict(live, attract_delay_seconds=1.5))
+    assert "attract=2\n" in ini and "attract_delay_ms=1500\n" in ini
+
+
+def test_windows_are_listed_and_validated():
+    text = sg.render_script(dict(CFG, windows=["Perso1 - Dofus", ' Perso "2" ']))
+    assert 'Windows := ["Perso1 - Dofus", "Perso `"2`""]\n' in text
+    assert sg.validate_config(dict(CFG, windows="Perso1"))
+    assert sg.validate_config(dict(CFG, windows=["A", "a"]))
+
+
+def test_shared_runtime_stub_includes_the_runtime(tmp_path):
+    shared = dict(CFG, shared_runtime=True)
+    stub = sg.render_script(shared)
+    assert stub.endswith("\n#Include %A_ScriptDir%\\" + sg.RUNTIME_FILENAME + "\n")
+    assert "Toast(" not in stub and len(stub) < len(sg.render_script(CFG)) / 5
+    # the single-file script is the same stub with the runtime inlined
+    assert sg.render_script(CFG).endswith(sg.render_runtime())
+
+    assert sg.write_runtime(tmp_path)
+    assert not sg.write_runtime(tmp_path)
+    assert (tmp_path / sg.RUNTIME_FILENAME).read_text(encoding="utf-8") == sg.render_runtime()
@@ -0,0 +1,87 @@
+import os
+import socket
+import sys
+import threading
+
+import pytest
+
+import config
+import single_instance
+from single_instance import forward, parse_request, run_generate
+
+
+def test_parse_request():
+    assert parse_request([]) == ("show", {})
+    assert parse_request(["generate", "--profile", "acc1", "--force"]) == \
+        ("generate", {"profile": "acc1", "force": True})
+    assert parse_request(["generate", "--profile=acc2"])[1]["profile"] == "acc2"
+    for bad in (["delete"], ["generate", "--profile"], ["generate", "x"]):
+        with pytest.raises(ValueError):
+            parse_request(bad)
+
+
+def test_server_name_depends_on_config_file(cfg_file, monkeypatch):
+    name = single_instance.server_name()
+    monkeypatch.setattr(config, "CONFIG_FILE", cfg_file.with_name("other.json"))
+    assert single_instance.server_name() != name
+
+
+def test_run_generate_like_the_cli(cfg_file, tmp_path):
+    ok, message = run_generate()
+    assert ok and "réécrit" in message
+    assert run_generate() == (True, message.replace("réécrit", "inchangé"))
+    assert run_generate(profile="nope") == (False, "Profil inconnu: nope")
+
+
+def test_forward_without_instance(tmp_path):
+    assert forward(["show"], str(tmp_path / "none.sock")) is None
+
+
+@pytest.mark.skipif(sys.platform == "win32", reason="Unix socket stand-in for the Qt server")
+def test_forward_sends_argv_and_returns_reply(tmp_path):
+    address = str(tmp_path / "s.sock")
+    server = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    server.bind(address)
+    server.listen(1)
+    received = []
+
+    def serve():
+        conn, _ = server.accept()
+        with conn:
+            data = b""
+            while not data.endswith(b"\n"):
+                data += conn.recv(4096)
+            received.append(single_instance.decode(data))
+            conn.sendall(single_instance.encode({"ok": True, "message": "fait"}))
+
+    t = threading.Thread(target=serve)
+    t.start()
+    try:
+        assert forward(["generate", "--profile", "a"], address) == {"ok": True, "message": "fait"}
+    finally:
+        t.join(2)
+        server.close()
+    assert received == [{"argv": ["generate", "--profile", "a"]}]
+
+
+def test_instance_server_answers_forwarded_launch(qapp, tmp_path):
+    from PyQt5.QtWidgets import QWidget
+    from ui.instance_server import InstanceServer
+
+    window = QWidget()
+    address = str(tmp_path / "app.sock") if sys.platform != "win32" else "drago_test_" + tmp_path.name
+    server = InstanceServer(window)
+    assert server.listen(address)
+    if sys.platform != "win32":
+        # other local users cannot connect
+        assert os.stat(address).st_mode & 0o077 == 0
+    assert not InstanceServer(window).listen(address)
+    full = address if sys.platform != "win32" else single_instance.server_address(address)
+    replies = []
+    t = threading.Thread(target=lambda: replies.append(forward(["bogus"], full)))
+    t.start()
+    while t.is_alive():
+        qapp.processEvents()
+        t.join(0.01)
+    server.close()
+    assert replies == [{"ok": False, "message": "Commande inconnue: bogus"}]
@@ -0,0 +1,67 @@
+import json
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+import startup_trace
+
+ROOT = Path(__file__).resolve().parents[1]
+
+
+@pytest.fixture
+def tracer(monkeypatch, tmp_path):
+    monkeypatch.setattr(startup_trace, "_events", [])
+    monkeypatch.setattr(startup_trace, "_output", None)
+    yield startup_trace
+
+
+def test_config_from_env_and_flag():
+    cfg = startup_trace._config_from
+    assert cfg({}, ["main.py"]) is None
+    assert cfg({"DRAGO_STARTUP_TRACE": "0"}, ["main.py"]) is None
+    assert cfg({"DRAGO_STARTUP_TRACE": "1"}, ["main.py"]) == "startup_trace.json"
+    assert cfg({"DRAGO_STARTUP_TRACE": "t.json"}, ["main.py"]) == "t.json"
+    assert cfg({}, ["main.py", "--trace-startup"]) == "startup_trace.json"
+    assert cfg({}, ["main.py", "--trace-startup=x.json"]) == "x.json"
+    assert startup_trace.strip_flag(["main.py", "--trace-startup=x.json", "-a"]) == ["main.py", "-a"]
+
+
+def test_only_enabled_on_request(tracer, tmp_path):
+    assert not tracer.enable_from_argv(["main.py"], {})
+    assert not tracer.is_enabled()
+    assert tracer.enable_from_argv(["main.py"], {"DRAGO_STARTUP_TRACE": str(tmp_path / "t.json")})
+    assert tracer.is_enabled()
+
+
+def test_import_alone_does_not_trace(tmp_path):
+    # config imports the tracer: a CLI run must not write the app's trace
+    env = dict(os.environ, DRAGO_STARTUP_TRACE="1")
+    code = "import config, startup_trace; config.load_config(); print(startup_trace.is_enabled())"
+    out = subprocess.run([sys.executable, "-c", code], cwd=tmp_path, env=dict(env, PYTHONPATH=str(ROOT)),
+                         capture_output=True, text=True, check=True).stdout
+    assert out.strip() == "False"
+    assert not (tmp_path / "startup_trace.json").exists()
+
+
+def test_disabled_tracer_records_nothing(tracer):
+    with tracer.span("work"):
+        pass
+    tracer.mark("done")
+    assert tracer.events() == []
+    assert tracer.dump() is None
+
+
+def test_dump_writes_chrome_trace(tracer, tmp_path):
+    out = tmp_path / "trace.json"
+    tracer.enable(out)
+    with tracer.span("build page", page="main"):
+        pass
+    tracer.mark("first paint")
+    assert tracer.dump() == str(out)
+    events = json.loads(out.read_text(encoding="utf-8"))["traceEvents"]
+    assert [(e["name"], e["ph"]) for e in events] == [("build page", "X"), ("first paint", "i")]
+    assert events[0]["args"] == {"page": "main"}
+    assert events[0]["dur"] >= 0
@@ -0,0 +1,101 @@
+import os
+
+from ahk_simulator import Simulator
+from script_generator import render_script, telemetry_path
+from telemetry import STALL_MS, CycleStats, TelemetryLog, TelemetryMonitor
+
+CFG = {"attract_shortcut": "2", "repel_shortcut": "3", "toggle_shortcut": "F11", "delay_seconds": 4.0,
+       "telemetry": True}
+HEADER = "tick_ms,window,action,late_ms\n"
+
+
+def _append(path, text):
+    with open(path, "a", encoding="utf-8", newline="") as f:
+        f.write(text)
+
+
+def test_percentiles_and_stalls():
+    stats = CycleStats()
+    for i in range(100):
+        stats.add(i * 2000, 1, i % 2, i)
+    stats.add(200_000, 1, 1, STALL_MS + 5)
+    assert stats.percentile(50) == 50
+    assert stats.percentile(99) == 99
+    assert stats.percentile(100) == STALL_MS + 5
+    assert stats.stalls == 1
+    assert stats.cycles == 51
+
+
+def test_idle_gaps_and_restarts_are_not_active_time():
+    stats = CycleStats()
+    for tick in (0, 4000, 8000, 500_000, 504_000, 1000, 5000):
+        stats.add(tick, 1, 1, 0)
+    assert stats.active_ms == 3 * 4000 + 4000
+    assert stats.sessions == 2
+    assert stats.cycles_per_hour == 7 * 3_600_000 / 16_000
+
+
+def test_log_reads_only_appended_lines(tmp_path):
+    path = tmp_path / "drago.telemetry.csv"
+    _append(path, HEADER + "0,1,0,3\n4000,1,1,")
+    log = TelemetryLog(path)
+    assert log.poll() == 1
+    _append(path, "5\n8000,1,0,2\n")
+    assert log.poll() == 2
+    assert log.poll() == 0
+    assert log.stats.actions == 3 and log.stats.max_late == 5
+    assert log.profile == "drago"
+
+
+def test_log_follows_rotation(tmp_path):
+    path = tmp_path / "drago.telemetry.csv"
+    _append(path, HEADER + "0,1,0,3\n")
+    log = TelemetryLog(path)
+    log.poll()
+    # lines written before the script renamed the file must not be lost
+    _append(path, "4000,1,1,4\n")
+    os.replace(path, tmp_path / "drago.telemetry.csv.1")
+    _append(path, HEADER + "8000,1,0,1\n")
+    assert log.poll() == 2
+    assert log.stats.actions == 3
+
+
+def test_simulated_script_log_matches_cadence(tmp_path):
+    sim = Simulator(render_script(CFG), script_path="C:\\scripts\\drago.ahk")
+    sim.run(3_600_000, presses=[(0, "F11")])
+    text = sim.file(telemetry_path("drago.ahk").name)[1]
+    assert text.startswith(HEADER)
+    path = tmp_path / "drago.telemetry.csv"
+    _append(path, text)
+    (summary,) = TelemetryMonitor(tmp_path).poll()
+    assert summary.profile == "drago"
+    assert summary.actions == len(sim.sends)
+    assert 440 <= summary.cycles_per_hour <= 460
+    assert summary.p99_ms < 20 and summary.stalls == 0
+
+
+def test_scripts_log_nothing_without_telemetry():
+    sim = Simulator(render_script(dict(CFG, telemetry=False)), script_path="C:\\scripts\\drago.ahk")
+    sim.run(60_000, presses=[(0, "F11")])
+    assert sim.sends and not sim.files
+
+
+def test_page_shows_profiles(qapp, tmp_path, monkeypatch):
+    import config
+    from ui.config_model import config_model
+    from ui.telemetry_page import TelemetryPage
+
+    monkeypatch.setattr(config, "CONFIG_FILE", tmp_path / "app_config.json")
+    config.invalidate_config_cache()
+    config.save_config({"storage_path": str(tmp_path)})
+    try:
+        _append(tmp_path / "drago.telemetry.csv", HEADER + "0,1,0,3\n4000,1,1,7\n")
+        page = TelemetryPage(lambda name: None)
+        page.show_rows(page.monitor.poll())
+        assert page.table.rowCount() == 1
+        assert page.table.item(0, 0).text() == "drago"
+        config_model().update({"storage_path": ""}, save=False)
+        assert page.monitor is None and page.table.rowCount() == 0
+    finally:
+        config._cancel_pending()
+        config.invalidate_config_cache()
@@ -0,0 +1,102 @@
+from pathlib import Path
+
+import pytest
+
+import text_batch
+from text_batch import collect_files, output_path, summarize, transform_batch
+from text_utils import reverse_text
+
+
+def _files(folder, count):
+    folder.mkdir(exist_ok=True)
+    for i in range(count):
+        (folder / f"f{i}.txt").write_text(f"Ligne {i} ΣΑΣ café\r\n", encoding="utf-8")
+    return collect_files(folder)
+
+
+def test_collect_files_from_folder_and_glob(tmp_path):
+    _files(tmp_path / "a", 3)
+    (tmp_path / "a" / "sub").mkdir()
+    (tmp_path / "a" / "sub" / "deep.txt").write_text("x", encoding="utf-8")
+    assert [p.name for p in collect_files(tmp_path / "a")] == ["f0.txt", "f1.txt", "f2.txt"]
+    assert len(collect_files(str(tmp_path / "a" / "**" / "*.txt"))) == 4
+
+
+def test_batch_writes_one_output_per_file(tmp_path):
+    sources = _files(tmp_path / "in", 40)
+    seen = []
+    results = transform_batch(sources, "reverse", out_dir=tmp_path / "out", max_workers=2,
+                              on_result=lambda done, total, r: seen.append(done))
+    assert all(r.ok for r in results)
+    assert [r.src for r in results] == [str(p) for p in sources]
+    assert seen == list(range(1, 41))
+    text = sources[0].read_bytes().decode("utf-8")
+    assert (tmp_path / "out" / "f0.txt").read_bytes() == reverse_text(text).encode("utf-8")
+    s = summarize(results, 2.0)
+    assert s.files == 40 and s.failed == 0 and s.size == sum(p.stat().st_size for p in sources)
+
+
+def test_batch_next_to_sources_uses_suffix_and_streams_big_files(tmp_path, monkeypatch):
+    monkeypatch.setattr(text_batch, "STREAM_THRESHOLD", 10)
+    sources = _files(tmp_path, 2)
+    results = transform_batch(sources, "swapcase", use_processes=False)
+    assert all(r.ok for r in results)
+    assert output_path(sources[0], suffix="_casse") == tmp_path / "f0_casse.txt"
+    assert (tmp_path / "f0_casse.txt").read_text(encoding="utf-8") == "lIGNE 0 σας CAFÉ\n"
+    # a rerun on the folder leaves the previous outputs alone
+    results = transform_batch(collect_files(tmp_path), "swapcase", use_processes=False)
+    assert [Path(r.src).name for r in results] == ["f0.txt", "f1.txt"]
+    assert sorted(p.name for p in tmp_path.iterdir()) == ["f0.txt", "f0_casse.txt", "f1.txt", "f1_casse.txt"]
+
+
+def test_batch_reports_errors_per_file(tmp_path):
+    good = _files(tmp_path / "in", 1)[0]
+    bad = tmp_path / "in" / "bad.txt"
+    bad.write_bytes(b"\xff\xfe")
+    results = transform_batch([good, bad, good], "reverse", use_processes=False, suffix="_r")
+    assert results[0].ok
+    assert not results[1].ok
+    assert not results[2].ok and "f0.txt" in results[2].error
+    assert not transform_batch([good], "reverse", suffix="", use_processes=False)[0].ok
+
+
+def test_exception_in_callback_stops_the_batch(tmp_path):
+    sources = _files(tmp_path / "in", 20)
+
+    def stop(done, total, result):
+        raise KeyboardInterrupt
+
+    with pytest.raises(KeyboardInterrupt):
+        transform_batch(sources, "reverse", out_dir=tmp_path / "out", max_workers=1,
+                        use_processes=False, on_result=stop)
+    assert len(list((tmp_path / "out").iterdir())) < 20
+
+
+class _Task:
+    def __init__(self):
+        self.reports = []
+
+    def report(self, percent, message):
+        self.reports.append(percent)
+
+
+def test_page_job_runs_on_a_process_pool(tmp_path, monkeypatch):
+    pytest.importorskip("PyQt5.QtWidgets")
+    from ui.text_batch_page import _batch_job
+
+    pools = []
+
+    class Pool(text_batch.ProcessPoolExecutor):
+        def __init__(self, *args, **kwargs):
+            super().__init__(*args, **kwargs)
+            pools.append(self)
+
+    monkeypatch.setattr(text_batch, "ProcessPoolExecutor", Pool)
+    sources = _files(tmp_path / "in", 6)
+    task = _Task()
+    results, summary = _batch_job(task, str(tmp_path / "in"), "reverse", str(tmp_path / "out"))
+    assert len(pools) == 1
+    assert summary.files == 6 and summary.failed == 0
+    assert task.reports[-1] == 100
+    text = sources[0].read_bytes().decode("utf-8")
+    assert (tmp_path / "out" / "f0.txt").read_bytes() == reverse_text(text).encode("utf-8")
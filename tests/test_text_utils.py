@@ -1,6 +1,14 @@
 import pytest
 
-from text_utils import reverse_text, swap_case
+from text_utils import (
+    graphemes,
+    iter_reverse_file,
+    iter_swap_case_file,
+    reverse_file,
+    reverse_text,
+    swap_case,
+    swap_case_file,
+)
 
 
 def test_reverse_text():
@@ -13,3 +21,46 @@ def test_swap_case():
     assert swap_case("AbC") == "aBc"
     assert swap_case("") == ""
     assert swap_case(None) == ""
+
+
+def test_reverse_keeps_graphemes_whole():
+    # e + combining acute, flag, family ZWJ sequence, skin tone, CR LF
+    text = "café \U0001F1EB\U0001F1F7 \U0001F468\u200d\U0001F469 \U0001F44D\U0001F3FD\r\n"
+    assert reverse_text(text) == "\r\n\U0001F44D\U0001F3FD \U0001F468\u200d\U0001F469 \U0001F1EB\U0001F1F7 éfac"
+    assert reverse_text("😀a") == "a😀"
+    assert "".join(graphemes(text)) == text
+
+
+@pytest.mark.parametrize("chunk_size", [1, 2, 3, 7, 64])
+def test_streamed_files_match_whole_string(tmp_path, chunk_size):
+    text = ("Ωμέγα ΣΑΣ café\r\n\U0001F1EB\U0001F1F7\U0001F1E9\U0001F1EA "
+            "\U0001F468\u200d\U0001F469\u200d\U0001F467 plain ascii\n") * 5
+    src = tmp_path / "in.txt"
+    src.write_bytes(text.encode("utf-8"))
+    assert "".join(iter_reverse_file(src, chunk_size)) == reverse_text(text)
+    assert "".join(iter_swap_case_file(src, chunk_size)) == swap_case(text)
+
+
+def test_file_transforms_write_output_and_report_progress(tmp_path):
+    src, dst = tmp_path / "in.txt", tmp_path / "out.txt"
+    src.write_bytes(b"\xef\xbb\xbfAb\r\nc\xc3\xa9")
+    seen = []
+    reverse_file(src, dst, chunk_size=2, progress=lambda done, total: seen.append((done, total)))
+    assert dst.read_bytes() == "éc\r\nbA".encode("utf-8")
+    assert seen[-1] == (10, 10) and seen == sorted(seen)
+    swap_case_file(src, dst)
+    assert dst.read_bytes() == "aB\r\nCÉ".encode("utf-8")
+
+
+def test_interrupted_transform_leaves_target_untouched(tmp_path):
+    src, dst = tmp_path / "in.txt", tmp_path / "out.txt"
+    src.write_text("x" * 100, encoding="utf-8")
+    dst.write_text("old", encoding="utf-8")
+
+    def cancel(done, total):
+        raise KeyboardInterrupt
+
+    with pytest.raises(KeyboardInterrupt):
+        reverse_file(src, dst, chunk_size=10, progress=cancel)
+    assert dst.read_text(encoding="utf-8") == "old"
+    assert sorted(p.name for p in tmp_path.iterdir()) == ["in.txt", "out.txt"]
@@ -0,0 +1,48 @@
+def test_stylesheet_is_compiled_once():
+    from ui import theme
+
+    css = theme.stylesheet()
+    assert css and "/*" not in css and "\n" not in css
+    assert 'QLineEdit[recording="true"]' in css
+    assert theme.stylesheet() is css
+
+
+def test_set_state_only_repolishes_on_change(qapp, monkeypatch):
+    from PyQt5.QtWidgets import QLineEdit
+    from ui import theme
+
+    w = QLineEdit()
+    polished = []
+    style = w.style()
+    monkeypatch.setattr(style, "polish", lambda widget: polished.append(widget))
+    theme.set_state(w, "recording", True)
+    theme.set_state(w, "recording", True)
+    assert w.property("recording") is True
+    assert len(polished) == 1
+
+
+def test_key_sequence_edit_flips_recording_property(qapp):
+    from PyQt5.QtCore import QEvent, Qt
+    from PyQt5.QtGui import QFocusEvent, QKeyEvent
+    from ui.settings_page import KeySequenceEdit
+
+    w = KeySequenceEdit()
+    w.focusInEvent(QFocusEvent(QEvent.FocusIn))
+    assert w.property("recording") is True
+    w.keyPressEvent(QKeyEvent(QEvent.KeyPress, Qt.Key_F5, Qt.NoModifier, ""))
+    assert w.property("recording") is False
+    assert w.sequence() == "F5"
+    assert w.styleSheet() == ""
+
+
+def test_key_sequence_edit_set_sequence_waits_for_recording(qapp):
+    from PyQt5.QtCore import QEvent
+    from PyQt5.QtGui import QFocusEvent
+    from ui.settings_page import KeySequenceEdit
+
+    w = KeySequenceEdit()
+    w.set_sequence("F2")
+    assert w.sequence() == "F2" and w.text() == "F2"
+    w.focusInEvent(QFocusEvent(QEvent.FocusIn))
+    w.set_sequence("F3")
+    assert w.sequence() == "F2" and w.text() == ""
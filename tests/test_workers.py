@@ -0,0 +1,84 @@
+import threading
+import time
+
+import pytest
+
+
+@pytest.fixture
+def pool(qapp):
+    from PyQt5.QtCore import QThreadPool
+
+    pool = QThreadPool()
+    yield pool
+    pool.waitForDone(2000)
+
+
+def _wait(qapp, pool, predicate, timeout=2.0):
+    deadline = time.monotonic() + timeout
+    while not predicate() and time.monotonic() < deadline:
+        pool.waitForDone(10)
+        qapp.processEvents()
+    assert predicate()
+
+
+def test_task_reports_progress_and_result_on_gui_thread(qapp, pool):
+    from ui.workers import run_in_background
+
+    seen = []
+    gui_thread = threading.get_ident()
+
+    def job(task, x):
+        task.report(50, "half")
+        return x * 2, threading.get_ident()
+
+    run_in_background(
+        job,
+        21,
+        on_progress=lambda p, m: seen.append(("progress", p, m)),
+        on_finished=lambda r: seen.append(("finished", r, threading.get_ident())),
+        pool=pool,
+    )
+    _wait(qapp, pool, lambda: len(seen) == 2)
+    assert seen[0] == ("progress", 50, "half")
+    (kind, (value, worker_thread), slot_thread) = seen[1]
+    assert value == 42
+    assert worker_thread != gui_thread and slot_thread == gui_thread
+
+
+def test_task_can_be_cancelled(qapp, pool):
+    from ui.workers import run_in_background
+
+    started = threading.Event()
+    release = threading.Event()
+    seen = []
+
+    def job(task):
+        started.set()
+        release.wait(2)
+        task.check_cancelled()
+        return "done"
+
+    task = run_in_background(
+        job,
+        on_finished=lambda r: seen.append("finished"),
+        on_cancelled=lambda: seen.append("cancelled"),
+        pool=pool,
+    )
+    started.wait(2)
+    task.cancel()
+    release.set()
+    _wait(qapp, pool, lambda: seen)
+    assert seen == ["cancelled"]
+
+
+def test_task_failure_is_reported(qapp, pool):
+    from ui.workers import run_in_background
+
+    seen = []
+
+    def job(task):
+        raise OSError("disque plein")
+
+    run_in_background(job, on_failed=seen.append, pool=pool)
+    _wait(qapp, pool, lambda: seen)
+    assert seen == ["disque plein"]
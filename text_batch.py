@@ -0,0 +1,171 @@
+"""Apply a text_utils transform to many files at once on a worker pool.
+
+Like batch.py this module does not import PyQt5, so the CLI can use it.
+Files up to STREAM_THRESHOLD are read through a memory map and
+transformed in one go; bigger ones go through the streaming functions of
+text_utils so a worker's memory stays flat. Output is written through
+atomic_io, a temp file renamed over the target once complete.
+"""
+import glob
+import mmap
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from pathlib import Path
+from typing import NamedTuple
+
+from atomic_io import atomic_writer
+from text_utils import reverse_file, reverse_text, swap_case, swap_case_file
+
+# name -> (whole-string function, streaming file function); names so that
+# a process pool only has to pickle a string
+TRANSFORMS = {
+    "reverse": (reverse_text, reverse_file),
+    "swapcase": (swap_case, swap_case_file),
+}
+# default suffix added to output names when writing next to the sources
+SUFFIXES = {"reverse": "_inverse", "swapcase": "_casse"}
+STREAM_THRESHOLD = 16 << 20
+_BOM = b"\xef\xbb\xbf"
+
+
+class FileResult(NamedTuple):
+    src: str
+    dst: str
+    error: str = ""
+    size: int = 0  # bytes read
+    seconds: float = 0.0
+
+    @property
+    def ok(self) -> bool:
+        return not self.error
+
+
+class BatchSummary(NamedTuple):
+    files: int
+    failed: int
+    size: int  # bytes read by the files that succeeded
+    seconds: float  # wall clock of the whole batch
+
+    @property
+    def mb_per_second(self) -> float:
+        return self.size / 1e6 / self.seconds if self.seconds else 0.0
+
+    @property
+    def files_per_second(self) -> float:
+        return (self.files - self.failed) / self.seconds if self.seconds else 0.0
+
+
+def collect_files(source) -> list:
+    """Files matched by source: a directory (its files, not recursing) or a glob pattern (** allowed)."""
+    source = str(source)
+    if os.path.isdir(source):
+        paths = (Path(source) / name for name in os.listdir(source))
+    else:
+        paths = (Path(p) for p in glob.glob(source, recursive=True))
+    return sorted(p for p in paths if p.is_file())
+
+
+def output_path(src, out_dir=None, suffix: str = "") -> Path:
+    """Where the result for src goes: out_dir (default: next to src), suffix before the extension."""
+    src = Path(src)
+    folder = Path(out_dir) if out_dir else src.parent
+    return folder / f"{src.stem}{suffix}{src.suffix}"
+
+
+def _read_mapped(path: Path) -> str:
+    with open(path, "rb") as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            return ""  # an empty file cannot be mapped
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as m:
+            start = len(_BOM) if m[:len(_BOM)] == _BOM else 0
+            # decoded straight from the mapping: m[start:] would copy it to bytes first
+            with memoryview(m)[start:] as view:
+                return str(view, "utf-8")
+
+
+def transform_file(name: str, src, dst) -> FileResult:
+    """Apply the transform called name to src, writing dst; failures are reported, not raised."""
+    whole, streamed = TRANSFORMS[name]
+    start = time.perf_counter()
+    size = 0
+    try:
+        size = os.path.getsize(src)
+        if size > STREAM_THRESHOLD:
+            streamed(src, dst)
+        else:
+            text = whole(_read_mapped(Path(src)))
+            # newline="" keeps the line endings of the source
+            with atomic_writer(dst, newline="") as out:
+                out.write(text)
+    except Exception as e:
+        return FileResult(str(src), str(dst), str(e) or type(e).__name__, size, time.perf_counter() - start)
+    return FileResult(str(src), str(dst), "", size, time.perf_counter() - start)
+
+
+def _transform_job(job) -> FileResult:
+    return transform_file(*job)
+
+
+def transform_batch(sources, name: str, out_dir=None, suffix: str = None, max_workers: int = None,
+                    use_processes: bool = True, on_result=None) -> list:
+    """Transform every file of sources in parallel; return one FileResult per file, in order.
+
+    sources is a list of paths (see collect_files). Output goes to out_dir,
+    or next to each source; suffix defaults to SUFFIXES[name] in the latter
+    case and to "" otherwise. Sources whose name already ends with suffix
+    are outputs of an earlier run and are left out. The work is CPU bound, so a process pool is
+    used unless use_processes is False. on_result(done, total, result) is
+    called in the caller's thread as files complete (in input order); an
+    exception it raises cancels the files not started yet and propagates.
+    """
+    if name not in TRANSFORMS:
+        raise ValueError(f"Transformation inconnue: {name}")
+    if suffix is None:
+        suffix = "" if out_dir else SUFFIXES[name]
+    if out_dir:
+        Path(out_dir).mkdir(parents=True, exist_ok=True)
+    sources = [Path(s) for s in sources]
+    if suffix:
+        # a rerun on the same folder must not produce f_inverse_inverse.txt
+        sources = [s for s in sources if not s.stem.endswith(suffix)]
+    results = [None] * len(sources)
+    seen = {}
+    jobs = []
+    for i, src in enumerate(sources):
+        dst = output_path(src, out_dir, suffix)
+        key = os.path.normcase(os.path.abspath(dst))
+        if key == os.path.normcase(os.path.abspath(src)):
+            results[i] = FileResult(str(src), str(dst), "Le résultat remplacerait le fichier source")
+        elif key in seen:
+            results[i] = FileResult(str(src), str(dst), f"Même fichier de sortie que {seen[key]}")
+        else:
+            seen[key] = src.name
+            jobs.append((i, (name, str(src), str(dst))))
+
+    done = len(sources) - len(jobs)
+    if jobs:
+        workers = max_workers or min(len(jobs), os.cpu_count() or 1)
+        pool_cls = ProcessPoolExecutor if use_processes else ThreadPoolExecutor
+        pool = pool_cls(max_workers=workers)
+        try:
+            # several files per round trip: thousands of small files would
+            # otherwise spend more time in pickling than in the transform
+            chunksize = max(1, len(jobs) // (workers * 4)) if use_processes else 1
+            for (i, _), res in zip(jobs, pool.map(_transform_job, [job for _, job in jobs], chunksize=chunksize)):
+                results[i] = res
+                done += 1
+                if on_result is not None:
+                    on_result(done, len(sources), res)
+        except BaseException:
+            pool.shutdown(wait=True, cancel_futures=True)
+            raise
+        pool.shutdown(wait=True)
+    return results
+
+
+def summarize(results, seconds: float) -> BatchSummary:
+    """Totals of a batch that took seconds of wall clock."""
+    failed = sum(1 for r in results if not r.ok)
+    size = sum(r.size for r in results if r.ok)
+    return BatchSummary(len(results), failed, size, seconds)
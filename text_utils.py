@@ -1,10 +1,61 @@
-"""Small text utility functions used by the UI pages."""
+"""Small text utility functions used by the UI pages.
+
+reverse_text and swap_case work on strings. The iter_*_file generators
+stream a UTF-8 file chunk by chunk, so memory stays flat whatever its
+size; reverse_file and swap_case_file write their output through a temp
+file that only replaces the target once complete.
+
+Reversing works on grapheme clusters (a simplified UAX #29): a letter
+keeps its combining accents, CR LF, emoji ZWJ sequences, flags and
+surrogate pairs stay in one piece and in their order.
+"""
+import os
+import re
+import unicodedata
+from functools import lru_cache
+
+from atomic_io import atomic_writer
+
+CHUNK_SIZE = 1 << 20
+_BOM = b"\xef\xbb\xbf"
+
+
+@lru_cache(maxsize=None)
+def _cluster_re():
+    """Regex matching one grapheme cluster, built on first use (~30 ms)."""
+    ranges = []
+    # combining marks all live below U+20000 or in the variation selectors supplement
+    for cp in list(range(0x300, 0x20000)) + list(range(0xE0100, 0xE01F0)):
+        if unicodedata.category(chr(cp)) in ("Mn", "Me", "Mc"):
+            if ranges and ranges[-1][1] == cp - 1:
+                ranges[-1][1] = cp
+            else:
+                ranges.append([cp, cp])
+    # ZWNJ, Hangul medial/final jamo, emoji skin tones, emoji tag characters
+    ranges += [[0x200C, 0x200C], [0x1160, 0x11FF], [0x1F3FB, 0x1F3FF], [0xE0020, 0xE007F]]
+    extend = "".join(f"{re.escape(chr(a))}-{re.escape(chr(b))}" for a, b in ranges)
+    base = (
+        "[\U0001F1E6-\U0001F1FF]{2}"  # flag: a pair of regional indicators
+        "|[\ud800-\udbff][\udc00-\udfff]"  # surrogate pair left in a str
+        "|[\\s\\S]"
+    )
+    # controls never take marks; what follows a ZWJ joins the cluster, except flags
+    zwj = "\u200d[^\x00-\x1f\x7f\u200d\U0001F1E6-\U0001F1FF]?"
+    return re.compile(f"\r\n|[\x00-\x1f\x7f]|(?:{zwj}|{base})(?:[{extend}]|{zwj})*")
+
+
+def graphemes(s: str) -> list:
+    """Split s into grapheme clusters; "".join() of the result gives s back."""
+    return _cluster_re().findall(s)
+
 
 def reverse_text(s: str) -> str:
-    """Return the reversed string. Handles None gracefully."""
+    """Return the reversed string, grapheme by grapheme. Handles None gracefully."""
     if s is None:
         return ""
-    return s[::-1]
+    if s.isascii() and "\r" not in s:
+        return s[::-1]
+    return "".join(reversed(graphemes(s)))
 
 
 def swap_case(s: str) -> str:
@@ -12,3 +63,124 @@ def swap_case(s: str) -> str:
     if s is None:
         return ""
     return s.swapcase()
+
+
+def iter_swap_case(chunks):
+    """swap_case over an iterable of strings, yielding the result piece by piece.
+
+    Each chunk is cut after its last whitespace and the rest held for the
+    next one, so context-dependent mappings (final sigma) see whole words.
+    """
+    pending = ""
+    for chunk in chunks:
+        text = pending + chunk
+        cut = max(text.rfind(" "), text.rfind("\n"), text.rfind("\t")) + 1
+        if cut:
+            pending = text[cut:]
+            yield text[:cut].swapcase()
+        else:
+            pending = text
+            # a single enormous "word": give up on the context rather than memory
+            if len(pending) > CHUNK_SIZE:
+                yield pending.swapcase()
+                pending = ""
+    if pending:
+        yield pending.swapcase()
+
+
+def iter_swap_case_file(path, chunk_size: int = CHUNK_SIZE, progress=None):
+    """Yield the swapped-case text of the UTF-8 file at path, chunk by chunk.
+
+    progress(done_bytes, total_bytes) is called after each chunk read.
+    """
+    total = os.path.getsize(path)
+    # newline="" keeps the line endings of the file as they are
+    with open(path, "r", encoding="utf-8-sig", newline="") as f:
+        def chunks():
+            while True:
+                chunk = f.read(chunk_size)
+                if not chunk:
+                    return
+                if progress is not None:
+                    progress(min(f.buffer.tell(), total), total)
+                yield chunk
+
+        yield from iter_swap_case(chunks())
+    if progress is not None:
+        progress(total, total)
+
+
+def _is_regional(cluster: str) -> bool:
+    return "\U0001F1E6" <= cluster[0] <= "\U0001F1FF"
+
+
+def iter_reverse_file(path, chunk_size: int = CHUNK_SIZE, progress=None):
+    """Yield the grapheme-reversed text of the UTF-8 file at path, chunk by chunk.
+
+    The file is read backwards. Bytes of a character cut by the start of a
+    chunk, and the first clusters of a chunk (which may continue into the
+    text before it, e.g. an accent whose letter is in the earlier chunk),
+    are carried over to the next read. progress(done_bytes, total_bytes) is
+    called after each chunk read.
+    """
+    cluster_re = _cluster_re()
+    with open(path, "rb") as f:
+        total = pos = f.seek(0, os.SEEK_END)
+        head = b""  # leading bytes of the later chunk that need the earlier ones
+        carry = ""  # leading clusters of the later chunk, not final yet
+        while pos > 0:
+            start = max(0, pos - chunk_size)
+            f.seek(start)
+            data = f.read(pos - start) + head
+            pos = start
+            cut = 0
+            if pos > 0:
+                # UTF-8 continuation bytes (10xxxxxx) belong to a character started earlier
+                while cut < min(3, len(data)) and data[cut] & 0xC0 == 0x80:
+                    cut += 1
+            elif data.startswith(_BOM):
+                cut = len(_BOM)
+            head = data[:cut] if pos > 0 else b""
+            text = data[cut:].decode("utf-8") + carry
+            if text.isascii() and "\r" not in text:
+                # one character per cluster: plain slicing, no regex
+                keep = 1 if pos > 0 else 0
+                carry = text[:keep]
+                if progress is not None:
+                    progress(total - pos, total)
+                yield text[keep:][::-1]
+                continue
+            clusters = cluster_re.findall(text)
+            keep = 0
+            if pos > 0 and clusters:
+                # flags pair up from the start of a run, which may be further back
+                keep = 1
+                while keep < len(clusters) and _is_regional(clusters[keep - 1]):
+                    keep += 1
+            carry = "".join(clusters[:keep])
+            if progress is not None:
+                progress(total - pos, total)
+            if keep < len(clusters):
+                yield "".join(reversed(clusters[keep:]))
+        if carry:
+            yield carry
+
+
+def _write_stream(pieces, dst) -> None:
+    with atomic_writer(dst, newline="") as out:
+        for piece in pieces:
+            out.write(piece)
+
+
+def reverse_file(src, dst, chunk_size: int = CHUNK_SIZE, progress=None) -> None:
+    """Write the grapheme-reversed text of UTF-8 file src to dst, streaming.
+
+    dst is only replaced once fully written; an exception raised by
+    progress (e.g. a cancelled task) leaves it untouched.
+    """
+    _write_stream(iter_reverse_file(src, chunk_size, progress), dst)
+
+
+def swap_case_file(src, dst, chunk_size: int = CHUNK_SIZE, progress=None) -> None:
+    """Write the swapped-case text of UTF-8 file src to dst, streaming (see reverse_file)."""
+    _write_stream(iter_swap_case_file(src, chunk_size, progress), dst)
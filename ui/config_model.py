@@ -0,0 +1,86 @@
+"""Shared, observable view of app_config.json for the pages.
+
+Pages read values from the model and subscribe to the keys they display
+instead of reloading the whole file. The model watches the config file,
+so edits made outside the app (or by the CLI) show up too; only keys
+whose value actually changed are signalled.
+"""
+import copy
+
+from PyQt5.QtCore import QFileSystemWatcher, QObject, QTimer, pyqtSignal
+
+import config
+
+# editors often write a file in several steps, wait for them to settle
+RELOAD_DELAY_MS = 100
+
+
+class ConfigModel(QObject):
+    # key, new value; emitted once per key whose value changed. Pages connect
+    # a bound method so the connection goes away with the page.
+    changed = pyqtSignal(str, object)
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.path = config.CONFIG_FILE
+        self._data = config.load_config()
+
+        self._reload_timer = QTimer(self)
+        self._reload_timer.setSingleShot(True)
+        self._reload_timer.setInterval(RELOAD_DELAY_MS)
+        self._reload_timer.timeout.connect(self.reload)
+
+        # the folder is watched too: an atomic save replaces the file, which
+        # drops it from the watch list until it is added back
+        self._fs = QFileSystemWatcher(self)
+        self._fs.addPath(str(self.path.parent))
+        self._watch_file()
+        self._fs.fileChanged.connect(self._on_disk_change)
+        self._fs.directoryChanged.connect(self._on_disk_change)
+
+    def _watch_file(self):
+        if self.path.exists() and str(self.path) not in self._fs.files():
+            self._fs.addPath(str(self.path))
+
+    def _on_disk_change(self, _path):
+        self._watch_file()
+        self._reload_timer.start()
+
+    def get(self, key: str, default=None):
+        return copy.deepcopy(self._data.get(key, default))
+
+    def snapshot(self) -> dict:
+        """Private copy of the whole config."""
+        return copy.deepcopy(self._data)
+
+    def update(self, values: dict, save: bool = True):
+        """Change some keys, emit changed for those that differ and schedule a save."""
+        new = dict(self._data)
+        new.update(copy.deepcopy(values))
+        self._apply(new)
+        if save:
+            config.save_config_later(self._data)
+
+    def reload(self):
+        """Re-read the config; a no-op when the file holds what we already have."""
+        self._watch_file()
+        self._apply(config.load_config())
+
+    def _apply(self, new: dict):
+        old = self._data
+        self._data = new
+        for key in sorted(old.keys() | new.keys()):
+            if old.get(key) == new.get(key):
+                continue
+            self.changed.emit(key, copy.deepcopy(new.get(key)))
+
+
+_model = None
+
+
+def config_model() -> ConfigModel:
+    """The model shared by all pages (rebuilt if config.CONFIG_FILE was repointed)."""
+    global _model
+    if _model is None or _model.path != config.CONFIG_FILE:
+        _model = ConfigModel()
+    return _model
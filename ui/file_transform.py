@@ -0,0 +1,118 @@
+from pathlib import Path
+
+from PyQt5.QtWidgets import (
+    QFileDialog,
+    QHBoxLayout,
+    QLabel,
+    QMessageBox,
+    QProgressBar,
+    QPushButton,
+    QVBoxLayout,
+    QWidget,
+)
+
+from ui.workers import run_in_background
+
+FILE_FILTER = "Texte (*.txt);;Tous les fichiers (*)"
+
+
+class FileTransformBox(QWidget):
+    """File-in/file-out mode of a text page.
+
+    transform(src, dst, progress=...) is one of the streaming functions of
+    text_utils; it runs on the thread pool so the window stays live and
+    memory stays flat whatever the file size. While it runs the button
+    cancels it, and the output file is left as it was.
+    """
+
+    def __init__(self, transform, suffix: str, parent=None):
+        super().__init__(parent)
+        self.transform = transform
+        self.suffix = suffix
+        self._task = None
+        layout = QVBoxLayout()
+        layout.setContentsMargins(0, 0, 0, 0)
+
+        row = QHBoxLayout()
+        self.button = QPushButton("Depuis un fichier…")
+        self.status = QLabel("")
+        self.status.setWordWrap(True)
+        row.addWidget(self.button)
+        row.addWidget(self.status, 1)
+        self.progress = QProgressBar()
+        self.progress.setRange(0, 100)
+        self.progress.setVisible(False)
+
+        layout.addLayout(row)
+        layout.addWidget(self.progress)
+        self.setLayout(layout)
+
+        self.button.clicked.connect(self._on_clicked)
+
+    def _on_clicked(self):
+        if self._task is not None:
+            self._task.cancel()
+            return
+        src, _ = QFileDialog.getOpenFileName(self, "Fichier à transformer", "", FILE_FILTER)
+        if not src:
+            return
+        default = Path(src).with_name(Path(src).stem + self.suffix + Path(src).suffix)
+        dst, _ = QFileDialog.getSaveFileName(self, "Enregistrer le résultat", str(default), FILE_FILTER)
+        if not dst:
+            return
+        self.start(src, dst)
+
+    def start(self, src: str, dst: str):
+        """Transform src into dst in the background."""
+        if self._task is not None:
+            return
+        self._task = run_in_background(
+            _transform_job,
+            self.transform,
+            src,
+            dst,
+            on_progress=self._on_progress,
+            on_finished=self._on_finished,
+            on_failed=self._on_failed,
+            on_cancelled=self._on_cancelled,
+        )
+        self.button.setText("Annuler")
+        self.progress.setValue(0)
+        self.progress.setVisible(True)
+        self.status.setText(Path(src).name)
+
+    def _end_task(self, message: str):
+        self._task = None
+        self.button.setText("Depuis un fichier…")
+        self.progress.setVisible(False)
+        self.status.setText(message)
+
+    def _on_progress(self, percent, message):
+        self.progress.setValue(percent)
+
+    def _on_finished(self, dst):
+        self._end_task(f"Fichier créé: {dst}")
+
+    def _on_cancelled(self):
+        self._end_task("Annulé.")
+
+    def _on_failed(self, message):
+        self._end_task("")
+        QMessageBox.warning(self, "Erreur", f"Échec de la transformation: {message}")
+
+
+def _transform_job(task, transform, src: str, dst: str):
+    """Background part of FileTransformBox.start; report() raises once cancelled."""
+    last = [-1]
+
+    def progress(done, total):
+        percent = done * 100 // total if total else 100
+        # one signal per percent, not per chunk
+        if percent != last[0]:
+            last[0] = percent
+            task.report(percent)
+        else:
+            task.check_cancelled()
+
+    transform(src, dst, progress=progress)
+    return dst
@@ -0,0 +1,103 @@
+"""Local server of the running app, see single_instance for the protocol."""
+from PyQt5.QtCore import QObject
+from PyQt5.QtNetwork import QLocalServer, QLocalSocket
+
+import single_instance
+from ui.workers import run_in_background
+
+
+class InstanceServer(QObject):
+    """Answers later launches: shows the window or runs their command.
+
+    Generation runs on the thread pool; the client's connection stays open
+    until it is done and gets the result as its reply.
+    """
+
+    def __init__(self, window, parent=None):
+        super().__init__(parent)
+        self.window = window
+        self.server = QLocalServer(self)
+        # the address is predictable: only the same user may connect, like the daemon socket
+        self.server.setSocketOptions(QLocalServer.UserAccessOption)
+        self.server.newConnection.connect(self._on_new_connection)
+        self._buffers = {}  # socket -> bytes received so far
+        self._tasks = set()
+
+    def listen(self, address: str = None) -> bool:
+        """Start listening; False if a live instance already owns the address."""
+        address = address or single_instance.server_address()
+        # asked first: with UserAccessOption, listen() replaces a socket in use
+        probe = QLocalSocket()
+        probe.connectToServer(address)
+        if probe.waitForConnected(int(single_instance.CONNECT_TIMEOUT_S * 1000)):
+            probe.abort()
+            return False
+        # nobody answering: nothing there, or a socket file left by a crashed instance
+        QLocalServer.removeServer(address)
+        return self.server.listen(address)
+
+    def close(self):
+        self.server.close()
+
+    def _on_new_connection(self):
+        while self.server.hasPendingConnections():
+            sock = self.server.nextPendingConnection()
+            self._buffers[sock] = b""
+            sock.readyRead.connect(lambda sock=sock: self._on_ready_read(sock))
+            sock.disconnected.connect(lambda sock=sock: self._forget(sock))
+
+    def _forget(self, sock):
+        self._buffers.pop(sock, None)
+        sock.deleteLater()
+
+    def _on_ready_read(self, sock):
+        if sock not in self._buffers:
+            return
+        data = self._buffers[sock] + bytes(sock.readAll())
+        if b"\n" not in data:
+            self._buffers[sock] = data
+            return
+        # one request per connection, anything after it is ignored
+        self._buffers[sock] = None
+        try:
+            argv = single_instance.decode(data.split(b"\n", 1)[0])["argv"]
+        except (ValueError, KeyError, TypeError):
+            self._reply(sock, False, "Requête invalide")
+            return
+        self.handle(argv, lambda ok, message: self._reply(sock, ok, message))
+
+    def handle(self, argv: list, respond):
+        """Run the command in argv; respond(ok, message) is called once it is done."""
+        try:
+            command, options = single_instance.parse_request(argv)
+        except ValueError as e:
+            respond(False, str(e))
+            return
+        if command == "show":
+            self._raise_window()
+            respond(True, "")
+            return
+        task = run_in_background(
+            lambda task, options: single_instance.run_generate(**options),
+            options,
+            on_finished=lambda result: respond(*result),
+            on_failed=lambda message: respond(False, message),
+        )
+        self._tasks.add(task)
+        task.signals.finished.connect(lambda _=None, task=task: self._tasks.discard(task))
+        task.signals.failed.connect(lambda _=None, task=task: self._tasks.discard(task))
+
+    def _raise_window(self):
+        w = self.window
+        if w.isMinimized():
+            w.showNormal()
+        w.show()
+        w.raise_()
+        w.activateWindow()
+
+    def _reply(self, sock, ok: bool, message: str):
+        if sock not in self._buffers:
+            return  # the client went away meanwhile
+        sock.write(single_instance.encode({"ok": bool(ok), "message": message}))
+        sock.flush()
+        sock.disconnectFromServer()
@@ -0,0 +1,108 @@
+"""Qt key codes to the shortcut names understood by hotkeys.py.
+
+The tables are built once at import so KeySequenceEdit resolves a key
+press with a single dict lookup.
+"""
+from PyQt5.QtCore import Qt
+
+# Qt modifier flag -> display name, in the order they are shown
+MODIFIERS = (
+    (Qt.ControlModifier, "Ctrl"),
+    (Qt.AltModifier, "Alt"),
+    (Qt.ShiftModifier, "Shift"),
+    (Qt.MetaModifier, "Meta"),
+)
+
+MODIFIER_KEYS = frozenset((Qt.Key_Control, Qt.Key_Shift, Qt.Key_Alt, Qt.Key_Meta, Qt.Key_AltGr))
+
+
+def _key_names() -> dict:
+    names = {
+        Qt.Key_Escape: "Esc",
+        Qt.Key_Tab: "Tab",
+        Qt.Key_Backtab: "Tab",
+        Qt.Key_Backspace: "Backspace",
+        Qt.Key_Return: "Enter",
+        Qt.Key_Enter: "Enter",
+        Qt.Key_Space: "Space",
+        Qt.Key_Insert: "Insert",
+        Qt.Key_Delete: "Delete",
+        Qt.Key_Home: "Home",
+        Qt.Key_End: "End",
+        Qt.Key_PageUp: "PageUp",
+        Qt.Key_PageDown: "PageDown",
+        Qt.Key_Up: "Up",
+        Qt.Key_Down: "Down",
+        Qt.Key_Left: "Left",
+        Qt.Key_Right: "Right",
+        Qt.Key_CapsLock: "CapsLock",
+        Qt.Key_NumLock: "NumLock",
+        Qt.Key_ScrollLock: "ScrollLock",
+        Qt.Key_Print: "PrintScreen",
+        Qt.Key_Pause: "Pause",
+        Qt.Key_Menu: "Menu",
+        Qt.Key_VolumeUp: "VolumeUp",
+        Qt.Key_VolumeDown: "VolumeDown",
+        Qt.Key_VolumeMute: "VolumeMute",
+        Qt.Key_MediaPlay: "MediaPlay",
+        Qt.Key_MediaPause: "MediaPlay",
+        Qt.Key_MediaTogglePlayPause: "MediaPlay",
+        Qt.Key_MediaStop: "MediaStop",
+        Qt.Key_MediaNext: "MediaNext",
+        Qt.Key_MediaPrevious: "MediaPrevious",
+        Qt.Key_Back: "BrowserBack",
+        Qt.Key_Forward: "BrowserForward",
+        Qt.Key_Refresh: "BrowserRefresh",
+        Qt.Key_HomePage: "BrowserHome",
+    }
+    for i in range(24):
+        names[Qt.Key_F1 + i] = f"F{i + 1}"
+    # printable keys: Qt uses the (upper-case) Latin-1 code point as key code
+    for code in range(0x21, 0x100):
+        ch = chr(code)
+        if ch.isprintable() and not ch.isspace():
+            names.setdefault(code, ch.upper() if len(ch.upper()) == 1 else ch)
+    return names
+
+
+def _keypad_names() -> dict:
+    names = {Qt.Key_0 + i: f"Num{i}" for i in range(10)}
+    names.update({
+        Qt.Key_Period: "Num.",
+        Qt.Key_Comma: "Num.",
+        Qt.Key_Slash: "Num/",
+        Qt.Key_Asterisk: "Num*",
+        Qt.Key_Minus: "Num-",
+        Qt.Key_Plus: "Num+",
+        Qt.Key_Enter: "NumEnter",
+        Qt.Key_Return: "NumEnter",
+    })
+    return names
+
+
+KEY_NAMES = _key_names()
+# keys that read differently when they come from the numeric keypad
+KEYPAD_KEY_NAMES = _keypad_names()
+MOUSE_BUTTON_NAMES = {
+    Qt.MiddleButton: "MouseMiddle",
+    Qt.XButton1: "Mouse4",
+    Qt.XButton2: "Mouse5",
+}
+
+
+def modifier_names(modifiers) -> list:
+    return [name for flag, name in MODIFIERS if modifiers & flag]
+
+
+def key_name(key: int, modifiers=Qt.NoModifier):
+    """Display name of a Qt key, or None for keys that cannot be a shortcut."""
+    if modifiers & Qt.KeypadModifier:
+        name = KEYPAD_KEY_NAMES.get(key)
+        if name is not None:
+            return name
+    return KEY_NAMES.get(key)
+
+
+def sequence(name: str, modifiers=Qt.NoModifier) -> str:
+    """Join modifier names and a key name, e.g. "Ctrl+Shift+A"."""
+    return "+".join(modifier_names(modifiers) + [name])
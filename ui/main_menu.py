@@ -20,10 +20,16 @@ class MainMenu(QWidget):
         else:
             self.btn_regen = QPushButton("Regénérer script")
             self.btn_edit = QPushButton("Modifier paramètres")
+            self.btn_stats = QPushButton("Statistiques")
+            self.btn_text = QPushButton("Traiter des fichiers texte")
             layout.addWidget(self.btn_regen)
             layout.addWidget(self.btn_edit)
+            layout.addWidget(self.btn_stats)
+            layout.addWidget(self.btn_text)
             self.btn_regen.clicked.connect(lambda: self.navigate_to("regen"))
             self.btn_edit.clicked.connect(lambda: self.navigate_to("settings"))
+            self.btn_stats.clicked.connect(lambda: self.navigate_to("telemetry"))
+            self.btn_text.clicked.connect(lambda: self.navigate_to("textbatch"))
         layout.addStretch()
         self.setLayout(layout)
         
@@ -18,10 +18,15 @@ from PyQt5.QtWidgets import (
     QDialog,
     QTextBrowser,
 )
-from PyQt5.QtGui import QFont, QPixmap, QIcon
+from PyQt5.QtGui import QFont
 from PyQt5.QtCore import Qt
 
-from config import load_config
+from manifest import generate_script
+from path_probe import describe, path_prober
+from script_generator import script_path, validate_config
+from ui import resources, theme
+from ui.config_model import config_model
+from ui.workers import run_in_background
 
 
 class MainPage(QWidget):
@@ -34,13 +39,14 @@ class MainPage(QWidget):
     def __init__(self, navigate_to):
         super().__init__()
         self.navigate_to = navigate_to
-        self.cfg = load_config()
+        self.model = config_model()
+        self.cfg = self.model.snapshot()
 
-        # set application and window icon from ressources/fart.png (if available)
-        icon_path = Path(__file__).resolve().parent.parent / "ressources" / "dd_icon.ico"
-        if icon_path.exists():
-            QApplication.setWindowIcon(QIcon(str(icon_path)))
-            self.setWindowIcon(QIcon(str(icon_path)))
+        # set application and window icon from ressources/dd_icon.ico (if available)
+        app_icon = resources.icon("dd_icon.ico")
+        if not app_icon.isNull():
+            QApplication.setWindowIcon(app_icon)
+            self.setWindowIcon(app_icon)
 
         root_layout = QVBoxLayout()
 
@@ -56,7 +62,7 @@ class MainPage(QWidget):
         center_frame = QFrame()
         center_frame.setFrameShape(QFrame.StyledPanel)
         center_frame.setMaximumWidth(700)
-        center_frame.setStyleSheet("background: #1f2326; border-radius: 8px; padding: 18px;")
+        center_frame.setObjectName("centerFrame")
         center_layout = QVBoxLayout()
         center_layout.setSpacing(12)
         center_frame.setLayout(center_layout)
@@ -71,19 +77,14 @@ class MainPage(QWidget):
         form.setLabelAlignment(Qt.AlignLeft)
         form.setFormAlignment(Qt.AlignCenter)
 
-        # styled badge labels for shortcuts
-        badge_style = (
-            "background: #2d6cdf; color: white; padding: 6px 10px; border-radius: 6px;"
-            "font-weight: 600;"
-        )
+        # shortcut values are shown as badges (QLabel[badge="true"] in the theme)
         # Attirer label with icon (icon immediately before the label text)
-        kiss_path = Path(__file__).resolve().parent.parent / "ressources" / "kiss.png"
-        kiss_pix = QPixmap(str(kiss_path))
+        kiss_pix = resources.pixmap("kiss.png", (40, 40))
         kiss_lbl = QLabel()
         if not kiss_pix.isNull():
-            kiss_lbl.setPixmap(kiss_pix.scaled(40, 40, Qt.KeepAspectRatio, Qt.SmoothTransformation))
+            kiss_lbl.setPixmap(kiss_pix)
         label_att = QLabel("Attirer:")
-        label_att.setStyleSheet("color: #d6d6d6; font-weight: 600;")
+        label_att.setObjectName("fieldLabel")
         lab_att_h = QHBoxLayout()
         lab_att_h.setContentsMargins(0, 0, 0, 0)
         lab_att_h.addWidget(kiss_lbl)
@@ -93,17 +94,16 @@ class MainPage(QWidget):
 
         self.attract = QLabel(self.cfg.get("attract_shortcut", ""))
         self.attract.setTextInteractionFlags(Qt.TextSelectableByMouse)
-        self.attract.setStyleSheet(badge_style)
+        self.attract.setProperty("badge", True)
         form.addRow(lab_att_w, self.attract)
 
         # Éloigner label with icon (icon immediately before the label text)
-        fart_path = Path(__file__).resolve().parent.parent / "ressources" / "fart.png"
-        fart_pix = QPixmap(str(fart_path))
+        fart_pix = resources.pixmap("fart.png", (40, 40))
         fart_lbl = QLabel()
         if not fart_pix.isNull():
-            fart_lbl.setPixmap(fart_pix.scaled(40, 40, Qt.KeepAspectRatio, Qt.SmoothTransformation))
+            fart_lbl.setPixmap(fart_pix)
         label_rep = QLabel("Éloigner:")
-        label_rep.setStyleSheet("color: #d6d6d6; font-weight: 600;")
+        label_rep.setObjectName("fieldLabel")
         lab_rep_h = QHBoxLayout()
         lab_rep_h.setContentsMargins(0, 0, 0, 0)
         lab_rep_h.addWidget(fart_lbl)
@@ -113,11 +113,11 @@ class MainPage(QWidget):
 
         self.repel = QLabel(self.cfg.get("repel_shortcut", ""))
         self.repel.setTextInteractionFlags(Qt.TextSelectableByMouse)
-        self.repel.setStyleSheet(badge_style)
+        self.repel.setProperty("badge", True)
         form.addRow(lab_rep_w, self.repel)
 
         label_tog = QLabel("Start/Stop script:")
-        label_tog.setStyleSheet("color: #d6d6d6; font-weight: 600;")
+        label_tog.setObjectName("fieldLabel")
         lab_tog_h = QHBoxLayout()
         lab_tog_h.setContentsMargins(0, 0, 0, 0)
         lab_tog_h.addWidget(label_tog)
@@ -126,22 +126,15 @@ class MainPage(QWidget):
 
         self.toggle = QLabel(self.cfg.get("toggle_shortcut", "nik"))
         self.toggle.setTextInteractionFlags(Qt.TextSelectableByMouse)
-        self.toggle.setStyleSheet(badge_style)
+        self.toggle.setProperty("badge", True)
         form.addRow(lab_tog_w, self.toggle)
 
-        # Storage path (absolute) with icon button
-        raw_path = (self.cfg.get("storage_path") or "").strip()
-        if raw_path:
-            try:
-                abs_path = str(Path(raw_path).expanduser().resolve())
-            except Exception:
-                abs_path = raw_path
-        else:
-            abs_path = "(non défini)"
+        # Storage path as typed; the absolute path replaces it once probed (see _probe_storage)
+        abs_path = _display_path(self.cfg.get("storage_path"))
 
         # Présentation du label de gauche similaire à l'entrée Start/Stop
         label_path = QLabel("Chemin: ")
-        label_path.setStyleSheet("color: #d6d6d6; font-weight: 600;")
+        label_path.setObjectName("fieldLabel")
         lab_path_h = QHBoxLayout()
         lab_path_h.setContentsMargins(0, 0, 0, 0)
         lab_path_h.addWidget(label_path)
@@ -151,7 +144,8 @@ class MainPage(QWidget):
         # valeur affichée en mode "badge" (sélectionnable) pour ressembler à Start/Stop
         self.path_lbl = QLabel(abs_path)
         self.path_lbl.setTextInteractionFlags(Qt.TextSelectableByMouse)
-        self.path_lbl.setStyleSheet(badge_style + " font-family: 'Consolas', 'Courier New', monospace;")
+        self.path_lbl.setObjectName("pathBadge")
+        self.path_lbl.setProperty("badge", True)
         self.path_lbl.setMinimumHeight(70)
         self.path_lbl.setSizePolicy(QSizePolicy.Expanding, QSizePolicy.Fixed)
 
@@ -159,6 +153,7 @@ class MainPage(QWidget):
 
         # expose current absolute path string for refresh/copy
         self._abs_path = abs_path
+        self._probe_task = None
 
         center_layout.addLayout(form)
 
@@ -174,9 +169,7 @@ class MainPage(QWidget):
         self.info_btn = QPushButton("?")
         self.info_btn.setFixedSize(60, 60)
         # slightly larger font and tighter padding to appear closer
-        self.info_btn.setStyleSheet(
-            "background: #2b2d31; color: #d6d6d6; border-radius: 20px; font-size: 24px;"
-        )
+        self.info_btn.setObjectName("infoButton")
         # remove extra spacing around the button to move it closer to the generate button
         info_container = QWidget()
         info_layout = QHBoxLayout()
@@ -194,6 +187,16 @@ class MainPage(QWidget):
         actions_container.setLayout(actions_h)
         center_layout.addWidget(actions_container, alignment=Qt.AlignHCenter)
 
+        # progress of the background generation, hidden when idle
+        self.status_lbl = QLabel("")
+        self.status_lbl.setObjectName("statusLabel")
+        self.status_lbl.setAlignment(Qt.AlignCenter)
+        self.status_lbl.setVisible(False)
+        center_layout.addWidget(self.status_lbl, alignment=Qt.AlignHCenter)
+        # running generation task, if any
+        self._task = None
+        self._open_task = None
+
         # further distribute vertical space before the back button
         center_layout.addStretch()
 
@@ -215,121 +218,173 @@ class MainPage(QWidget):
         # connect info action
         self.info_btn.clicked.connect(lambda: InfoDialog(self).exec_())
 
+        # only the labels whose value changed are updated
+        self.model.changed.connect(self._on_config_changed)
+        self._probe_storage()
+
     def refresh(self):
-        """Reload config and update displayed values."""
-        self.cfg = load_config()
-        self.attract.setText(self.cfg.get("attract_shortcut", ""))
-        self.repel.setText(self.cfg.get("repel_shortcut", ""))
-        self.toggle.setText(self.cfg.get("toggle_shortcut", ""))
-        raw_path = (self.cfg.get("storage_path") or "").strip()
-        if raw_path:
-            try:
-                abs_path = str(Path(raw_path).expanduser().resolve())
-            except Exception:
-                abs_path = raw_path
-        else:
-            abs_path = "(non défini)"
-        # update the badge-like label showing the absolute path
-        self.path_lbl.setText(abs_path)
-        self._abs_path = abs_path
+        """Re-read the config file; changed values reach the labels through the model."""
+        self.model.reload()
+
+    def _on_config_changed(self, key, value):
+        self.cfg[key] = value
+        badge = {"attract_shortcut": self.attract, "repel_shortcut": self.repel,
+                 "toggle_shortcut": self.toggle}.get(key)
+        if badge is not None:
+            badge.setText(value or "")
+        elif key == "storage_path":
+            # update the badge-like label showing the absolute path
+            self._abs_path = _display_path(value)
+            self.path_lbl.setText(self._abs_path)
+            self._probe_storage()
+
+    def _probe_storage(self):
+        """Resolve and check the storage folder off the GUI thread, then update the badge.
+
+        A cached result is used right away; resolving a OneDrive or network
+        path can take seconds.
+        """
+        raw = self.cfg.get("storage_path") or ""
+        if not raw.strip():
+            theme.set_state(self.path_lbl, "pathState", "")
+            self.path_lbl.setToolTip("")
+            return
+        hit = path_prober().cached(raw)
+        if hit is not None:
+            self._on_probed(hit)
+            return
+        self._probe_task = run_in_background(
+            lambda task, raw: path_prober().probe(raw),
+            raw,
+            on_finished=self._on_probed,
+        )
+
+    def _on_probed(self, result):
+        # a result for a path changed meanwhile is dropped
+        if result.raw != (self.cfg.get("storage_path") or "").strip():
+            return
+        if result.resolved:
+            self._abs_path = result.resolved
+            self.path_lbl.setText(self._abs_path)
+        state = "ok" if result.usable else ("warning" if result.timed_out else "error")
+        theme.set_state(self.path_lbl, "pathState", state)
+        self.path_lbl.setToolTip(describe(result))
 
     def _generate(self):
-        """Generate the script file using saved config (or ask for a path)."""
-        cfg = load_config()
-        a = cfg.get("attract_shortcut") or ""
-        r = cfg.get("repel_shortcut") or ""
-        t = cfg.get("toggle_shortcut") or ""
-        if not a or not r or not t:
-            QMessageBox.warning(self, "Validation", "Les trois raccourcis doivent être définis dans les paramètres.")
+        """Generate the script file using saved config (or ask for a path).
+
+        The file system work runs on the thread pool; while it runs the
+        button cancels it.
+        """
+        if self._task is not None:
+            self._task.cancel()
+            return
+        cfg = self.model.snapshot()
+        errors = validate_config(cfg)
+        if errors:
+            QMessageBox.warning(self, "Validation", errors[0])
             return
-        path = cfg.get("storage_path") or ""
-        if not path:
+        out = script_path(cfg)
+        if out is None:
             # ask user where to save
             dlg = QFileDialog()
             fp, _ = dlg.getSaveFileName(self, "Enregistrer le script", "script.txt", "Text Files (*.txt)")
             if not fp:
                 return
             out = fp
-        else:
-            p = Path(path)
-            try:
-                p.mkdir(parents=True, exist_ok=True)
-            except Exception as e:
-                QMessageBox.warning(self, "Erreur", f"Impossible de créer le dossier: {e}")
-                return
-            out = str(p / "dragoturkey_script.akh")
-
-        try:
-            with open(out, "w", encoding="utf-8") as f:
-                f.write("Toast(Message, Duration := 2000) {\n")
-                f.write("    myGui := Gui(\"+AlwaysOnTop +ToolWindow -Caption\")\n")
-                f.write('    myGui.BackColor := "000000"\n')
-                f.write('    myGui.SetFont("s16 cWhite", "Arial")\n')
-                f.write('    myGui.Add("Text", , Message)\n')
-                f.write("    x := A_ScreenWidth - 300\n")
-                f.write('    myGui.Show("x" x " y20 w280 h50 NoActivate")\n')
-                f.write("    SetTimer () => myGui.Destroy(), -Duration\n")
-                f.write("}\n")
-                f.write("\n")
-                f.write('Toast("Script lancé", 2000)\n')
-                f.write("\n")
-                f.write("toggle := false\n")
-                f.write("\n")
-                f.write(f"{t}::\n")
-                f.write("{\n")
-                f.write("    global toggle\n")
-                f.write("    toggle := !toggle\n")
-                f.write("    if (toggle) {\n")
-                f.write('        Toast("Macro activée", 2000)\n')
-                f.write("        SetTimer MyLoop, 100\n")
-                f.write("    } else {\n")
-                f.write('        Toast("Macro désactivée", 2000)\n')
-                f.write("        SetTimer MyLoop, 0\n")
-                f.write("    }\n")
-                f.write("}\n")
-                f.write("\n")
-                f.write("^F11::\n")
-                f.write("{\n")
-                f.write('    Toast("Script arrêté", 2000)\n')
-                f.write("    Sleep 2000\n")
-                f.write("    ExitApp\n")
-                f.write("}\n")
-                f.write("\n")
-                f.write("MyLoop() {\n")
-                f.write(f'    Send "{r}"\n')
-                f.write("    Sleep 3500\n")
-                f.write(f'    Send "{a}"\n')
-                f.write("    Sleep 3500\n")
-                f.write("}\n")
-
-            # show a dialog with OK and "Ouvrir le dossier" options
-            dlg = QMessageBox(self)
-            dlg.setWindowTitle("Génération terminée")
+
+        self._task = run_in_background(
+            _generate_job,
+            cfg,
+            str(out),
+            on_progress=self._on_generate_progress,
+            on_finished=self._on_generate_finished,
+            on_failed=self._on_generate_failed,
+            on_cancelled=self._on_generate_cancelled,
+        )
+        self.generate_btn.setText("Annuler")
+        self.status_lbl.setText("Génération…")
+        self.status_lbl.setVisible(True)
+
+    def _end_task(self):
+        self._task = None
+        self.generate_btn.setText("Générer le script")
+        self.status_lbl.setVisible(False)
+
+    def _on_generate_progress(self, percent, message):
+        self.status_lbl.setText(f"{message} ({percent} %)")
+
+    def _on_generate_cancelled(self):
+        self._end_task()
+
+    def _on_generate_failed(self, message):
+        self._end_task()
+        QMessageBox.warning(self, "Erreur", message)
+
+    def _on_generate_finished(self, result):
+        self._end_task()
+        # the folder may have just been created
+        path_prober().invalidate(self.cfg.get("storage_path") or "")
+        self._probe_storage()
+        out = str(result.path)
+        # show a dialog with OK and "Ouvrir le dossier" options
+        dlg = QMessageBox(self)
+        dlg.setWindowTitle("Génération terminée")
+        if result.written:
             dlg.setText(f"Fichier créé: {out}")
-            dlg.setIcon(QMessageBox.Information)
-            open_btn = dlg.addButton("Ouvrir le dossier", QMessageBox.ActionRole)
-            dlg.addButton(QMessageBox.Ok)
-            dlg.exec_()
-            clicked = dlg.clickedButton()
-            if clicked == open_btn:
-                # open the folder containing the generated file
-                folder = os.path.dirname(out)
-                try:
-                    # Windows: os.startfile; other OSs could use xdg-open / open
-                    os.startfile(folder)
-                except Exception:
-                    try:
-                        # fallback for other platforms
-                        import subprocess
-
-                        if os.name == "posix":
-                            subprocess.run(["xdg-open", folder])
-                        else:
-                            subprocess.run(["open", folder])
-                    except Exception:
-                        QMessageBox.warning(self, "Erreur", "Impossible d'ouvrir le dossier.")
-        except Exception as e:
-            QMessageBox.warning(self, "Erreur", f"Échec de l'écriture du fichier: {e}")
+        elif result.params_written:
+            dlg.setText(f"Paramètres mis à jour, le script en cours les applique: {out}")
+        else:
+            dlg.setText(f"Fichier déjà à jour, non réécrit: {out}")
+        dlg.setIcon(QMessageBox.Information)
+        open_btn = dlg.addButton("Ouvrir le dossier", QMessageBox.ActionRole)
+        dlg.addButton(QMessageBox.Ok)
+        dlg.exec_()
+        if dlg.clickedButton() == open_btn:
+            # opening the file manager may block, keep it off the GUI thread
+            self._open_task = run_in_background(
+                _open_folder_job,
+                os.path.dirname(out),
+                on_failed=lambda _: QMessageBox.warning(self, "Erreur", "Impossible d'ouvrir le dossier."),
+            )
+
+
+def _display_path(raw) -> str:
+    # no resolve() here: it may block on a slow drive, the prober does it
+    raw_path = (raw or "").strip()
+    return raw_path or "(non défini)"
+
+
+def _generate_job(task, cfg: dict, out: str):
+    """Background part of MainPage._generate: create the folder and write the script."""
+    task.report(10, "Création du dossier")
+    try:
+        Path(out).parent.mkdir(parents=True, exist_ok=True)
+    except Exception as e:
+        raise OSError(f"Impossible de créer le dossier: {e}") from e
+    task.report(40, "Écriture du script")
+    try:
+        # unchanged scripts are not rewritten (avoids a new upload on synced folders)
+        result = generate_script(cfg, out)
+    except Exception as e:
+        raise OSError(f"Échec de l'écriture du fichier: {e}") from e
+    task.report(100, "Terminé")
+    return result
+
+
+def _open_folder_job(task, folder: str):
+    try:
+        # Windows: os.startfile; other OSs could use xdg-open / open
+        os.startfile(folder)
+    except AttributeError:
+        # fallback for other platforms
+        import subprocess
+
+        if os.name == "posix":
+            subprocess.run(["xdg-open", folder], check=True)
+        else:
+            subprocess.run(["open", folder], check=True)
+
 
 class InfoDialog(QDialog):
     
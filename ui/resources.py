@@ -0,0 +1,78 @@
+"""Process-wide cache for the images in ressources/.
+
+Each (file, size, transformation) is decoded and scaled once, then shared
+by every page. Needs a QApplication to exist before the first call.
+"""
+from pathlib import Path
+
+from PyQt5.QtCore import Qt
+from PyQt5.QtGui import QIcon, QPixmap
+
+RESOURCES_DIR = Path(__file__).resolve().parent.parent / "ressources"
+
+# assets used by the pages, see preload()
+PRELOAD = [
+    ("kiss.png", (40, 40)),
+    ("fart.png", (40, 40)),
+]
+
+_pixmaps = {}
+_icons = {}
+_stats = {"hits": 0, "misses": 0}
+
+
+def resource_path(name: str) -> Path:
+    return RESOURCES_DIR / name
+
+
+def pixmap(name: str, size=None, mode=Qt.SmoothTransformation) -> QPixmap:
+    """Return ressources/name, scaled to fit size=(w, h) keeping the aspect ratio.
+
+    The returned pixmap is null if the file is missing or unreadable.
+    """
+    key = (name, tuple(size) if size else None, int(mode))
+    pix = _pixmaps.get(key)
+    if pix is not None:
+        _stats["hits"] += 1
+        return pix
+    _stats["misses"] += 1
+    if size:
+        # scale from the cached full-size image so the file is decoded once
+        pix = pixmap(name)
+        if not pix.isNull():
+            pix = pix.scaled(size[0], size[1], Qt.KeepAspectRatio, mode)
+    else:
+        pix = QPixmap(str(resource_path(name)))
+    _pixmaps[key] = pix
+    return pix
+
+
+def icon(name: str) -> QIcon:
+    """Return ressources/name as a QIcon (null icon if the file is missing)."""
+    ico = _icons.get(name)
+    if ico is not None:
+        _stats["hits"] += 1
+        return ico
+    _stats["misses"] += 1
+    path = resource_path(name)
+    ico = QIcon(str(path)) if path.exists() else QIcon()
+    _icons[name] = ico
+    return ico
+
+
+def preload(items=None) -> None:
+    """Decode and scale the given (name, size) assets ahead of time."""
+    for name, size in items if items is not None else PRELOAD:
+        pixmap(name, size)
+
+
+def cache_stats() -> dict:
+    """Return hit/miss counters and the number of cached entries."""
+    return dict(_stats, entries=len(_pixmaps) + len(_icons))
+
+
+def clear_cache() -> None:
+    _pixmaps.clear()
+    _icons.clear()
+    _stats["hits"] = 0
+    _stats["misses"] = 0
@@ -1,5 +1,6 @@
 from PyQt5.QtWidgets import QWidget, QVBoxLayout, QLineEdit, QLabel, QPushButton
-from text_utils import reverse_text
+from text_utils import reverse_text, reverse_file
+from ui.file_transform import FileTransformBox
 
 
 class ReverseTextPage(QWidget):
@@ -14,11 +15,14 @@ class ReverseTextPage(QWidget):
         self.submit = QPushButton("Submit")
         self.result = QLabel("")
         self.result.setObjectName("resultLabel")
+        # large texts go file to file, streamed in the background
+        self.file_box = FileTransformBox(reverse_file, "_inverse")
         self.back = QPushButton("Retour menu")
 
         layout.addWidget(self.input)
         layout.addWidget(self.submit)
         layout.addWidget(self.result)
+        layout.addWidget(self.file_box)
         layout.addWidget(self.back)
         layout.addStretch()
 
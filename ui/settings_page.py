@@ -9,12 +9,20 @@ from PyQt5.QtWidgets import (
     QHBoxLayout,
     QMessageBox,
     QSizePolicy,
+    QCheckBox,
 )
 from PyQt5.QtCore import Qt, QTimer, QPoint
-from PyQt5.QtGui import QPixmap
 
-from config import load_config, save_config, set_first_run
-from pathlib import Path
+from manifest import generate_script
+from path_probe import describe, path_prober
+from script_generator import is_live, script_path, target_windows, validate_config, write_params
+from ui import keymap, resources, theme
+from ui.config_model import config_model
+from ui.workers import run_in_background
+
+
+# pause in typing the storage path before it is checked
+PROBE_DELAY_MS = 400
 
 
 class KeySequenceEdit(QLineEdit):
@@ -32,14 +40,15 @@ class KeySequenceEdit(QLineEdit):
         self.setAlignment(Qt.AlignCenter)
         self._recording = False
         self._prev_display = ""
+        self.setProperty("recording", False)
 
     def focusInEvent(self, ev):
         # show visual recording state when the widget gains focus
         self._prev_display = self.text()
         self._recording = True
         self.setText("")
-        # subtle highlight
-        self.setStyleSheet("background-color: #2b2f33; color: #ffffff; border: 1px solid #4a90e2;")
+        # subtle highlight (QLineEdit[recording="true"] in the theme)
+        theme.set_state(self, "recording", True)
         # do not call base to keep readOnly behavior for key presses
 
     def focusOutEvent(self, ev):
@@ -49,25 +58,14 @@ class KeySequenceEdit(QLineEdit):
             self._recording = False
             # restore previous text
             self.setText(self._prev_display)
-            self.setStyleSheet("")
+            theme.set_state(self, "recording", False)
         # call base handler
         super().focusOutEvent(ev)
 
     def keyPressEvent(self, event):
-        mods = []
-        m = event.modifiers()
-        if m & Qt.ControlModifier:
-            mods.append("Ctrl")
-        if m & Qt.AltModifier:
-            mods.append("Alt")
-        if m & Qt.ShiftModifier:
-            mods.append("Shift")
-        if m & Qt.MetaModifier:
-            mods.append("Meta")
-
         key = event.key()
         # ignore pure modifier presses
-        if key in (Qt.Key_Control, Qt.Key_Shift, Qt.Key_Alt, Qt.Key_Meta):
+        if key in keymap.MODIFIER_KEYS:
             return
 
         # If the user presses Escape while the widget is recording, cancel
@@ -78,68 +76,45 @@ class KeySequenceEdit(QLineEdit):
             if self._recording:
                 self._recording = False
                 self.setText(self._prev_display)
-                self.setStyleSheet("")
+                theme.set_state(self, "recording", False)
             try:
                 self.clearFocus()
             except Exception:
                 pass
             return
 
-        # Prefer the printable text Qt provides, but when modifiers are
-        # present event.text() can be empty. In that case map common
-        # letter/digit keys from the key code so combos like Ctrl+P
-        # show as "Ctrl+P" instead of "Ctrl+Key".
-        raw_text = event.text()
-        name = None
-        if raw_text and ord(raw_text[0]) >= 32:
-            name = raw_text.upper()
-        else:
-            # letters
-            if Qt.Key_A <= key <= Qt.Key_Z:
-                name = chr(key)
-            # digits
-            elif Qt.Key_0 <= key <= Qt.Key_9:
-                name = chr(key)
-            else:
-                # for special keys, map some common ones
-                key_map = {
-                    Qt.Key_Escape: "Esc",
-                    Qt.Key_Tab: "Tab",
-                    Qt.Key_Backspace: "Backspace",
-                    Qt.Key_Return: "Enter",
-                    Qt.Key_Enter: "Enter",
-                    Qt.Key_Space: "Space",
-                    Qt.Key_F1: "F1",
-                    Qt.Key_F2: "F2",
-                    Qt.Key_F3: "F3",
-                    Qt.Key_F4: "F4",
-                    Qt.Key_F5: "F5",
-                    Qt.Key_F6: "F6",
-                    Qt.Key_F7: "F7",
-                    Qt.Key_F8: "F8",
-                    Qt.Key_F9: "F9",
-                    Qt.Key_F10: "F10",
-                    Qt.Key_F11: "F11",
-                    Qt.Key_F12: "F12",
-                }
-                name = key_map.get(key, "Key")
-        # normalize to a string
-        if isinstance(name, str):
-            name = name.upper()
-        else:
-            name = str(name)
-
-        parts = mods + [name]
-        seq = "+".join(parts)
+        # names come from the key code (not event.text()) so Ctrl+P shows as
+        # "Ctrl+P" and keypad keys are told apart from the main row
+        name = keymap.key_name(key, event.modifiers())
+        if name is None:
+            return
+        self._record(keymap.sequence(name, event.modifiers()))
+
+    def mousePressEvent(self, event):
+        # middle and side buttons can be shortcuts too, while recording
+        name = keymap.MOUSE_BUTTON_NAMES.get(event.button()) if self._recording else None
+        if name is None:
+            super().mousePressEvent(event)
+            return
+        self._record(keymap.sequence(name, event.modifiers()))
+
+    def _record(self, seq: str):
         self._sequence = seq
         # show the recorded sequence and clear recording visual
         self.setText(seq)
         self._recording = False
-        self.setStyleSheet("")
+        theme.set_state(self, "recording", False)
 
     def sequence(self) -> str:
         return self._sequence
 
+    def set_sequence(self, value: str):
+        """Show value as the current sequence; ignored while the user is recording one."""
+        if self._recording:
+            return
+        self._sequence = value or ""
+        self.setText(self._sequence)
+
 
 class SettingsPage(QWidget):
     """Page to set attract/repel shortcuts and storage path."""
@@ -147,7 +122,8 @@ class SettingsPage(QWidget):
     def __init__(self, navigate_to):
         super().__init__()
         self.navigate_to = navigate_to
-        self.cfg = load_config()
+        self.model = config_model()
+        self.cfg = self.model.snapshot()
 
         layout = QVBoxLayout()
 
@@ -155,13 +131,12 @@ class SettingsPage(QWidget):
         # and distribute the four elements evenly.
 
         # Attract label with icon on the left
-        kiss_path = Path(__file__).resolve().parent.parent / "ressources" / "kiss.png"
-        kiss_pix = QPixmap(str(kiss_path))
+        kiss_pix = resources.pixmap("kiss.png", (40, 40))
         kiss_lbl = QLabel()
         if not kiss_pix.isNull():
-            kiss_lbl.setPixmap(kiss_pix.scaled(40, 40, Qt.KeepAspectRatio, Qt.SmoothTransformation))
+            kiss_lbl.setPixmap(kiss_pix)
         label_att = QLabel("Attirer la monture:")
-        label_att.setStyleSheet("font-weight: 600; color: #d6d6d6;")
+        label_att.setObjectName("fieldLabel")
         lab_att_h = QHBoxLayout()
         lab_att_h.setContentsMargins(0, 0, 0, 0)
         lab_att_h.addWidget(kiss_lbl)
@@ -186,13 +161,12 @@ class SettingsPage(QWidget):
         att_row.setLayout(att_row_h)
 
         # Repel label with icon on the left
-        fart_path = Path(__file__).resolve().parent.parent / "ressources" / "fart.png"
-        fart_pix = QPixmap(str(fart_path))
+        fart_pix = resources.pixmap("fart.png", (40, 40))
         fart_lbl = QLabel()
         if not fart_pix.isNull():
-            fart_lbl.setPixmap(fart_pix.scaled(40, 40, Qt.KeepAspectRatio, Qt.SmoothTransformation))
+            fart_lbl.setPixmap(fart_pix)
         label_rep = QLabel("Eloigner la monture:")
-        label_rep.setStyleSheet("font-weight: 600; color: #d6d6d6;")
+        label_rep.setObjectName("fieldLabel")
         lab_rep_h = QHBoxLayout()
         lab_rep_h.setContentsMargins(0, 0, 0, 0)
         lab_rep_h.addWidget(fart_lbl)
@@ -218,7 +192,7 @@ class SettingsPage(QWidget):
 
         # Toggle label
         label_tog = QLabel("Start/Stop le script:")
-        label_tog.setStyleSheet("font-weight: 600; color: #d6d6d6;")
+        label_tog.setObjectName("fieldLabel")
         lab_tog_h = QHBoxLayout()
         lab_tog_h.setContentsMargins(0, 0, 0, 0)
         lab_tog_h.addWidget(label_tog)
@@ -252,13 +226,13 @@ class SettingsPage(QWidget):
 
         # Inline validation label (hidden unless error)
         self.validation_label = QLabel("")
-        self.validation_label.setStyleSheet("color: #ff8080;")
+        self.validation_label.setObjectName("validationLabel")
         self.validation_label.setVisible(False)
         # validation_label will be placed above the save button (bottom)
 
         # storage row (fourth element)
         label_path = QLabel("Chemin du script:")
-        label_path.setStyleSheet("font-weight: 600; color: #d6d6d6;")
+        label_path.setObjectName("fieldLabel")
         storage_row = QWidget()
         storage_h = QHBoxLayout()
         storage_h.setContentsMargins(0, 0, 0, 0)
@@ -274,6 +248,29 @@ class SettingsPage(QWidget):
         storage_h.addWidget(self.browse)
         storage_row.setLayout(storage_h)
         layout.addWidget(storage_row)
+        # result of the background check of the folder (see _probe_storage)
+        self.path_status = QLabel("")
+        self.path_status.setWordWrap(True)
+        layout.addWidget(self.path_status)
+
+        # target windows served in turn by one script; empty = the active window
+        label_win = QLabel("Fenêtres:")
+        label_win.setObjectName("fieldLabel")
+        self.windows_input = QLineEdit(_windows_text(self.cfg))
+        self.windows_input.setPlaceholderText("titres séparés par « ; » (vide: fenêtre active)")
+        windows_row = QWidget()
+        windows_h = QHBoxLayout()
+        windows_h.setContentsMargins(0, 0, 0, 0)
+        windows_h.addWidget(label_win)
+        windows_h.addSpacing(20)
+        windows_h.addWidget(self.windows_input, 1)
+        windows_row.setLayout(windows_h)
+        layout.addWidget(windows_row)
+
+        # live mode: the script reads keys and delays from a sidecar file
+        self.live_input = QCheckBox("Paramètres en direct (appliqués sans relancer le script)")
+        self.live_input.setChecked(is_live(self.cfg))
+        layout.addWidget(self.live_input)
 
         # Action buttons
         self.save_btn = QPushButton("Valider et enregistrer")
@@ -290,8 +287,41 @@ class SettingsPage(QWidget):
         self.attract_input.textChanged.connect(lambda _: self._validate_shortcuts())
         self.repel_input.textChanged.connect(lambda _: self._validate_shortcuts())
         self.toggle_input.textChanged.connect(lambda _: self._validate_shortcuts())
+        # the folder is probed once typing pauses, not on every keystroke
+        self._path_error = ""
+        self._probe_task = None
+        self._probe_timer = QTimer(self)
+        self._probe_timer.setSingleShot(True)
+        self._probe_timer.setInterval(PROBE_DELAY_MS)
+        self._probe_timer.timeout.connect(self._probe_storage)
+        self.storage_input.textChanged.connect(lambda _: self._probe_timer.start())
         # initial validation state
         self._validate_shortcuts()
+        self._probe_storage()
+        # background write of a live script's sidecar, see _push_live_params
+        self._params_task = None
+        # follow changes made elsewhere (main page, CLI, hand edits of the file)
+        self.model.changed.connect(self._on_config_changed)
+
+    def _on_config_changed(self, key, value):
+        self.cfg[key] = value
+        if key == "storage_path":
+            if self.storage_input.text() != (value or ""):
+                self.storage_input.setText(value or "")
+            return
+        if key == "live_params":
+            self.live_input.setChecked(bool(value))
+            return
+        if key == "windows":
+            text = _windows_text(self.cfg)
+            if self.windows_input.text() != text:
+                self.windows_input.setText(text)
+            return
+        field = {"attract_shortcut": self.attract_input, "repel_shortcut": self.repel_input,
+                 "toggle_shortcut": self.toggle_input}.get(key)
+        # a field being recorded keeps what the user is typing (see set_sequence)
+        if field is not None and field.sequence() != (value or ""):
+            field.set_sequence(value)
 
     def showEvent(self, event):
         """Clear focus from any child widget when the page becomes visible.
@@ -313,6 +343,33 @@ class SettingsPage(QWidget):
 
         QTimer.singleShot(0, _clear_focus)
 
+    def _probe_storage(self):
+        """Check the typed folder off the GUI thread; the result feeds the validation."""
+        raw = self.storage_input.text().strip()
+        if not raw:
+            # no folder: the script path is asked for when generating
+            self._on_probed(None)
+            return
+        hit = path_prober().cached(raw)
+        if hit is not None:
+            self._on_probed(hit)
+            return
+        self.path_status.setText("Vérification du dossier…")
+        self._probe_task = run_in_background(
+            lambda task, raw: path_prober().probe(raw),
+            raw,
+            on_finished=self._on_probed,
+        )
+
+    def _on_probed(self, result):
+        if result is not None and result.raw != self.storage_input.text().strip():
+            return
+        self.path_status.setText(describe(result) if result is not None else "")
+        # a folder that does not answer is only a warning: it may just be slow
+        blocking = result is not None and not result.usable and not result.timed_out
+        self._path_error = describe(result) if blocking else ""
+        self._validate_shortcuts()
+
     def _browse(self):
         d = QFileDialog.getExistingDirectory(self, "Choisir dossier de stockage")
         if d:
@@ -322,9 +379,7 @@ class SettingsPage(QWidget):
     def _show_toast(self, text: str, timeout_ms: int = 1200):
         toast = QLabel(text)
         toast.setWindowFlags(Qt.ToolTip | Qt.WindowStaysOnTopHint)
-        toast.setStyleSheet(
-            "background: rgba(50,50,50,0.95); color: white; padding: 8px 12px; border-radius: 6px; font-weight: 600;"
-        )
+        toast.setObjectName("toast")
         toast.adjustSize()
         # position at bottom-center of the widget, slightly above the bottom edge
         center = self.mapToGlobal(self.rect().center())
@@ -345,16 +400,41 @@ class SettingsPage(QWidget):
         if a == r or a == t or r == t:
             QMessageBox.warning(self, "Validation", "Tous les raccourcis doivent être différents.")
             return
-        self.cfg["attract_shortcut"] = a
-        self.cfg["repel_shortcut"] = r
-        self.cfg["toggle_shortcut"] = t
-        self.cfg["storage_path"] = self.storage_input.text().strip()
-        self.cfg["first_run"] = False
-        save_config(self.cfg)
-        set_first_run(False)
+        # single write: first_run is saved together with the shortcuts, and
+        # repeated clicks are coalesced into one write
+        self.model.update({
+            "attract_shortcut": a,
+            "repel_shortcut": r,
+            "toggle_shortcut": t,
+            "storage_path": self.storage_input.text().strip(),
+            "live_params": self.live_input.isChecked(),
+            "windows": _parse_windows(self.windows_input.text()),
+            "first_run": False,
+        })
+        self._push_live_params()
         # after saving go to main page
         self.navigate_to("main")
 
+    def _push_live_params(self):
+        """Hand the saved values to an already generated live script, if any.
+
+        The running script picks them up at its next action; nothing is
+        regenerated. Runs in the background, the folder may be slow: even
+        checking that the script exists is done there.
+        """
+        cfg = self.model.snapshot()
+        out = script_path(cfg)
+        if not is_live(cfg) or out is None or validate_config(cfg):
+            return
+        self._params_task = run_in_background(
+            lambda task, cfg: out.exists() and write_params(cfg, out),
+            cfg,
+            on_failed=self._on_push_failed,
+        )
+
+    def _on_push_failed(self, message):
+        QMessageBox.warning(self, "Erreur", f"Échec de l'écriture des paramètres: {message}")
+
     def navigate_to(self, page_name):
         """Navigate to a different page in the application."""
         if page_name == "main":
@@ -367,41 +447,37 @@ class SettingsPage(QWidget):
         self.stacked_widget.setCurrentIndex(self.page_map[page_name])
 
     def _generate(self):
-        """Generate a text file containing the current inputs at the user-specified path."""
-        a = self.attract_input.sequence() or self.attract_input.text().strip()
-        r = self.repel_input.sequence() or self.repel_input.text().strip()
-        if not a or not r:
-            QMessageBox.warning(self, "Validation", "Les deux raccourcis doivent être définis.")
-            return
-        if a == r:
-            QMessageBox.warning(self, "Validation", "Les deux raccourcis doivent être différents.")
+        """Generate the script from the current (possibly unsaved) inputs."""
+        cfg = dict(self.cfg)
+        cfg["attract_shortcut"] = self.attract_input.sequence() or self.attract_input.text().strip()
+        cfg["repel_shortcut"] = self.repel_input.sequence() or self.repel_input.text().strip()
+        cfg["toggle_shortcut"] = self.toggle_input.sequence() or self.toggle_input.text().strip()
+        cfg["storage_path"] = self.storage_input.text().strip()
+        cfg["live_params"] = self.live_input.isChecked()
+        cfg["windows"] = _parse_windows(self.windows_input.text())
+        errors = validate_config(cfg)
+        if errors:
+            QMessageBox.warning(self, "Validation", errors[0])
             return
 
-        storage = self.storage_input.text().strip()
-
         # determine output path
-        if not storage:
+        out = script_path(cfg)
+        if out is None:
             # ask user for a file path
             dlg = QFileDialog()
             fp, _ = dlg.getSaveFileName(self, "Enregistrer le script", "script.txt", "Text Files (*.txt)")
             if not fp:
                 return
             out = fp
-        else:
-            p = Path(storage)
-            try:
-                p.mkdir(parents=True, exist_ok=True)
-            except Exception as e:
-                QMessageBox.warning(self, "Erreur", f"Impossible de créer le dossier: {e}")
-                return
-            out = str(p / "generated_script.txt")
 
         try:
-            with open(out, "w", encoding="utf-8") as f:
-                f.write(f"Attract: {a}\n")
-                f.write(f"Repel: {r}\n")
-                f.write(f"Storage path: {storage or out}\n")
-            QMessageBox.information(self, "Génération terminée", f"Fichier créé: {out}")
+            result = generate_script(cfg, out)
+            if result.written:
+                QMessageBox.information(self, "Génération terminée", f"Fichier créé: {result.path}")
+            elif result.params_written:
+                QMessageBox.information(self, "Génération terminée", f"Paramètres mis à jour: {result.path}")
+            else:
+                QMessageBox.information(self, "Génération terminée", f"Fichier déjà à jour: {result.path}")
         except Exception as e:
             QMessageBox.warning(self, "Erreur", f"Échec de l'écriture du fichier: {e}")
 
@@ -419,18 +495,32 @@ class SettingsPage(QWidget):
             self.validation_label.setVisible(True)
             self.save_btn.setEnabled(False)
             return
+        if self._path_error:
+            self.validation_label.setText(self._path_error)
+            self.validation_label.setVisible(True)
+            self.save_btn.setEnabled(False)
+            return
         # OK
         self.validation_label.setVisible(False)
         self.save_btn.setEnabled(True)
 
 
+def _windows_text(cfg: dict) -> str:
+    return "; ".join(target_windows(cfg))
+
+
+def _parse_windows(text: str) -> list:
+    return [w.strip() for w in text.split(";") if w.strip()]
+
+
 class RegeneratePage(QWidget):
     """Simple page that will create the script file using config values."""
 
     def __init__(self, navigate_to):
         super().__init__()
         self.navigate_to = navigate_to
-        self.cfg = load_config()
+        # no config snapshot kept here: the shared model is read when generating
+        self.model = config_model()
         layout = QVBoxLayout()
         layout.addWidget(QLabel("Regénérer le script à partir des paramètres enregistrés."))
         self.gen_btn = QPushButton("Générer maintenant")
@@ -441,26 +531,41 @@ class RegeneratePage(QWidget):
 
         self.gen_btn.clicked.connect(self._generate)
         self.back.clicked.connect(lambda: self.navigate_to("menu"))
+        self._task = None
 
     def _generate(self):
-        # create a simple text file in storage_path
-        path = self.cfg.get("storage_path") or ""
-        if not path:
+        if self._task is not None:
+            return
+        cfg = self.model.snapshot()
+        errors = validate_config(cfg)
+        if errors:
+            QMessageBox.warning(self, "Validation", errors[0])
+            return
+        out = script_path(cfg)
+        if out is None:
             # ask user
             dlg = QFileDialog()
             fp, _ = dlg.getSaveFileName(self, "Enregistrer le script", "script.txt", "Text Files (*.txt)")
             if not fp:
                 return
             out = fp
-        else:
-            from pathlib import Path
 
-            p = Path(path)
-            p.mkdir(parents=True, exist_ok=True)
-            out = str(p / "generated_script.txt")
+        # write on the thread pool so a slow storage folder does not freeze the window
+        self.gen_btn.setEnabled(False)
+        self._task = run_in_background(
+            lambda task, cfg: generate_script(cfg, out),
+            cfg,
+            on_finished=self._on_generated,
+            on_failed=self._on_generate_failed,
+        )
 
-        with open(out, "w", encoding="utf-8") as f:
-            f.write(f"Attract: {self.cfg.get('attract_shortcut')}\n")
-            f.write(f"Repel: {self.cfg.get('repel_shortcut')}\n")
+    def _on_generated(self, result):
+        self._task = None
+        self.gen_btn.setEnabled(True)
         # go back to menu
         self.navigate_to("menu")
+
+    def _on_generate_failed(self, message):
+        self._task = None
+        self.gen_btn.setEnabled(True)
+        QMessageBox.warning(self, "Erreur", f"Échec de l'écriture du fichier: {message}")
@@ -1,5 +1,6 @@
 from PyQt5.QtWidgets import QWidget, QVBoxLayout, QLineEdit, QLabel, QPushButton
-from text_utils import swap_case
+from text_utils import swap_case, swap_case_file
+from ui.file_transform import FileTransformBox
 
 
 class SwapCasePage(QWidget):
@@ -13,11 +14,14 @@ class SwapCasePage(QWidget):
         self.input = QLineEdit()
         self.submit = QPushButton("Submit")
         self.result = QLabel("")
+        # large texts go file to file, streamed in the background
+        self.file_box = FileTransformBox(swap_case_file, "_casse")
         self.back = QPushButton("Retour menu")
 
         layout.addWidget(self.input)
         layout.addWidget(self.submit)
         layout.addWidget(self.result)
+        layout.addWidget(self.file_box)
         layout.addWidget(self.back)
         layout.addStretch()
 
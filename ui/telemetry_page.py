@@ -0,0 +1,122 @@
+from pathlib import Path
+
+from PyQt5.QtCore import QTimer
+from PyQt5.QtWidgets import (
+    QHeaderView,
+    QLabel,
+    QPushButton,
+    QTableWidget,
+    QTableWidgetItem,
+    QVBoxLayout,
+    QWidget,
+)
+
+from telemetry import TelemetryMonitor
+from ui.config_model import config_model
+from ui.workers import run_in_background
+
+# how often the logs are polled while the page is shown
+POLL_MS = 2000
+
+COLUMNS = ("Profil", "Cycles/h", "Retard médian", "Retard p95", "Retard p99", "Blocages", "Fenêtres")
+
+
+class TelemetryPage(QWidget):
+    """Live figures of the scripts generated with telemetry on.
+
+    The logs of the storage folder are tail-followed on the thread pool:
+    each poll only parses what the scripts appended since the last one.
+    """
+
+    def __init__(self, navigate_to):
+        super().__init__()
+        self.navigate_to = navigate_to
+        self.model = config_model()
+        self.monitor = None
+        self._task = None
+        layout = QVBoxLayout()
+
+        self.status = QLabel("")
+        self.status.setWordWrap(True)
+        self.table = QTableWidget(0, len(COLUMNS))
+        self.table.setHorizontalHeaderLabels(COLUMNS)
+        self.table.horizontalHeader().setSectionResizeMode(QHeaderView.Stretch)
+        self.table.verticalHeader().setVisible(False)
+        self.table.setEditTriggers(QTableWidget.NoEditTriggers)
+        self.back = QPushButton("Retour menu")
+
+        layout.addWidget(self.status)
+        layout.addWidget(self.table)
+        layout.addWidget(self.back)
+        self.setLayout(layout)
+
+        self.timer = QTimer(self)
+        self.timer.setInterval(POLL_MS)
+        self.timer.timeout.connect(self.poll)
+
+        self.back.clicked.connect(lambda: self.navigate_to("menu"))
+        self.model.changed.connect(self._on_config_changed)
+        self._set_folder(self.model.get("storage_path"))
+
+    def _on_config_changed(self, key, value):
+        if key == "storage_path":
+            self._set_folder(value)
+
+    def _set_folder(self, storage):
+        storage = (storage or "").strip()
+        # a poll still running keeps its own monitor, its result is dropped
+        self._task = None
+        self.table.setRowCount(0)
+        if not storage:
+            self.monitor = None
+            self.status.setText("Aucun chemin de stockage défini.")
+            return
+        self.monitor = TelemetryMonitor(Path(storage))
+        self.status.setText(
+            f"Journaux de {storage} (activez \"telemetry\" dans la configuration puis regénérez le script)."
+        )
+        if self.isVisible():
+            self.poll()
+
+    def showEvent(self, event):
+        super().showEvent(event)
+        self.timer.start()
+        self.poll()
+
+    def hideEvent(self, event):
+        super().hideEvent(event)
+        self.timer.stop()
+
+    def poll(self):
+        """Read the new log lines in the background; skipped while a poll is running."""
+        if self.monitor is None or self._task is not None:
+            return
+        monitor = self.monitor
+        self._task = run_in_background(
+            lambda task, monitor: monitor.poll(),
+            monitor,
+            on_finished=lambda rows, monitor=monitor: self._on_polled(monitor, rows),
+            on_failed=lambda message, monitor=monitor: self._on_polled(monitor, None),
+        )
+
+    def _on_polled(self, monitor, rows):
+        if monitor is not self.monitor:
+            return
+        self._task = None
+        if rows is not None:
+            self.show_rows(rows)
+
+    def show_rows(self, rows):
+        self.table.setRowCount(len(rows))
+        for r, s in enumerate(rows):
+            values = (
+                s.profile,
+                f"{s.cycles_per_hour:.0f}",
+                f"{s.p50_ms} ms",
+                f"{s.p95_ms} ms",
+                f"{s.p99_ms} ms",
+                str(s.stalls),
+                str(s.windows),
+            )
+            for c, text in enumerate(values):
+                self.table.setItem(r, c, QTableWidgetItem(text))
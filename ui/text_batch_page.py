@@ -0,0 +1,144 @@
+import time
+
+from PyQt5.QtWidgets import (
+    QComboBox,
+    QFileDialog,
+    QHBoxLayout,
+    QLabel,
+    QLineEdit,
+    QMessageBox,
+    QProgressBar,
+    QPushButton,
+    QVBoxLayout,
+    QWidget,
+)
+
+from text_batch import collect_files, summarize, transform_batch
+from ui.workers import run_in_background
+
+TRANSFORM_LABELS = (("reverse", "Inverser le texte"), ("swapcase", "Inverser la casse"))
+
+
+class TextBatchPage(QWidget):
+    """Page that transforms every file of a folder or glob on a process pool."""
+
+    def __init__(self, navigate_to):
+        super().__init__()
+        self.navigate_to = navigate_to
+        self._task = None
+        layout = QVBoxLayout()
+
+        label_src = QLabel("Fichiers (dossier ou motif, ex. C:\\textes\\**\\*.txt)")
+        label_src.setObjectName("fieldLabel")
+        src_row = QHBoxLayout()
+        self.source = QLineEdit()
+        self.browse_src = QPushButton("Parcourir…")
+        src_row.addWidget(self.source)
+        src_row.addWidget(self.browse_src)
+
+        label_out = QLabel("Dossier de sortie (vide: à côté des fichiers, avec un suffixe)")
+        label_out.setObjectName("fieldLabel")
+        out_row = QHBoxLayout()
+        self.output = QLineEdit()
+        self.browse_out = QPushButton("Parcourir…")
+        out_row.addWidget(self.output)
+        out_row.addWidget(self.browse_out)
+
+        self.transform = QComboBox()
+        for name, label in TRANSFORM_LABELS:
+            self.transform.addItem(label, name)
+        self.run_btn = QPushButton("Transformer")
+        self.progress = QProgressBar()
+        self.progress.setRange(0, 100)
+        self.progress.setVisible(False)
+        self.status = QLabel("")
+        self.status.setWordWrap(True)
+        self.back = QPushButton("Retour menu")
+
+        layout.addWidget(label_src)
+        layout.addLayout(src_row)
+        layout.addWidget(label_out)
+        layout.addLayout(out_row)
+        layout.addWidget(self.transform)
+        layout.addWidget(self.run_btn)
+        layout.addWidget(self.progress)
+        layout.addWidget(self.status)
+        layout.addStretch()
+        layout.addWidget(self.back)
+        self.setLayout(layout)
+
+        self.browse_src.clicked.connect(lambda: self._browse(self.source, "Dossier des fichiers"))
+        self.browse_out.clicked.connect(lambda: self._browse(self.output, "Dossier de sortie"))
+        self.run_btn.clicked.connect(self._run)
+        self.back.clicked.connect(lambda: self.navigate_to("menu"))
+
+    def _browse(self, field, title):
+        d = QFileDialog.getExistingDirectory(self, title)
+        if d:
+            field.setText(d)
+
+    def _run(self):
+        """Start the batch on the thread pool; while it runs the button cancels it."""
+        if self._task is not None:
+            self._task.cancel()
+            return
+        source = self.source.text().strip()
+        if not source:
+            QMessageBox.warning(self, "Validation", "Indiquez un dossier ou un motif de fichiers.")
+            return
+        self._task = run_in_background(
+            _batch_job,
+            source,
+            self.transform.currentData(),
+            self.output.text().strip() or None,
+            on_progress=self._on_progress,
+            on_finished=self._on_finished,
+            on_failed=self._on_failed,
+            on_cancelled=lambda: self._end_task("Annulé."),
+        )
+        self.run_btn.setText("Annuler")
+        self.progress.setValue(0)
+        self.progress.setVisible(True)
+        self.status.setText("Recherche des fichiers…")
+
+    def _end_task(self, message: str):
+        self._task = None
+        self.run_btn.setText("Transformer")
+        self.progress.setVisible(False)
+        self.status.setText(message)
+
+    def _on_progress(self, percent, message):
+        self.progress.setValue(percent)
+        self.status.setText(message)
+
+    def _on_failed(self, message):
+        self._end_task("")
+        QMessageBox.warning(self, "Erreur", message)
+
+    def _on_finished(self, outcome):
+        results, s = outcome
+        lines = [
+            f"{s.files - s.failed} fichiers transformés, {s.failed} en erreur, "
+            f"{s.size / 1e6:.1f} Mo en {s.seconds:.2f} s "
+            f"({s.mb_per_second:.1f} Mo/s, {s.files_per_second:.0f} fichiers/s)"
+        ]
+        # the slowest files and the errors, the full list is what the CLI is for
+        for r in sorted((r for r in results if r.ok), key=lambda r: r.seconds, reverse=True)[:3]:
+            lines.append(f"{r.src}: {r.seconds * 1000:.1f} ms")
+        lines += [f"{r.src}: {r.error}" for r in results if not r.ok][:10]
+        self._end_task("\n".join(lines))
+
+
+def _batch_job(task, source: str, name: str, out_dir):
+    """Background part of TextBatchPage._run; the files themselves go to a process pool."""
+    sources = collect_files(source)
+    if not sources:
+        raise OSError(f"Aucun fichier pour {source}")
+    start = time.perf_counter()
+
+    def on_result(done, total, result):
+        # report() raises once cancelled, which stops the batch
+        task.report(done * 100 // total, f"{done} / {total}")
+
+    results = transform_batch(sources, name, out_dir=out_dir, on_result=on_result)
+    return results, summarize(results, time.perf_counter() - start)
@@ -0,0 +1,46 @@
+"""Application theme: one stylesheet for the whole app.
+
+Widgets never call setStyleSheet themselves. They get an object name or a
+dynamic property matched by dark_theme.qss, and state changes go through
+set_state(), which only repolishes the widget concerned instead of
+re-parsing any CSS.
+"""
+import re
+from functools import lru_cache
+from pathlib import Path
+
+THEME_FILE = Path(__file__).resolve().parent.parent / "dark_theme.qss"
+
+_COMMENT_RE = re.compile(r"/\*.*?\*/", re.S)
+_SPACE_RE = re.compile(r"\s+")
+
+
+@lru_cache(maxsize=None)
+def stylesheet(path: Path = THEME_FILE) -> str:
+    """Return the compiled (comment and whitespace stripped) stylesheet, cached."""
+    try:
+        text = path.read_text(encoding="utf-8")
+    except OSError:
+        return ""
+    text = _COMMENT_RE.sub("", text)
+    return _SPACE_RE.sub(" ", text).strip()
+
+
+def apply_theme(app) -> None:
+    """Install the stylesheet on the QApplication (parsed once by Qt)."""
+    css = stylesheet()
+    if css:
+        app.setStyleSheet(css)
+
+
+def set_state(widget, name: str, value) -> None:
+    """Set a dynamic property used by the stylesheet and repolish the widget.
+
+    Does nothing if the property already has that value.
+    """
+    if widget.property(name) == value:
+        return
+    widget.setProperty(name, value)
+    style = widget.style()
+    style.unpolish(widget)
+    style.polish(widget)
@@ -0,0 +1,92 @@
+"""Background tasks on the Qt thread pool.
+
+A task runs fn(task, *args) on a pool thread and reports back to the GUI
+thread through task.signals. fn may call task.report() to
+publish progress and task.check_cancelled() to stop early after the user
+asked for cancellation.
+"""
+import threading
+from functools import partial
+
+from PyQt5.QtCore import QObject, QRunnable, QThreadPool, pyqtSignal
+
+# id -> task started and not over yet; Qt must not run a runnable Python already freed
+_running = {}
+
+
+def _forget(task_id, *_):
+    _running.pop(task_id, None)
+
+
+class Cancelled(Exception):
+    """Raised by Task.check_cancelled() to abort a cancelled task."""
+
+
+class TaskSignals(QObject):
+    progress = pyqtSignal(int, str)  # percent, message
+    finished = pyqtSignal(object)  # fn's return value
+    failed = pyqtSignal(str)  # error message
+    cancelled = pyqtSignal()
+
+
+class Task(QRunnable):
+    def __init__(self, fn, *args):
+        super().__init__()
+        # lifetime is managed from Python, see _running
+        self.setAutoDelete(False)
+        self.signals = TaskSignals()
+        self._fn = fn
+        self._args = args
+        self._cancel = threading.Event()
+
+    def cancel(self) -> None:
+        self._cancel.set()
+
+    def is_cancelled(self) -> bool:
+        return self._cancel.is_set()
+
+    def check_cancelled(self) -> None:
+        if self._cancel.is_set():
+            raise Cancelled()
+
+    def report(self, percent: int, message: str = "") -> None:
+        self.check_cancelled()
+        self.signals.progress.emit(int(percent), message)
+
+    def run(self):
+        try:
+            result = self._fn(self, *self._args)
+        except Cancelled:
+            self.signals.cancelled.emit()
+        except Exception as e:
+            self.signals.failed.emit(str(e) or type(e).__name__)
+        else:
+            if self._cancel.is_set():
+                self.signals.cancelled.emit()
+            else:
+                self.signals.finished.emit(result)
+
+
+def run_in_background(fn, *args, on_progress=None, on_finished=None, on_failed=None,
+                      on_cancelled=None, pool: QThreadPool = None) -> Task:
+    """Start fn(task, *args) on the thread pool (default: the global one).
+
+    The callbacks are connected before the task starts so that no signal
+    can be missed; they run on the GUI thread. Returns the task, e.g. to
+    cancel it.
+    """
+    task = Task(fn, *args)
+    for signal, slot in (
+        (task.signals.progress, on_progress),
+        (task.signals.finished, on_finished),
+        (task.signals.failed, on_failed),
+        (task.signals.cancelled, on_cancelled),
+    ):
+        if slot is not None:
+            signal.connect(slot)
+    # connected last so the task is released after the callbacks ran
+    _running[id(task)] = task
+    for signal in (task.signals.finished, task.signals.failed, task.signals.cancelled):
+        signal.connect(partial(_forget, id(task)))
+    (pool or QThreadPool.globalInstance()).start(task)
+    return task